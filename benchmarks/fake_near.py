@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Local NEAR JSON-RPC stand-in for offline benchmarks.
+
+Answers ``query``/``call_function`` requests the way a NEAR RPC node does for
+the ETRAP contract view methods the SDK calls: ``nft_token``, ``nft_tokens``,
+``get_recent_batches``, ``get_batch_summary``, ``get_batches_by_time_range``
+and ``verify_document_in_batch``. Batches are registered from synthetic batch
+JSON; pass ``server.url`` as ``rpc_endpoint`` to ETRAPClient.
+
+Usage: python benchmarks/fake_near.py [--batches N] [--size N] [--port PORT]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import batch_key, generate_batches
+
+from etrap_sdk.utils import validate_merkle_proof_indexed
+
+
+def batch_token(batch_json: Dict[str, Any], bucket: str, size_bytes: int = 0) -> Dict[str, Any]:
+    """
+    Build the NFT token the ETRAP contract stores for a batch.
+
+    Args:
+        batch_json: Batch JSON document
+        bucket: Bucket holding the batch data
+        size_bytes: Size of the stored batch data
+
+    Returns:
+        Token dictionary as returned by ``nft_token``
+    """
+    info = batch_json["batch_info"]
+    metadata = batch_json["transactions"][0]["metadata"]
+    summary = {
+        "database_name": info["database_name"],
+        "table_names": [metadata["table_affected"]],
+        "timestamp": info["created_at"],
+        "tx_count": len(batch_json["transactions"]),
+        "merkle_root": batch_json["merkle_tree"]["root"],
+        "s3_location": {
+            "bucket": bucket,
+            "key": batch_key(batch_json),
+            "region": "us-west-2",
+        },
+        "size_bytes": size_bytes,
+    }
+    return {
+        "token_id": info["batch_id"],
+        "owner_id": info["organization_id"],
+        "metadata": {
+            "title": f"ETRAP Batch {info['batch_id']}",
+            "description": f"Batch of {summary['tx_count']} CDC transactions",
+            "issued_at": str(info["created_at"]),
+            "extra": json.dumps(summary),
+        },
+    }
+
+
+class FakeNearServer:
+    """
+    In-memory ETRAP contract behind a NEAR JSON-RPC endpoint.
+
+    Example:
+        with FakeNearServer() as near:
+            near.add_batch(batch_json, bucket="etrap-bench")
+            client = ETRAPClient("bench", rpc_endpoint=near.url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+        self.roots: Dict[str, str] = {}
+        self.call_counts: Dict[str, int] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+        self._block_height = 1
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """RPC endpoint to pass as ``rpc_endpoint``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_batch(self, batch_json: Dict[str, Any], bucket: str, size_bytes: int = 0) -> None:
+        """Register a batch as if the CDC agent had minted its NFT."""
+        token = batch_token(batch_json, bucket, size_bytes)
+        with self._lock:
+            if token["token_id"] not in self.tokens:
+                self._order.append(token["token_id"])
+            self.tokens[token["token_id"]] = token
+            self.roots[token["token_id"]] = batch_json["merkle_tree"]["root"]
+            self._block_height += 1
+
+    def start(self) -> "FakeNearServer":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeNearServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def call(self, method_name: str, args: Dict[str, Any]) -> Any:
+        """Execute a contract view method."""
+        with self._lock:
+            self.call_counts[method_name] = self.call_counts.get(method_name, 0) + 1
+            newest_first = [self.tokens[token_id] for token_id in reversed(self._order)]
+
+        if method_name == "nft_token":
+            return self.tokens.get(args.get("token_id"))
+
+        if method_name == "get_batch_summary":
+            token = self.tokens.get(args.get("token_id"))
+            if token is None:
+                return None
+            summary = json.loads(token["metadata"]["extra"])
+            return {key: summary[key] for key in ("merkle_root", "size_bytes", "database_name", "table_names")}
+
+        if method_name == "get_recent_batches":
+            return newest_first[:int(args.get("limit", 100))]
+
+        if method_name == "nft_tokens":
+            start = int(args.get("from_index", "0"))
+            return newest_first[start:start + int(args.get("limit", 100))]
+
+        if method_name == "get_batches_by_time_range":
+            matches = []
+            for token in newest_first:
+                summary = json.loads(token["metadata"]["extra"])
+                if not args["start_timestamp"] <= summary["timestamp"] <= args["end_timestamp"]:
+                    continue
+                if args.get("database") and summary["database_name"] != args["database"]:
+                    continue
+                matches.append(token)
+            return matches[:int(args.get("limit", 100))]
+
+        if method_name == "verify_document_in_batch":
+            root = self.roots.get(args.get("token_id"))
+            if root is None:
+                return False
+            return validate_merkle_proof_indexed(
+                args["document_hash"], args["merkle_proof"], args["leaf_index"], root
+            )
+
+        raise KeyError(method_name)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                params = request.get("params", {})
+
+                if request.get("method") != "query" or params.get("request_type") != "call_function":
+                    response = self._error(request, "UNKNOWN_REQUEST", request.get("method"))
+                else:
+                    args = json.loads(base64.b64decode(params.get("args_base64", "")) or b"{}")
+                    try:
+                        value = server.call(params["method_name"], args)
+                    except KeyError as e:
+                        response = self._error(request, "METHOD_NOT_FOUND", f"MethodNotFound: {e}")
+                    else:
+                        response = {
+                            "jsonrpc": "2.0",
+                            "id": request.get("id"),
+                            "result": {
+                                "result": list(json.dumps(value).encode()),
+                                "logs": [],
+                                "block_height": server._block_height,
+                                "block_hash": "11111111111111111111111111111111",
+                            },
+                        }
+
+                body = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, request, name, message):
+                return {
+                    "jsonrpc": "2.0",
+                    "id": request.get("id"),
+                    "error": {
+                        "name": "HANDLER_ERROR",
+                        "cause": {"name": name, "info": {}},
+                        "code": -32000,
+                        "message": "Server error",
+                        "data": str(message),
+                    },
+                }
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic ETRAP contract over NEAR JSON-RPC')
+    parser.add_argument('--bucket', default='etrap-bench', help='Bucket recorded in batch tokens')
+    parser.add_argument('--batches', type=int, default=4, help='Number of batches (default: 4)')
+    parser.add_argument('--size', type=int, default=1024, help='Transactions per batch (default: 1024)')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=3030, help='Port (default: 3030)')
+    args = parser.parse_args()
+
+    server = FakeNearServer(args.host, args.port)
+    for batch_json, _ in generate_batches(args.batches, args.size):
+        server.add_batch(batch_json, args.bucket)
+
+    print(f"🚀 Serving {args.batches} batches on {server.url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Local, read-only S3 stand-in for offline benchmarks.
+
+Serves objects from memory over HTTP using path-style S3 URLs
+(``http://host:port/<bucket>/<key>``) and implements what the SDK uses from
+GetObject: ``Range`` requests, ``ETag``/``Last-Modified`` headers with
+``If-None-Match``/``If-Modified-Since`` revalidation, and ``NoSuchKey`` XML
+errors. Point the SDK at it with ``S3Config(endpoint_url=server.url, ...)``.
+
+Usage: python benchmarks/fake_s3.py [--batches N] [--size N] [--port PORT]
+
+Example: python benchmarks/fake_s3.py --batches 4 --size 1024 --port 9000
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import batch_key, generate_batches
+
+_ERROR_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Error><Code>{code}</Code><Message>{message}</Message>'
+    '<Resource>{resource}</Resource></Error>'
+)
+
+
+class _StoredObject:
+    """Object body with precomputed validators."""
+
+    def __init__(self, data: bytes, content_encoding: Optional[str], modified: float):
+        self.data = data
+        self.content_encoding = content_encoding
+        self.etag = f'"{hashlib.md5(data).hexdigest()}"'
+        self.modified = int(modified)
+        self.last_modified = formatdate(self.modified, usegmt=True)
+
+
+class FakeS3Server:
+    """
+    In-memory S3 GetObject server running in a background thread.
+
+    Example:
+        with FakeS3Server() as s3:
+            s3.put_batch("etrap-bench", batch_json)
+            config = S3Config(endpoint_url=s3.url, bucket_name="etrap-bench",
+                              access_key_id="bench", secret_access_key="bench")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0):
+        self.objects: Dict[Tuple[str, str], _StoredObject] = {}
+        self.latency_ms = latency_ms  # Added before every response, like a remote region
+        self.request_count = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Endpoint URL to pass as ``S3Config.endpoint_url``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def put_object(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_encoding: Optional[str] = None,
+        modified: Optional[float] = None
+    ) -> str:
+        """Store an object and return its ETag."""
+        stored = _StoredObject(data, content_encoding, modified if modified is not None else time.time())
+        with self._lock:
+            self.objects[(bucket, key)] = stored
+        return stored.etag
+
+    def put_batch(self, bucket: str, batch_json: Dict, compress: bool = False) -> str:
+        """
+        Store a batch at the CDC agent key layout.
+
+        Args:
+            bucket: Bucket name
+            batch_json: Batch JSON document
+            compress: Store ``batch-data.json.gz`` instead of the plain object
+
+        Returns:
+            The object key
+        """
+        data = json.dumps(batch_json).encode()
+        key = f"{batch_key(batch_json)}batch-data.json"
+        if compress:
+            key += ".gz"
+            data = gzip.compress(data)
+        self.put_object(bucket, key, data)
+        return key
+
+    def start(self) -> "FakeS3Server":
+        """Start serving in a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeS3Server":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_HEAD(self):
+                self._serve(send_body=False)
+
+            def do_GET(self):
+                self._serve(send_body=True)
+
+            def _serve(self, send_body: bool):
+                path = unquote(urlsplit(self.path).path).lstrip("/")
+                bucket, _, key = path.partition("/")
+                with server._lock:
+                    server.request_count += 1
+                    stored = server.objects.get((bucket, key))
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+
+                if stored is None:
+                    self._error(404, "NoSuchKey", "The specified key does not exist.", path)
+                    return
+
+                if self._not_modified(stored):
+                    self.send_response(304)
+                    self.send_header("ETag", stored.etag)
+                    self.send_header("Last-Modified", stored.last_modified)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                data = stored.data
+                status = 200
+                headers = {}
+                byte_range = self.headers.get("Range")
+                if byte_range and byte_range.startswith("bytes="):
+                    start_text, _, end_text = byte_range[len("bytes="):].partition("-")
+                    if start_text:
+                        start = int(start_text)
+                        end = min(int(end_text), len(data) - 1) if end_text else len(data) - 1
+                    else:
+                        start = max(len(data) - int(end_text), 0)
+                        end = len(data) - 1
+                    if start >= len(data) or start > end:
+                        self._error(416, "InvalidRange", "The requested range is not satisfiable", path)
+                        return
+                    status = 206
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    data = data[start:end + 1]
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("ETag", stored.etag)
+                self.send_header("Last-Modified", stored.last_modified)
+                self.send_header("Accept-Ranges", "bytes")
+                if stored.content_encoding:
+                    self.send_header("Content-Encoding", stored.content_encoding)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(data)
+                    with server._lock:
+                        server.bytes_sent += len(data)
+
+            def _not_modified(self, stored: _StoredObject) -> bool:
+                if_none_match = self.headers.get("If-None-Match")
+                if if_none_match is not None:
+                    return stored.etag in [tag.strip() for tag in if_none_match.split(",")]
+                if_modified_since = self.headers.get("If-Modified-Since")
+                if if_modified_since:
+                    try:
+                        return stored.modified <= parsedate_to_datetime(if_modified_since).timestamp()
+                    except (TypeError, ValueError):
+                        return False
+                return False
+
+            def _error(self, status: int, code: str, message: str, resource: str):
+                body = _ERROR_XML.format(code=code, message=message, resource=resource).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic ETRAP batches over a local S3 API')
+    parser.add_argument('--bucket', default='etrap-bench', help='Bucket name (default: etrap-bench)')
+    parser.add_argument('--batches', type=int, default=4, help='Number of batches (default: 4)')
+    parser.add_argument('--size', type=int, default=1024, help='Transactions per batch (default: 1024)')
+    parser.add_argument('--gzip', action='store_true', help='Store batch-data.json.gz objects')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=9000, help='Port (default: 9000)')
+    args = parser.parse_args()
+
+    server = FakeS3Server(args.host, args.port)
+    for batch_json, _ in generate_batches(args.batches, args.size):
+        key = server.put_batch(args.bucket, batch_json, compress=args.gzip)
+        print(f"📦 s3://{args.bucket}/{key}")
+
+    print(f"🚀 Serving on {server.url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+ETRAP SDK - Import Time Benchmark
+================================================================================
+
+Measures the cold-start cost of the SDK: `import etrap_sdk` and constructing
+an ETRAPClient, each in a fresh interpreter. CLI tools and serverless
+functions pay this on every launch, so the SDK defers boto3 and py_near until
+a call needs S3 or NEAR.
+
+What this tool does:
+- Runs a fresh interpreter per sample and times the import and construction
+- Reports the median and worst import and construction times
+- Checks that boto3, botocore and py_near were not imported
+- Exits non-zero when the median exceeds --budget-ms or a deferred module
+  was imported
+
+Usage: python benchmarks/import_time.py [--samples N] [--budget-ms MS]
+
+Example: python benchmarks/import_time.py --samples 10 --budget-ms 250
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Modules that must only be imported when S3 or NEAR is actually used
+DEFERRED_MODULES = ("boto3", "botocore", "py_near")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import etrap_sdk
+imported = time.perf_counter()
+etrap_sdk.ETRAPClient("bench", s3_config=etrap_sdk.S3Config(bucket_name="etrap-bench"))
+constructed = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "construct_ms": (constructed - imported) * 1000,
+    "loaded": sorted(m for m in %r if m in sys.modules),
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def sample() -> Dict:
+    """Time one cold import in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure ETRAP SDK import time')
+    parser.add_argument('--samples', type=int, default=5, help='Fresh interpreters to time (default: 5)')
+    parser.add_argument('--budget-ms', type=float, default=300.0,
+                        help='Maximum median import time in ms (default: 300)')
+    args = parser.parse_args()
+
+    samples: List[Dict] = [sample() for _ in range(max(args.samples, 1))]
+    imports = [s["import_ms"] for s in samples]
+    constructs = [s["construct_ms"] for s in samples]
+    loaded = sorted({module for s in samples for module in s["loaded"]})
+
+    print(f"import etrap_sdk:  median {statistics.median(imports):7.1f} ms   max {max(imports):7.1f} ms")
+    print(f"ETRAPClient(...):  median {statistics.median(constructs):7.1f} ms   max {max(constructs):7.1f} ms")
+
+    failures = []
+    if statistics.median(imports) > args.budget_ms:
+        failures.append(f"median import time {statistics.median(imports):.1f} ms exceeds {args.budget_ms:.0f} ms")
+    if loaded:
+        failures.append(f"deferred modules imported at startup: {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+ETRAP SDK - Offline Benchmark Suite
+================================================================================
+
+Measures SDK throughput and latency against local stand-ins for NEAR and S3,
+so results are reproducible and need no network access or credentials.
+
+What this tool does:
+- Generates synthetic CDC-layout batches (power-of-2 padded Merkle trees)
+- Serves them from an in-memory S3 (fake_s3.py) and an in-memory ETRAP
+  contract behind a NEAR JSON-RPC endpoint (fake_near.py)
+- Times verify_transaction, verify_batch, get_merkle_proof and list_batches
+- Reports count, mean, p50/p90/p99/max latency and operations per second
+- Optionally saves results as JSON and compares them with a saved baseline,
+  exiting non-zero when an operation regressed beyond a threshold
+
+Usage: python benchmarks/run_benchmarks.py [--batches N] [--size N]
+           [--iterations N] [--concurrency N] [--cold] [--s3-latency MS]
+           [--config KEY=VALUE ...] [--output FILE] [--baseline FILE]
+
+Example: python benchmarks/run_benchmarks.py --size 4096 --output base.json
+         python benchmarks/run_benchmarks.py --size 4096 --baseline base.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from fake_near import FakeNearServer
+from fake_s3 import FakeS3Server
+from synthetic import generate_batches
+
+from etrap_sdk import ETRAPClient, S3Config, VerificationHints
+from etrap_sdk.utils import compute_transaction_hash
+
+BUCKET = "etrap-bench"
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted sample list."""
+    if not samples:
+        return 0.0
+    rank = max(int(round(fraction * len(samples) + 0.5)) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+def summarize(latencies_ms: List[float], wall_s: float, errors: int, items: int) -> Dict[str, Any]:
+    """Build the result record for one benchmark."""
+    ordered = sorted(latencies_ms)
+    count = len(ordered)
+    return {
+        "count": count,
+        "errors": errors,
+        "mean_ms": sum(ordered) / count if count else 0.0,
+        "p50_ms": percentile(ordered, 0.50),
+        "p90_ms": percentile(ordered, 0.90),
+        "p99_ms": percentile(ordered, 0.99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+        "ops_per_sec": count / wall_s if wall_s else 0.0,
+        "items_per_sec": items / wall_s if wall_s else 0.0,
+    }
+
+
+async def measure(
+    inputs: Sequence[Any],
+    operation: Callable[[Any], Awaitable[bool]],
+    concurrency: int,
+    before_each: Callable[[], None] = None,
+    items_per_op: int = 1
+) -> Dict[str, Any]:
+    """
+    Run an operation once per input and time each call.
+
+    Args:
+        inputs: One input per call
+        operation: Coroutine function returning True on success
+        concurrency: Maximum calls in flight
+        before_each: Optional hook run before each call (e.g. cache reset)
+        items_per_op: Items processed per call, for items_per_sec
+
+    Returns:
+        Result record (see summarize())
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def run_one(item):
+        nonlocal errors
+        async with semaphore:
+            if before_each:
+                before_each()
+            start = time.perf_counter()
+            try:
+                ok = await operation(item)
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(run_one(item) for item in inputs))
+    wall_s = time.perf_counter() - wall_start
+    return summarize(latencies, wall_s, errors, len(inputs) * items_per_op)
+
+
+async def run(args) -> Dict[str, Any]:
+    """Start the stand-ins, run all benchmarks and return the results."""
+    print(f"📦 Generating {args.batches} batches of {args.size} transactions...")
+    batches = generate_batches(args.batches, args.size, args.seed)
+    rng = random.Random(args.seed)
+
+    with FakeS3Server(latency_ms=args.s3_latency) as s3, FakeNearServer() as near:
+        for batch_json, _ in batches:
+            key = s3.put_batch(BUCKET, batch_json, compress=args.gzip)
+            near.add_batch(batch_json, BUCKET, size_bytes=len(s3.objects[(BUCKET, key)].data))
+
+        client = ETRAPClient(
+            "bench",
+            network="testnet",
+            rpc_endpoint=near.url,
+            s3_config=S3Config(
+                endpoint_url=s3.url,
+                bucket_name=BUCKET,
+                access_key_id="bench",
+                secret_access_key="bench",
+                max_pool_connections=max(args.concurrency, 10)
+            )
+        )
+        client.update_config(args.config)
+        reset_cache = client._cache.clear if args.cold else None
+
+        samples = []
+        for _ in range(args.iterations):
+            batch_json, rows = rng.choice(batches)
+            position = rng.randrange(len(rows))
+            samples.append((batch_json["batch_info"]["batch_id"], rows[position]))
+
+        async def verify_hinted(sample):
+            batch_id, row = sample
+            result = await client.verify_transaction(row, hints=VerificationHints(batch_id=batch_id))
+            return result.verified
+
+        async def verify_search(sample):
+            result = await client.verify_transaction(sample[1])
+            return result.verified
+
+        async def merkle_proof(sample):
+            batch_id, row = sample
+            proof = await client.get_merkle_proof(batch_id, compute_transaction_hash(row))
+            return bool(proof and proof.is_valid)
+
+        groups = []
+        for n in range(max(args.iterations // args.group_size, 1)):
+            batch_json, rows = batches[n % len(batches)]
+            groups.append((
+                batch_json["batch_info"]["batch_id"],
+                rng.sample(rows, min(args.group_size, len(rows)))
+            ))
+
+        async def verify_group(group):
+            batch_id, rows = group
+            result = await client.verify_batch(rows, hints=VerificationHints(batch_id=batch_id))
+            return result.failed == 0
+
+        async def list_recent(_):
+            batch_list = await client.list_batches(limit=100)
+            return len(batch_list.batches) == len(batches)
+
+        benchmarks = [
+            ("verify_transaction[batch_hint]", samples, verify_hinted, reset_cache, 1),
+            ("verify_transaction[search]", samples[:args.search_iterations], verify_search, reset_cache, 1),
+            ("verify_batch", groups, verify_group, reset_cache, args.group_size),
+            ("get_merkle_proof", samples, merkle_proof, reset_cache, 1),
+            ("list_batches", range(args.list_iterations), list_recent, None, 1),
+        ]
+
+        results = {}
+        for name, inputs, operation, before_each, items in benchmarks:
+            if args.only and name.split('[')[0] not in args.only:
+                continue
+            print(f"⏱️  {name} ({len(inputs)} calls)...")
+            results[name] = await measure(inputs, operation, args.concurrency, before_each, items)
+
+        results["_transfer"] = {
+            "s3_requests": s3.request_count,
+            "s3_bytes": s3.bytes_sent,
+            "rpc_calls": sum(near.call_counts.values()),
+        }
+
+    return {
+        "config": {
+            "batches": args.batches,
+            "size": args.size,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "cold": args.cold,
+            "gzip": args.gzip,
+            "s3_latency_ms": args.s3_latency,
+            "client_config": args.config,
+        },
+        "results": results,
+    }
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    """Print a results table."""
+    print()
+    print(f"{'benchmark':<32} {'count':>6} {'err':>4} {'p50 ms':>9} {'p90 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9} {'ops/s':>9}")
+    print("-" * 94)
+    for name, r in report["results"].items():
+        if name.startswith("_"):
+            continue
+        print(f"{name:<32} {r['count']:>6} {r['errors']:>4} {r['p50_ms']:>9.2f} {r['p90_ms']:>9.2f} "
+              f"{r['p99_ms']:>9.2f} {r['max_ms']:>9.2f} {r['ops_per_sec']:>9.1f}")
+    transfer = report["results"].get("_transfer", {})
+    if transfer:
+        print()
+        print(f"S3: {transfer['s3_requests']} requests, {transfer['s3_bytes']:,} bytes | "
+              f"NEAR RPC: {transfer['rpc_calls']} calls")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare results with a baseline report.
+
+    Returns:
+        Descriptions of benchmarks whose p50 latency grew or whose throughput
+        dropped by more than ``threshold`` (a fraction, e.g. 0.2)
+    """
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if name.startswith("_") or not previous:
+            continue
+        if previous["p50_ms"] and current["p50_ms"] > previous["p50_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']:.2f} ms -> {current['p50_ms']:.2f} ms"
+            )
+        if previous["ops_per_sec"] and current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['ops_per_sec']:.1f} -> {current['ops_per_sec']:.1f} ops/s"
+            )
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: errors {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def parse_config(values: List[str]) -> Dict[str, Any]:
+    """Parse KEY=VALUE client config overrides (values as JSON when possible)."""
+    config = {}
+    for item in values:
+        key, _, value = item.partition('=')
+        try:
+            config[key] = json.loads(value)
+        except json.JSONDecodeError:
+            config[key] = value
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run offline ETRAP SDK benchmarks')
+    parser.add_argument('--batches', type=int, default=8, help='Number of batches (default: 8)')
+    parser.add_argument('--size', type=int, default=1024, help='Transactions per batch (default: 1024)')
+    parser.add_argument('--iterations', type=int, default=500, help='Calls per benchmark (default: 500)')
+    parser.add_argument('--search-iterations', type=int, default=50,
+                        help='Calls for the unhinted search benchmark (default: 50)')
+    parser.add_argument('--list-iterations', type=int, default=50, help='list_batches calls (default: 50)')
+    parser.add_argument('--group-size', type=int, default=50, help='Transactions per verify_batch call (default: 50)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Calls in flight (default: 1)')
+    parser.add_argument('--cold', action='store_true', help='Clear the client cache before every call')
+    parser.add_argument('--s3-latency', type=float, default=0.0,
+                        help='Delay added to every S3 response in ms (default: 0)')
+    parser.add_argument('--gzip', action='store_true', help='Store batch data as batch-data.json.gz')
+    parser.add_argument('--config', nargs='*', default=[], metavar='KEY=VALUE',
+                        help='Client config overrides, e.g. compact_cache=true')
+    parser.add_argument('--only', nargs='*', help='Run only these benchmarks (e.g. get_merkle_proof)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--baseline', help='Compare with a previous JSON report')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed regression as a fraction (default: 0.2)')
+    args = parser.parse_args()
+    args.config = parse_config(args.config)
+    if args.gzip:
+        args.config.setdefault('compressed_transfer', True)
+
+    logging.getLogger('etrap_sdk').setLevel(logging.CRITICAL)
+
+    report = asyncio.run(run(args))
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Synthetic ETRAP batches for offline benchmarks.
+
+Generates batch-data.json documents in the CDC agent layout: transaction
+metadata hashed with the SDK's compute_transaction_hash(), a Merkle tree
+padded to a power of two by repeating the last leaf, proof_index entries with
+sibling positions, search indices, compliance and verification sections.
+The source rows are returned alongside so verify_transaction() can be called
+with data that hashes to a real leaf.
+
+Usage: python benchmarks/synthetic.py <output_dir> [--batches N] [--size N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+# Import etrap_sdk from the source tree
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from etrap_sdk.utils import compute_transaction_hash
+
+OPERATIONS = ("INSERT", "UPDATE", "DELETE")
+BASE_TIMESTAMP_MS = 1750000000000
+
+
+def build_merkle_tree(leaves: List[str]) -> Dict[str, Any]:
+    """
+    Build a power-of-2 padded SHA-256 Merkle tree over hex leaf hashes.
+
+    Args:
+        leaves: Leaf hashes in transaction order
+
+    Returns:
+        ``merkle_tree`` section with algorithm, root, height, nodes and
+        proof_index entries for the real (unpadded) leaves
+    """
+    width = 1
+    while width < len(leaves):
+        width *= 2
+    level = list(leaves) + [leaves[-1]] * (width - len(leaves))
+
+    levels = [level]
+    while len(level) > 1:
+        level = [
+            hashlib.sha256((level[i] + level[i + 1]).encode()).hexdigest()
+            for i in range(0, len(level), 2)
+        ]
+        levels.append(level)
+
+    nodes = []
+    offsets = []
+    for depth, hashes in enumerate(levels):
+        offsets.append(len(nodes))
+        for i, node_hash in enumerate(hashes):
+            node = {"index": len(nodes), "hash": node_hash, "level": depth}
+            if depth:
+                node["left_child"] = offsets[depth - 1] + 2 * i
+                node["right_child"] = offsets[depth - 1] + 2 * i + 1
+            nodes.append(node)
+
+    proof_index = {}
+    for leaf_index in range(len(leaves)):
+        path = []
+        positions = []
+        index = leaf_index
+        for hashes in levels[:-1]:
+            path.append(hashes[index ^ 1])
+            positions.append("left" if index % 2 else "right")
+            index //= 2
+        proof_index[f"tx-{leaf_index}"] = {
+            "leaf_index": leaf_index,
+            "proof_path": path,
+            "sibling_positions": positions,
+        }
+
+    return {
+        "algorithm": "sha256",
+        "root": levels[-1][0],
+        "height": len(levels) - 1,
+        "nodes": nodes,
+        "proof_index": proof_index,
+    }
+
+
+def generate_batch(
+    batch_id: str,
+    size: int,
+    organization_id: str = "bench",
+    database_name: str = "benchdb",
+    table_name: str = "bench_transactions",
+    start_ms: int = BASE_TIMESTAMP_MS,
+    seed: int = 0
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Generate one synthetic batch.
+
+    Args:
+        batch_id: Batch identifier, also the transaction ID prefix
+        size: Number of transactions
+        organization_id: Organization written to batch_info
+        database_name: Database name of every transaction
+        table_name: Table name of every transaction
+        start_ms: Timestamp of the first transaction in milliseconds
+        seed: Random seed for row contents and operation types
+
+    Returns:
+        Tuple of (batch JSON, source rows in transaction order)
+    """
+    if size < 1:
+        raise ValueError("Batch size must be at least 1")
+
+    rng = random.Random(f"{batch_id}:{seed}")
+    rows = []
+    transactions = []
+    for i in range(size):
+        timestamp = start_ms + i * 10
+        created_at = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
+        row = {
+            "id": i,
+            "account_id": f"ACC{rng.randrange(100000):05d}",
+            "amount": round(rng.uniform(1, 10000), 2),
+            "type": rng.choice("CD"),
+            "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            "reference": f"{batch_id}-REF-{i}",
+        }
+        operation = rng.choice(OPERATIONS)
+        leaf = compute_transaction_hash(row)
+        rows.append(row)
+        transactions.append({
+            "metadata": {
+                "transaction_id": f"{batch_id}-{i}",
+                "timestamp": timestamp,
+                "operation_type": operation,
+                "database_name": database_name,
+                "table_affected": table_name,
+                "rows_affected": {
+                    "inserted": int(operation == "INSERT"),
+                    "updated": int(operation == "UPDATE"),
+                    "deleted": int(operation == "DELETE"),
+                },
+                "hash": leaf,
+                "user_id": "bench",
+                "lsn": 1000000 + i,
+                "transaction_db_id": i,
+            },
+            "merkle_leaf": {"index": i, "hash": leaf},
+            "data_location": {
+                "encrypted": False,
+                "storage_path": f"{database_name}/{table_name}/{batch_id}/transactions/tx-{i}.json",
+                "retention_expires": None,
+            },
+        })
+
+    merkle_tree = build_merkle_tree([tx["metadata"]["hash"] for tx in transactions])
+
+    by_timestamp: Dict[str, List[str]] = {}
+    by_operation: Dict[str, List[str]] = {}
+    by_date: Dict[str, List[str]] = {}
+    for tx in transactions:
+        metadata = tx["metadata"]
+        tx_id = metadata["transaction_id"]
+        day = datetime.fromtimestamp(metadata["timestamp"] / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        by_timestamp.setdefault(str(metadata["timestamp"]), []).append(tx_id)
+        by_operation.setdefault(metadata["operation_type"], []).append(tx_id)
+        by_date.setdefault(day, []).append(tx_id)
+
+    batch_json = {
+        "batch_info": {
+            "batch_id": batch_id,
+            "created_at": start_ms + size * 10,
+            "organization_id": organization_id,
+            "database_name": database_name,
+            "etrap_agent_version": "bench",
+        },
+        "transactions": transactions,
+        "merkle_tree": merkle_tree,
+        "indices": {
+            "by_timestamp": by_timestamp,
+            "by_operation": by_operation,
+            "by_date": by_date,
+        },
+        "compliance": {
+            "rules_applied": [],
+            "data_classifications": [],
+            "retention_policy": "indefinite",
+            "compliance_checks": [],
+        },
+        "verification": {
+            "batch_signature": hashlib.sha256(merkle_tree["root"].encode()).hexdigest(),
+            "signing_algorithm": "sha256",
+            "signer_public_key": "bench-key",
+            "attestations": [],
+        },
+    }
+    return batch_json, rows
+
+
+def generate_batches(count: int, size: int, seed: int = 0) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Generate a sequence of batches one hour apart, oldest first.
+
+    Args:
+        count: Number of batches
+        size: Transactions per batch
+        seed: Random seed
+
+    Returns:
+        List of (batch JSON, source rows) tuples
+    """
+    return [
+        generate_batch(
+            f"BATCH-BENCH-{n:04d}",
+            size,
+            start_ms=BASE_TIMESTAMP_MS + n * 3600 * 1000,
+            seed=seed + n
+        )
+        for n in range(count)
+    ]
+
+
+def batch_key(batch_json: Dict[str, Any]) -> str:
+    """Return the S3 key prefix the CDC agent uses for a batch."""
+    info = batch_json["batch_info"]
+    table_name = batch_json["transactions"][0]["metadata"]["table_affected"]
+    return f"{info['database_name']}/{table_name}/{info['batch_id']}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic ETRAP batch-data.json files')
+    parser.add_argument('output_dir', help='Directory for <batch_id>/batch-data.json files')
+    parser.add_argument('--batches', type=int, default=1, help='Number of batches (default: 1)')
+    parser.add_argument('--size', type=int, default=1024, help='Transactions per batch (default: 1024)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    for batch_json, rows in generate_batches(args.batches, args.size, args.seed):
+        batch_id = batch_json["batch_info"]["batch_id"]
+        batch_dir = os.path.join(args.output_dir, batch_id)
+        os.makedirs(batch_dir, exist_ok=True)
+        with open(os.path.join(batch_dir, "batch-data.json"), "w") as f:
+            json.dump(batch_json, f)
+        with open(os.path.join(batch_dir, "rows.json"), "w") as f:
+            json.dump(rows, f)
+        print(f"📦 {batch_id}: {len(rows)} transactions, root {batch_json['merkle_tree']['root'][:16]}...")
+
+
+if __name__ == '__main__':
+    main()
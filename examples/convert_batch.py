@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+ETRAP SDK - Local Batch File Converter
+================================================================================
+
+Converts ETRAP batch-data.json files into the SDK's binary batch format so
+they can be memory-mapped for offline analysis and verification.
+
+What this tool does:
+- Writes a .etrapb file next to (or instead of) each batch JSON file
+- Reopens the binary file and checks every transaction hash and proof
+- Optionally probes a single transaction hash without parsing any JSON
+
+Point ETRAPClient at the output directory with
+client.update_config({"local_batch_dir": "<dir>"}) and get_batch_data(),
+get_merkle_proof() and verify_transaction() will read these files instead of
+downloading from S3.
+
+Usage: python convert_batch.py <batch-data.json> [--output-dir DIR] [--probe HASH]
+
+Example: python convert_batch.py examples/batch-multi.json --output-dir /tmp/batches
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path to import etrap_sdk
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(parent_dir, 'src'))
+
+from etrap_sdk.batch_file import FILE_SUFFIX, MappedBatch, write_batch_file  # noqa: E402
+from etrap_sdk.utils import validate_merkle_proof  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert batch JSON to the binary batch format')
+    parser.add_argument('batch_file', help='Path to batch-data.json')
+    parser.add_argument('--output-dir', help='Output directory (default: next to input)')
+    parser.add_argument('--probe', help='Transaction hash to look up in the converted file')
+    args = parser.parse_args()
+
+    with open(args.batch_file, 'r') as f:
+        batch_json = json.load(f)
+
+    batch_id = batch_json.get('batch_info', {}).get('batch_id') or os.path.splitext(
+        os.path.basename(args.batch_file))[0]
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.batch_file))
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{batch_id}{FILE_SUFFIX}")
+
+    size = write_batch_file(batch_json, output_path)
+    print(f"📦 Wrote {output_path} ({size:,} bytes)")
+
+    with MappedBatch(output_path) as batch:
+        # Check every proof against the stored root
+        valid = 0
+        for position in range(len(batch)):
+            proof = batch.proof(position)
+            if proof and validate_merkle_proof(
+                batch.leaf_hash(position),
+                proof['proof_path'],
+                proof['sibling_positions'],
+                batch.root
+            ):
+                valid += 1
+        print(f"🔐 {valid}/{len(batch)} proofs validate against root {batch.root[:16]}...")
+
+        if args.probe:
+            start = time.perf_counter()
+            positions = batch.find(args.probe)
+            elapsed_us = (time.perf_counter() - start) * 1_000_000
+            if positions:
+                for position in positions:
+                    print(f"✅ Found at position {position} "
+                          f"({batch.operation_type(position)}) in {elapsed_us:.0f} µs")
+            else:
+                print(f"❌ Hash not found ({elapsed_us:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
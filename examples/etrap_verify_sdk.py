@@ -10,6 +10,7 @@ etrap_verify.py with enhanced features and cleaner interface.
 
 What this tool provides:
 - Single transaction verification against blockchain records
+- Bulk verification of JSONL or CSV rows with JSONL results
 - Multiple input methods (JSON string, file, stdin)
 - Optimization hints for faster verification (batch, table, database, time)
 - Smart contract or local verification methods
@@ -35,10 +36,19 @@ Basic Examples:
     etrap_verify_sdk.py -o lunaris --data-file tx.json --hint-batch BATCH-2025-06-28-1107c8e1
     etrap_verify_sdk.py -o lunaris --data-file tx.json --hint-time-start 2025-06-28
 
+    # Verify many rows in one process (JSONL or CSV in, JSONL out)
+    etrap_verify_sdk.py -o lunaris --bulk rows.jsonl --output results.jsonl
+    cat rows.csv | etrap_verify_sdk.py -o lunaris --bulk - --format csv
+
 Arguments:
     -o, --organization    Organization ID (required, e.g., lunaris, acme)
     --data               Transaction JSON string (use "-" for stdin)
     --data-file          Path to file containing transaction JSON
+    --bulk               JSONL or CSV file of transactions ("-" for stdin)
+    --format             Bulk input format: jsonl or csv (default: from extension)
+    --output             Bulk results file (default: stdout)
+    --concurrency        Bulk verifications in flight (default: 16)
+    --csv-type           CSV column type as COLUMN=TYPE (str, int, float, bool, json)
     --hint-batch         Specific batch ID for direct lookup
     --hint-time-start    Start time for time range search
     --hint-time-end      End time for time range search
@@ -50,18 +60,23 @@ For complete documentation and examples, see examples/README.md
 
 import argparse
 import asyncio
+import contextlib
+import csv
 import json
 import sys
 import os
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, Optional, Tuple
 
 # Add parent directory to path to import etrap_sdk
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(parent_dir, 'src'))
 
-from etrap_sdk import ETRAPClient, S3Config, VerificationHints, TimeRange
+from etrap_sdk import ETRAPClient, S3Config, VerificationHints, TimeRange, InvalidTransactionError
 from etrap_sdk.utils import format_transaction_summary
+from etrap_sdk.compact import as_batch_view  # noqa: E402
 
 
 def print_verification_result(
@@ -211,6 +226,27 @@ def print_verification_result(
             print("  • The transaction data doesn't match exactly")
 
 
+def build_verification_hints(hints: Optional[Dict[str, Any]]) -> Optional[VerificationHints]:
+    """Build SDK verification hints from the parsed hint options."""
+    if not hints:
+        return None
+
+    time_range = None
+    if hints.get('time_start') and hints.get('time_end'):
+        time_range = TimeRange(
+            start=hints['time_start'],
+            end=hints['time_end']
+        )
+
+    return VerificationHints(
+        batch_id=hints.get('batch_id'),
+        table_name=hints.get('table'),
+        database_name=hints.get('database'),
+        time_range=time_range,
+        expected_operation=hints.get('expected_operation')
+    )
+
+
 async def verify_transaction(
     client: ETRAPClient,
     transaction_data: Dict[str, Any],
@@ -225,22 +261,7 @@ async def verify_transaction(
     }
     
     # Create verification hints if provided
-    verification_hints = None
-    if hints:
-        time_range = None
-        if hints.get('time_start') and hints.get('time_end'):
-            time_range = TimeRange(
-                start=hints['time_start'],
-                end=hints['time_end']
-            )
-        
-        verification_hints = VerificationHints(
-            batch_id=hints.get('batch_id'),
-            table_name=hints.get('table'),
-            database_name=hints.get('database'),
-            time_range=time_range,
-            expected_operation=hints.get('expected_operation')
-        )
+    verification_hints = build_verification_hints(hints)
     
     # Track if we're using direct batch lookup
     using_batch_hint = hints and hints.get('batch_id')
@@ -311,13 +332,12 @@ async def verify_transaction(
                     # Check cached batch data for operation type
                     cache_key = f"batch_data_{result.batch_id}"
                     if cache_key in client._cache:
-                        batch_json = client._cache[cache_key]
+                        batch_view = as_batch_view(client._cache[cache_key])
                         # Find transaction by hash
-                        for tx in batch_json.get('transactions', []):
-                            if tx.get('metadata', {}).get('hash') == result.transaction_hash:
-                                response['operation_type'] = tx['metadata'].get('operation_type', 'INSERT')
-                                response['position'] = int(tx['metadata']['transaction_id'].split('-')[-1])
-                                break
+                        for position in batch_view.find(result.transaction_hash):
+                            response['operation_type'] = batch_view.operation_type(position) or 'INSERT'
+                            response['position'] = int(batch_view.transaction_id(position).split('-')[-1])
+                            break
             except:
                 # Default to INSERT if can't determine
                 response['operation_type'] = 'INSERT'
@@ -339,6 +359,173 @@ def load_transaction_data(args) -> Dict[str, Any]:
         return json.loads(args.data)
 
 
+def parse_bool(value: str) -> bool:
+    """Parse a CSV boolean cell (true/false, t/f, yes/no, 1/0)."""
+    lowered = value.strip().lower()
+    if lowered in ('true', 't', 'yes', 'y', '1'):
+        return True
+    if lowered in ('false', 'f', 'no', 'n', '0'):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+# Types accepted by --csv-type
+CSV_TYPES = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': parse_bool,
+    'json': json.loads,
+}
+
+
+def parse_csv_types(specs: Optional[list]) -> Dict[str, str]:
+    """Parse repeated --csv-type COLUMN=TYPE options into a column -> type map."""
+    column_types = {}
+    for spec in specs or []:
+        column, _, column_type = spec.partition('=')
+        if not column or column_type not in CSV_TYPES:
+            raise ValueError(f"Invalid --csv-type {spec!r}: use COLUMN=TYPE with TYPE one of {', '.join(CSV_TYPES)}")
+        column_types[column] = column_type
+    return column_types
+
+
+def parse_csv_value(value: Optional[str], column_type: str = 'str') -> Any:
+    """
+    Convert a CSV cell to the value the database returned.
+
+    Cells stay strings unless their column has an explicit type, because the
+    transaction hash depends on the exact value: guessing would turn "007"
+    into 7. Empty cells become null.
+    """
+    if value is None or value == '':
+        return None
+    return CSV_TYPES[column_type](value)
+
+
+def read_bulk_rows(
+    source,
+    input_format: str,
+    column_types: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line number, transaction) pairs from a JSONL or CSV stream.
+
+    Rows are read one at a time so memory does not grow with the input size.
+    A line that cannot be parsed is yielded as an Exception instead of a row.
+    """
+    if input_format == 'csv':
+        column_types = column_types or {}
+        reader = csv.DictReader(source)
+        for row in reader:
+            try:
+                yield reader.line_num, {
+                    key: parse_csv_value(value, column_types.get(key, 'str'))
+                    for key, value in row.items()
+                }
+            except ValueError as e:
+                yield reader.line_num, e
+        return
+
+    for line_number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, e
+
+
+def bulk_result(line_number: int, result) -> Dict[str, Any]:
+    """Build the JSONL result record for one bulk row."""
+    return {
+        'line': line_number,
+        'verified': result.verified,
+        'transaction_hash': result.transaction_hash,
+        'batch_id': result.batch_id,
+        'blockchain_timestamp': result.blockchain_timestamp,
+        'operation_type': result.operation_type,
+        'error': result.error
+    }
+
+
+async def verify_bulk(
+    client: ETRAPClient,
+    rows: Iterator[Tuple[int, Any]],
+    output,
+    hints: Optional[Dict[str, Any]] = None,
+    use_contract_verification: bool = False,
+    concurrency: int = 16
+) -> Dict[str, Any]:
+    """
+    Verify a stream of rows and write one JSONL result per row, in input order.
+
+    At most ``concurrency`` verifications are in flight, and results are
+    written as soon as every earlier row has finished, so memory stays
+    bounded by the window rather than the input size. All rows share the
+    client, so batches downloaded for one row serve the rest from cache.
+
+    Returns:
+        Summary with row counts, elapsed time and rows per second
+    """
+    verification_hints = build_verification_hints(hints)
+    window = deque()
+    stats = {'rows': 0, 'verified': 0, 'failed': 0, 'invalid': 0}
+    started = time.perf_counter()
+
+    def write(line_number: int, record: Dict[str, Any]):
+        stats['rows'] += 1
+        if isinstance(record, (ValueError, InvalidTransactionError)):
+            stats['invalid'] += 1
+            record = {'line': line_number, 'verified': False, 'error': f"Invalid row: {record}"}
+        elif isinstance(record, Exception):
+            stats['failed'] += 1
+            record = {'line': line_number, 'verified': False, 'error': f"Verification error: {record}"}
+        elif record['verified']:
+            stats['verified'] += 1
+        else:
+            stats['failed'] += 1
+        output.write(json.dumps(record, default=str) + '\n')
+
+    async def verify(line_number: int, row: Dict[str, Any]) -> Any:
+        # Errors become that row's result instead of aborting the run
+        try:
+            result = await client.verify_transaction(
+                preprocess_transaction_data(row),
+                hints=verification_hints,
+                use_contract_verification=use_contract_verification
+            )
+        except Exception as e:
+            return e
+        return bulk_result(line_number, result)
+
+    try:
+        for line_number, row in rows:
+            if isinstance(row, Exception) or not isinstance(row, dict):
+                error = row if isinstance(row, Exception) else ValueError("expected a JSON object")
+                window.append((line_number, None, error))
+            else:
+                window.append((line_number, asyncio.ensure_future(verify(line_number, row)), None))
+
+            # Keep the window bounded; write finished rows in input order
+            while window and (len(window) >= concurrency or window[0][1] is None or window[0][1].done()):
+                head_line, task, error = window.popleft()
+                write(head_line, error if task is None else await task)
+
+        while window:
+            head_line, task, error = window.popleft()
+            write(head_line, error if task is None else await task)
+    finally:
+        for _, task, _ in window:
+            if task is not None:
+                task.cancel()
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed_seconds'] = round(elapsed, 3)
+    stats['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed > 0 else 0.0
+    return stats
+
+
 def preprocess_transaction_data(data: Any) -> Any:
     """
     Preprocess transaction data to convert ISO date strings to epoch milliseconds.
@@ -421,6 +608,50 @@ def preprocess_transaction_data(data: Any) -> Any:
         return data
 
 
+def parse_hints(args) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Build the hints dictionary from command-line options.
+
+    Returns:
+        (hints, None) on success or (None, error message)
+    """
+    hints = {}
+    if args.hint_table:
+        hints['table'] = args.hint_table
+    if args.hint_batch:
+        hints['batch_id'] = args.hint_batch
+    if args.hint_database:
+        hints['database'] = args.hint_database
+    if args.operation:
+        hints['expected_operation'] = args.operation
+
+    # Parse time range hints
+    if args.hint_time_start and args.hint_time_end:
+        try:
+            # Parse start time
+            if len(args.hint_time_start) == 10:  # YYYY-MM-DD
+                start_time = datetime.strptime(args.hint_time_start, "%Y-%m-%d")
+            else:  # YYYY-MM-DD HH:MM:SS
+                start_time = datetime.strptime(args.hint_time_start, "%Y-%m-%d %H:%M:%S")
+
+            # Parse end time
+            if len(args.hint_time_end) == 10:  # YYYY-MM-DD
+                end_time = datetime.strptime(args.hint_time_end, "%Y-%m-%d")
+                # Set to end of day if only date provided
+                end_time = end_time.replace(hour=23, minute=59, second=59)
+            else:  # YYYY-MM-DD HH:MM:SS
+                end_time = datetime.strptime(args.hint_time_end, "%Y-%m-%d %H:%M:%S")
+
+            hints['time_start'] = start_time
+            hints['time_end'] = end_time
+        except ValueError as e:
+            return None, f"Error parsing time range: {e}"
+    elif args.hint_time_start or args.hint_time_end:
+        return None, "Error: Both --hint-time-start and --hint-time-end must be provided together"
+
+    return hints, None
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -445,6 +676,10 @@ Examples:
   
   # Use smart contract verification
   %(prog)s -o myorg --data-file tx.json --use-contract
+
+  # Verify every row of a JSONL or CSV file, writing JSONL results
+  %(prog)s -o myorg --bulk rows.jsonl --output results.jsonl
+  %(prog)s -o myorg --bulk rows.csv --hint-database etrapdb --concurrency 32
         """
     )
     
@@ -470,6 +705,34 @@ Examples:
         '--data-file',
         help='Path to file containing transaction JSON'
     )
+    data_group.add_argument(
+        '--bulk',
+        help='JSONL or CSV file with one transaction per row (use "-" for stdin)'
+    )
+
+    # Bulk mode options
+    parser.add_argument(
+        '--format',
+        choices=['jsonl', 'csv'],
+        help='Bulk input format (default: csv for .csv files, otherwise jsonl)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Bulk results file, one JSON object per line (default: stdout)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=16,
+        help='Bulk verifications in flight (default: 16)'
+    )
+    parser.add_argument(
+        '--csv-type',
+        action='append',
+        metavar='COLUMN=TYPE',
+        help='Type of a CSV column: str, int, float, bool or json (repeatable; '
+             'untyped columns stay strings)'
+    )
     
     # Optimization hints
     parser.add_argument(
@@ -533,6 +796,32 @@ Examples:
     if not organization:
         parser.error("Either --organization or --contract is required")
     
+    # Create hints dictionary
+    hints, error = parse_hints(args)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if args.bulk:
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        try:
+            column_types = parse_csv_types(args.csv_type)
+        except ValueError as e:
+            parser.error(str(e))
+        input_format = args.format or ('csv' if args.bulk.lower().endswith('.csv') else 'jsonl')
+        return asyncio.run(bulk_verify_with_sdk(
+            organization=organization,
+            network=args.network,
+            source=args.bulk,
+            input_format=input_format,
+            output_path=args.output,
+            hints=hints,
+            use_contract=args.use_contract,
+            concurrency=args.concurrency,
+            column_types=column_types
+        ))
+
     # Load transaction data
     try:
         transaction_data = load_transaction_data(args)
@@ -542,43 +831,6 @@ Examples:
         print(f"Error loading transaction data: {e}", file=sys.stderr)
         return 1
     
-    # Create hints dictionary
-    hints = {}
-    if args.hint_table:
-        hints['table'] = args.hint_table
-    if args.hint_batch:
-        hints['batch_id'] = args.hint_batch
-    if args.hint_database:
-        hints['database'] = args.hint_database
-    if args.operation:
-        hints['expected_operation'] = args.operation
-    
-    # Parse time range hints
-    if args.hint_time_start and args.hint_time_end:
-        try:
-            # Parse start time
-            if len(args.hint_time_start) == 10:  # YYYY-MM-DD
-                start_time = datetime.strptime(args.hint_time_start, "%Y-%m-%d")
-            else:  # YYYY-MM-DD HH:MM:SS
-                start_time = datetime.strptime(args.hint_time_start, "%Y-%m-%d %H:%M:%S")
-            
-            # Parse end time
-            if len(args.hint_time_end) == 10:  # YYYY-MM-DD
-                end_time = datetime.strptime(args.hint_time_end, "%Y-%m-%d")
-                # Set to end of day if only date provided
-                end_time = end_time.replace(hour=23, minute=59, second=59)
-            else:  # YYYY-MM-DD HH:MM:SS
-                end_time = datetime.strptime(args.hint_time_end, "%Y-%m-%d %H:%M:%S")
-            
-            hints['time_start'] = start_time
-            hints['time_end'] = end_time
-        except ValueError as e:
-            print(f"Error parsing time range: {e}", file=sys.stderr)
-            return 1
-    elif args.hint_time_start or args.hint_time_end:
-        print("Error: Both --hint-time-start and --hint-time-end must be provided together", file=sys.stderr)
-        return 1
-    
     # Run verification
     return asyncio.run(verify_with_sdk(
         organization=organization,
@@ -591,6 +843,55 @@ Examples:
     ))
 
 
+async def bulk_verify_with_sdk(
+    organization: str,
+    network: str,
+    source: str,
+    input_format: str,
+    output_path: Optional[str] = None,
+    hints: Optional[Dict[str, Any]] = None,
+    use_contract: bool = False,
+    concurrency: int = 16,
+    column_types: Optional[Dict[str, str]] = None
+) -> int:
+    """Verify every row of a JSONL or CSV input and write JSONL results."""
+    client = ETRAPClient(
+        organization_id=organization,
+        network=network,
+        s3_config=S3Config(region="us-west-2")
+    )
+
+    with contextlib.ExitStack() as files:
+        try:
+            source_file = sys.stdin if source == '-' else files.enter_context(open(source, 'r', newline=''))
+            if output_path:
+                output = files.enter_context(open(output_path, 'w'))
+            else:
+                output = sys.stdout
+                files.callback(output.flush)
+        except OSError as e:
+            print(f"Error opening bulk input/output: {e}", file=sys.stderr)
+            return 1
+
+        stats = await verify_bulk(
+            client,
+            read_bulk_rows(source_file, input_format, column_types),
+            output,
+            hints=hints,
+            use_contract_verification=use_contract,
+            concurrency=concurrency
+        )
+
+    # Throughput report goes to stderr so stdout stays valid JSONL
+    print(
+        f"Verified {stats['verified']}/{stats['rows']} rows "
+        f"({stats['failed']} not verified, {stats['invalid']} invalid) "
+        f"in {stats['elapsed_seconds']:.2f}s - {stats['rows_per_second']:.1f} rows/sec",
+        file=sys.stderr
+    )
+    return 0 if stats['verified'] == stats['rows'] else 1
+
+
 async def verify_with_sdk(
     organization: str,
     network: str,
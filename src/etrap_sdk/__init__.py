@@ -9,6 +9,9 @@ __version__ = "0.1.0"
 
 # Main client
 from .client import ETRAPClient
+from .sync import ETRAPSyncClient
+from .manager import ClientManager
+from .bundle import VerificationBundle, verify_offline
 
 # Models
 from .models import (
@@ -18,6 +21,7 @@ from .models import (
     BatchVerificationResult,
     MerkleProof,
     VerificationSummary,
+    VerificationTrace,
     
     # Batches
     BatchInfo,
@@ -79,6 +83,10 @@ from .utils import (
 __all__ = [
     # Client
     "ETRAPClient",
+    "ETRAPSyncClient",
+    "ClientManager",
+    "VerificationBundle",
+    "verify_offline",
     
     # Models
     "VerificationHints",
@@ -86,6 +94,7 @@ __all__ = [
     "BatchVerificationResult",
     "MerkleProof",
     "VerificationSummary",
+    "VerificationTrace",
     "BatchInfo",
     "BatchFilter",
     "BatchList",
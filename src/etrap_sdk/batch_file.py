@@ -0,0 +1,321 @@
+"""
+Binary on-disk batch format for local, memory-mapped access.
+
+Auditors that keep batch data on local disk can convert each batch-data.json
+once with write_batch_file() and open it afterwards with MappedBatch. The file
+is memory-mapped, so hash probes and proof lookups read only the pages they
+touch and the JSON is never parsed again.
+
+Layout (all integers little-endian)::
+
+    magic "ETRAPB01"
+    section table: one (offset, length) pair of uint64 per section
+    HEADER       compact JSON: root, algorithm, height, batch_info, names
+    LEAVES       n x 32-byte leaf digests in transaction order
+    ORDER        n x uint32 positions sorted by digest
+    OPS          n x uint16 operation type codes into header names
+    TIMESTAMPS   n x int64 transaction timestamps in milliseconds
+    META_OFFSETS (n + 1) x uint64 offsets into META
+    META         per-transaction metadata as compact JSON
+    PROOF_INDEX  n x (uint32 start, uint16 length, uint8 flags, uint64 sides)
+    PROOFS       proof path digests, 32 bytes each
+    LEVELS       uint32 level count, uint32 node count per level, digests
+"""
+
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .compact import DIGEST_SIZE, _digest
+
+MAGIC = b"ETRAPB01"
+FILE_SUFFIX = ".etrapb"
+
+_SECTIONS = (
+    "header", "leaves", "order", "ops", "timestamps", "meta_offsets",
+    "meta", "proof_index", "proofs", "levels"
+)
+_TABLE = struct.Struct("<" + "QQ" * len(_SECTIONS))
+_PROOF_ENTRY = struct.Struct("<IHBQ")
+_NO_OP = 0xFFFF
+_NO_TIMESTAMP = -(2 ** 63)
+
+
+def write_batch_file(batch_json: Dict[str, Any], path: Union[str, os.PathLike]) -> int:
+    """
+    Write batch JSON to the binary batch format.
+
+    Args:
+        batch_json: Batch JSON as stored in S3
+        path: Destination file path
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        ValueError: If transaction or proof hashes are not 32-byte hex digests
+    """
+    transactions = batch_json.get('transactions', [])
+    merkle_tree = batch_json.get('merkle_tree', {}) or {}
+    rows = [tx.get('metadata', {}) for tx in transactions]
+    count = len(rows)
+
+    leaves = b''.join(_digest(m.get('hash', '')) for m in rows)
+    order = sorted(range(count), key=lambda i: leaves[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE])
+
+    names: List[str] = []
+    codes: Dict[str, int] = {}
+    ops = bytearray()
+    timestamps = bytearray()
+    meta_offsets = bytearray()
+    meta = bytearray()
+    for m in rows:
+        op = m.get('operation_type')
+        if isinstance(op, str):
+            if op not in codes:
+                codes[op] = len(names)
+                names.append(op)
+            ops += struct.pack("<H", codes[op])
+        else:
+            ops += struct.pack("<H", _NO_OP)
+        ts = m.get('timestamp')
+        timestamps += struct.pack("<q", ts if type(ts) is int else _NO_TIMESTAMP)
+        meta_offsets += struct.pack("<Q", len(meta))
+        meta += json.dumps(m, separators=(',', ':')).encode()
+    meta_offsets += struct.pack("<Q", len(meta))
+
+    proof_index = merkle_tree.get('proof_index', {}) or {}
+    proof_entries = bytearray()
+    proofs = bytearray()
+    for i in range(count):
+        entry = proof_index.get(f"tx-{i}")
+        start = len(proofs) // DIGEST_SIZE
+        if entry is None:
+            proof_entries += _PROOF_ENTRY.pack(start, 0, 0, 0)
+            continue
+        path_hashes = entry.get('proof_path', [])
+        positions = entry.get('sibling_positions', [])
+        if len(path_hashes) > 64:
+            raise ValueError("Proof path too long for the batch file format")
+        for sibling in path_hashes:
+            proofs += _digest(sibling)
+        sides = 0
+        for level, position in enumerate(positions):
+            if position == 'left':
+                sides |= 1 << level
+        flags = 1 | (2 if positions else 0)
+        proof_entries += _PROOF_ENTRY.pack(start, len(path_hashes), flags, sides)
+
+    header = json.dumps({
+        'count': count,
+        'root': merkle_tree.get('root', ''),
+        'algorithm': merkle_tree.get('algorithm', 'sha256'),
+        'height': merkle_tree.get('height', 0),
+        'batch_info': batch_json.get('batch_info', {}),
+        'names': names,
+    }, separators=(',', ':')).encode()
+
+    sections = [
+        header,
+        leaves,
+        struct.pack(f"<{count}I", *order),
+        bytes(ops),
+        bytes(timestamps),
+        bytes(meta_offsets),
+        bytes(meta),
+        bytes(proof_entries),
+        bytes(proofs),
+        _pack_levels(merkle_tree.get('nodes')),
+    ]
+
+    offset = len(MAGIC) + _TABLE.size
+    table = []
+    for data in sections:
+        table += [offset, len(data)]
+        offset += len(data)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_TABLE.pack(*table))
+        for data in sections:
+            f.write(data)
+    return offset
+
+
+class MappedBatch:
+    """
+    Read-only, memory-mapped view over a binary batch file.
+
+    Provides the same accessors as the in-memory batch views in
+    ``etrap_sdk.compact`` so it can be placed in the client cache.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not an ETRAP batch file: {self.path}")
+
+        table = _TABLE.unpack_from(self._mm, len(MAGIC))
+        self._sections = {
+            name: (table[2 * i], table[2 * i + 1]) for i, name in enumerate(_SECTIONS)
+        }
+        start, length = self._sections['header']
+        header = json.loads(self._mm[start:start + length])
+        self._count = header['count']
+        self.root = header['root']
+        self.algorithm = header['algorithm']
+        self.height = header['height']
+        self.batch_info = header['batch_info']
+        self._names = header['names']
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "MappedBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mm.close()
+
+    def find(self, tx_hash: str) -> List[int]:
+        """Return positions of all transactions with the given hash."""
+        try:
+            digest = _digest(tx_hash)
+        except ValueError:
+            return []
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._leaf(self._order(mid)) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        positions = []
+        while lo < self._count:
+            position = self._order(lo)
+            if self._leaf(position) != digest:
+                break
+            positions.append(position)
+            lo += 1
+        return positions
+
+    def leaf_hash(self, position: int) -> str:
+        """Return the transaction hash at a position."""
+        return self._leaf(position).hex()
+
+    def hashes(self) -> Iterator[str]:
+        """Iterate over transaction hashes in file order."""
+        for position in range(self._count):
+            yield self.leaf_hash(position)
+
+    def metadata(self, position: int) -> Dict[str, Any]:
+        """Decode the metadata dictionary of a transaction."""
+        base = self._sections['meta_offsets'][0]
+        start, end = struct.unpack_from("<QQ", self._mm, base + 8 * position)
+        meta_start = self._sections['meta'][0]
+        return json.loads(self._mm[meta_start + start:meta_start + end])
+
+    def operation_type(self, position: int) -> Optional[str]:
+        """Return the operation type of a transaction."""
+        (code,) = struct.unpack_from("<H", self._mm, self._sections['ops'][0] + 2 * position)
+        return None if code == _NO_OP else self._names[code]
+
+    def transaction_id(self, position: int) -> Optional[str]:
+        """Return the transaction ID of a transaction."""
+        return self.metadata(position).get('transaction_id')
+
+    def timestamp(self, position: int) -> Optional[int]:
+        """Return the transaction timestamp in milliseconds."""
+        (ts,) = struct.unpack_from("<q", self._mm, self._sections['timestamps'][0] + 8 * position)
+        return None if ts == _NO_TIMESTAMP else ts
+
+    def proof(self, position: int) -> Optional[Dict[str, Any]]:
+        """Return the proof index entry for a transaction position."""
+        if position < 0 or position >= self._count:
+            return None
+        start, length, flags, sides = _PROOF_ENTRY.unpack_from(
+            self._mm, self._sections['proof_index'][0] + _PROOF_ENTRY.size * position
+        )
+        if not flags & 1:
+            return None
+
+        base = self._sections['proofs'][0] + start * DIGEST_SIZE
+        path = [
+            self._mm[base + i * DIGEST_SIZE:base + (i + 1) * DIGEST_SIZE].hex()
+            for i in range(length)
+        ]
+        proof = {'leaf_index': position, 'proof_path': path, 'sibling_positions': []}
+        if flags & 2:
+            proof['sibling_positions'] = [
+                'left' if sides >> level & 1 else 'right' for level in range(length)
+            ]
+        return proof
+
+    def operation_counts(self) -> Dict[str, int]:
+        """Count transactions per operation type."""
+        counts: Dict[str, int] = {}
+        for position in range(self._count):
+            op = self.operation_type(position)
+            if op is not None:
+                counts[op] = counts.get(op, 0) + 1
+        return counts
+
+    def levels(self) -> List[List[str]]:
+        """Return the stored Merkle tree levels as hex hashes, leaves first."""
+        return [
+            [self.node(level, i) for i in range(size)]
+            for level, size in enumerate(self._level_sizes())
+        ]
+
+    def node(self, level: int, index: int) -> str:
+        """Return one stored Merkle tree node hash."""
+        sizes = self._level_sizes()
+        base = self._sections['levels'][0] + 4 + 4 * len(sizes)
+        base += sum(sizes[:level]) * DIGEST_SIZE
+        start = base + index * DIGEST_SIZE
+        return self._mm[start:start + DIGEST_SIZE].hex()
+
+    def _level_sizes(self) -> List[int]:
+        base = self._sections['levels'][0]
+        (count,) = struct.unpack_from("<I", self._mm, base)
+        return list(struct.unpack_from(f"<{count}I", self._mm, base + 4))
+
+    def _order(self, rank: int) -> int:
+        return struct.unpack_from("<I", self._mm, self._sections['order'][0] + 4 * rank)[0]
+
+    def _leaf(self, position: int) -> bytes:
+        start = self._sections['leaves'][0] + position * DIGEST_SIZE
+        return self._mm[start:start + DIGEST_SIZE]
+
+
+def _pack_levels(nodes: Any) -> bytes:
+    """Pack Merkle tree nodes into level arrays (empty if unusable)."""
+    levels: Dict[int, Dict[int, str]] = {}
+    try:
+        if isinstance(nodes, list):
+            for node in nodes:
+                levels.setdefault(node['level'], {})[node['index']] = node['hash']
+        elif isinstance(nodes, dict):
+            for key, node in nodes.items():
+                level, index = (int(part) for part in key.split('-'))
+                levels.setdefault(level, {})[index] = node['hash']
+        packed = [
+            b''.join(_digest(levels[level][index]) for index in sorted(levels[level]))
+            for level in range(len(levels))
+        ]
+    except (KeyError, TypeError, ValueError):
+        return struct.pack("<I", 0)
+
+    sizes = [len(level) // DIGEST_SIZE for level in packed]
+    return struct.pack(f"<I{len(sizes)}I", len(sizes), *sizes) + b''.join(packed)
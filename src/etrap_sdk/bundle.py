@@ -0,0 +1,305 @@
+"""
+Offline verification bundles.
+
+Auditors often re-verify the same transactions, and each run normally reads
+batches from the NEAR contract and S3 again. ETRAPClient.export_bundle()
+verifies a set of transactions once and writes what is needed to verify them
+again: each batch's on-chain metadata and merkle root, and a Merkle proof per
+transaction. verify_offline() then checks rows against the bundle with
+hashing alone and no network access.
+
+Proofs are stored compactly. Each batch has one table of sibling hashes, and
+proofs are lists of indices into it, so siblings shared by the proofs of one
+batch (the upper levels of the tree, for several transactions) are stored
+once. Sibling sides are stored as a short ``l``/``r`` string, or omitted when
+the proof is checked by leaf index.
+
+Bundle layout (JSON, gzip-compressed when the file name ends in ``.gz``)::
+
+    {
+      "format": "etrap-bundle/1",
+      "contract_id": "acme.testnet",
+      "network": "testnet",
+      "created_at": "2025-06-15T08:00:00+00:00",
+      "batches": {
+        "BATCH-...": {
+          "batch": {...BatchInfo, including the on-chain merkle_root...},
+          "nodes": ["<sibling hash>", ...],
+          "transactions": [
+            {"leaf": "<hash>", "index": 3, "operation": "INSERT",
+             "path": [0, 5], "sides": "lr"}
+          ]
+        }
+      }
+    }
+"""
+
+import gzip
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .models import (
+    BatchInfo,
+    BatchVerificationResult,
+    MerkleProof,
+    VerificationResult,
+    VerificationSummary,
+)
+from .tracing import percentile
+from .utils import (
+    compute_transaction_hash,
+    validate_merkle_proof,
+    validate_merkle_proof_indexed,
+)
+
+BUNDLE_FORMAT = "etrap-bundle/1"
+
+
+class VerificationBundle:
+    """
+    On-chain roots, batch metadata and compact proofs for a set of transactions.
+
+    Example:
+        bundle = await client.export_bundle(transactions, path="audit.etrap.json.gz")
+        result = verify_offline("audit.etrap.json.gz", transactions)
+    """
+
+    def __init__(self, contract_id: str, network: str, created_at: Optional[str] = None):
+        """
+        Args:
+            contract_id: Contract that anchors the batches
+            network: NEAR network of the contract
+            created_at: ISO timestamp of the export (defaults to now)
+        """
+        self.contract_id = contract_id
+        self.network = network
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._batch_info: Dict[str, BatchInfo] = {}
+        self._node_ids: Dict[str, Dict[str, int]] = {}
+        self._leaves: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(batch['transactions']) for batch in self._batches.values())
+
+    def __contains__(self, leaf_hash: object) -> bool:
+        return leaf_hash in self._leaves
+
+    @property
+    def batch_ids(self) -> List[str]:
+        return list(self._batches)
+
+    def roots(self) -> Dict[str, str]:
+        """Return the on-chain merkle root recorded for each batch."""
+        return {batch_id: info.merkle_root for batch_id, info in self._batch_info.items()}
+
+    def batch_info(self, batch_id: str) -> Optional[BatchInfo]:
+        """Return the recorded metadata of a batch."""
+        return self._batch_info.get(batch_id)
+
+    def add(
+        self,
+        batch: BatchInfo,
+        leaf_hash: str,
+        leaf_index: int,
+        operation_type: Optional[str],
+        proof_path: List[str],
+        sibling_positions: Optional[List[str]] = None
+    ) -> None:
+        """
+        Add a transaction proof.
+
+        Args:
+            batch: On-chain metadata of the batch holding the transaction
+            leaf_hash: Transaction hash
+            leaf_index: Position of the leaf in the batch
+            operation_type: Operation type recorded for the transaction
+            proof_path: Sibling hashes from the leaf up to the root
+            sibling_positions: Sibling sides ('left'/'right'); when empty the
+                proof is checked by leaf index
+        """
+        entry = self._batches.get(batch.batch_id)
+        if entry is None:
+            entry = self._add_batch(batch.batch_id, {
+                'batch': batch.model_dump(mode='json'),
+                'nodes': [],
+                'transactions': []
+            })
+        for batch_id, existing in self._leaves.get(leaf_hash, []):
+            if batch_id == batch.batch_id and existing['index'] == leaf_index:
+                return  # Already exported
+
+        node_ids = self._node_ids[batch.batch_id]
+        path = []
+        for node in proof_path:
+            if node not in node_ids:
+                node_ids[node] = len(entry['nodes'])
+                entry['nodes'].append(node)
+            path.append(node_ids[node])
+
+        transaction = {'leaf': leaf_hash, 'index': leaf_index, 'operation': operation_type, 'path': path}
+        if sibling_positions:
+            transaction['sides'] = ''.join('l' if side == 'left' else 'r' for side in sibling_positions)
+        entry['transactions'].append(transaction)
+        self._leaves.setdefault(leaf_hash, []).append((batch.batch_id, transaction))
+
+    def verify_hash(self, leaf_hash: str, expected_operation: Optional[str] = None) -> VerificationResult:
+        """
+        Verify a transaction hash against the bundle without network access.
+
+        Args:
+            leaf_hash: Transaction hash
+            expected_operation: Operation type the transaction must have
+
+        Returns:
+            VerificationResult with the proof checked against the recorded
+            on-chain merkle root
+        """
+        matches = [
+            (batch_id, transaction) for batch_id, transaction in self._leaves.get(leaf_hash, [])
+            if not expected_operation or (transaction['operation'] or 'INSERT') == expected_operation
+        ]
+        if not matches:
+            return VerificationResult(
+                verified=False,
+                transaction_hash=leaf_hash,
+                error="Transaction not found in verification bundle"
+            )
+
+        for batch_id, transaction in matches:
+            batch = self._batch_info[batch_id]
+            nodes = self._batches[batch_id]['nodes']
+            proof_path = [nodes[node] for node in transaction['path']]
+            sibling_positions = ['left' if side == 'l' else 'right' for side in transaction.get('sides', '')]
+            if sibling_positions:
+                is_valid = validate_merkle_proof(leaf_hash, proof_path, sibling_positions, batch.merkle_root)
+            else:
+                is_valid = validate_merkle_proof_indexed(leaf_hash, proof_path, transaction['index'], batch.merkle_root)
+            if is_valid:
+                return VerificationResult(
+                    verified=True,
+                    transaction_hash=leaf_hash,
+                    batch_id=batch_id,
+                    merkle_proof=MerkleProof(
+                        leaf_hash=leaf_hash,
+                        proof_path=proof_path,
+                        sibling_positions=sibling_positions,
+                        merkle_root=batch.merkle_root,
+                        is_valid=True
+                    ),
+                    blockchain_timestamp=batch.timestamp,
+                    operation_type=transaction['operation']
+                )
+
+        return VerificationResult(
+            verified=False,
+            transaction_hash=leaf_hash,
+            batch_id=matches[0][0],
+            error=f"Proof does not match the on-chain merkle root of batch {matches[0][0]}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'format': BUNDLE_FORMAT,
+            'contract_id': self.contract_id,
+            'network': self.network,
+            'created_at': self.created_at,
+            'batches': self._batches
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VerificationBundle":
+        """Load a bundle from its JSON structure."""
+        if data.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format: {data.get('format')!r}")
+        bundle = cls(data['contract_id'], data['network'], data.get('created_at'))
+        for batch_id, entry in data.get('batches', {}).items():
+            bundle._add_batch(batch_id, entry)
+            for transaction in entry['transactions']:
+                bundle._leaves.setdefault(transaction['leaf'], []).append((batch_id, transaction))
+        return bundle
+
+    def save(self, path: str) -> None:
+        """Write the bundle to ``path``, gzip-compressed if it ends in ``.gz``."""
+        data = json.dumps(self.to_dict(), separators=(',', ':')).encode()
+        if path.endswith('.gz'):
+            data = gzip.compress(data)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path: str) -> "VerificationBundle":
+        """Read a bundle written by ``save``."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.gz'):
+            data = gzip.decompress(data)
+        return cls.from_dict(json.loads(data))
+
+    def _add_batch(self, batch_id: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        self._batches[batch_id] = entry
+        self._batch_info[batch_id] = BatchInfo.model_validate(entry['batch'])
+        self._node_ids[batch_id] = {node: i for i, node in enumerate(entry['nodes'])}
+        return entry
+
+
+def verify_offline(
+    bundle: Union[VerificationBundle, Dict[str, Any], str],
+    rows: List[Dict[str, Any]],
+    expected_operation: Optional[str] = None
+) -> BatchVerificationResult:
+    """
+    Verify transactions against a bundle with no network access.
+
+    Each row is hashed the same way as ``verify_transaction`` does and its
+    proof is checked against the on-chain merkle root recorded in the bundle.
+    The bundle is trusted as exported; compare ``bundle.roots()`` with
+    ``client.get_batch()`` when a connection is available to re-check it.
+
+    Args:
+        bundle: VerificationBundle, its JSON structure, or a path to a saved bundle
+        rows: Transactions to verify
+        expected_operation: Operation type every transaction must have
+
+    Returns:
+        BatchVerificationResult with one result per row, in order
+    """
+    if isinstance(bundle, str):
+        bundle = VerificationBundle.load(bundle)
+    elif isinstance(bundle, dict):
+        bundle = VerificationBundle.from_dict(bundle)
+
+    results = []
+    latencies = []
+    start_time = time.perf_counter()
+    for row in rows:
+        started = time.perf_counter()
+        if not row:
+            result = VerificationResult(verified=False, transaction_hash="", error="Transaction data cannot be empty")
+        else:
+            result = bundle.verify_hash(compute_transaction_hash(row), expected_operation)
+        results.append(result)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    verified_count = sum(1 for r in results if r.verified)
+    wall_seconds = time.perf_counter() - start_time
+    ordered = sorted(latencies)
+    summary = VerificationSummary(
+        success_rate=verified_count / len(results) if results else 0,
+        average_verification_time_ms=sum(ordered) / len(ordered) if ordered else 0,
+        blockchain_confirmations=len({r.batch_id for r in results if r.verified and r.batch_id}),
+        p50_verification_time_ms=percentile(ordered, 0.50),
+        p90_verification_time_ms=percentile(ordered, 0.90),
+        p99_verification_time_ms=percentile(ordered, 0.99),
+        max_verification_time_ms=ordered[-1] if ordered else 0,
+        throughput_tx_per_sec=len(results) / wall_seconds if wall_seconds > 0 else 0
+    )
+    return BatchVerificationResult(
+        total=len(rows),
+        verified=verified_count,
+        failed=len(results) - verified_count,
+        results=results,
+        summary=summary
+    )
@@ -0,0 +1,208 @@
+"""
+Memory-budgeted cache shared by several clients.
+
+Each ETRAPClient keeps downloaded batches in ``client._cache``. When one
+process serves many organizations, SharedCache replaces those dicts with
+per-tenant views over a single store with one byte budget. When the budget
+is exceeded, entries are evicted from the tenant holding the most bytes,
+least recently used first. A tenant streaming many batches therefore evicts
+its own entries before it can push out another tenant's working set.
+
+Small derived entries (a batch's history index or attestation) can be
+attached to the entry they were built from; they are removed whenever that
+entry is evicted or replaced.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Set, Tuple
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Approximate the memory held by a cache entry in bytes, without walking it.
+
+    Objects reporting their own size through an integer ``nbytes`` attribute
+    (CompactBatch, RangedBatch, HistoryIndex) use it, and tuples such as
+    derived batch state add up their items. Anything else counts only its own
+    object, so callers that know the size of a larger value, like the byte
+    length of a downloaded batch, pass it to SharedCache.put().
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int) and not isinstance(value, type):
+        return nbytes
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class SharedCache:
+    """
+    Byte-budgeted store partitioned by tenant.
+
+    Example:
+        cache = SharedCache(budget_bytes=512 * 1024 * 1024)
+        client._cache = cache.tenant("acme")
+    """
+
+    def __init__(self, budget_bytes: int):
+        """
+        Args:
+            budget_bytes: Total approximate size of all entries
+        """
+        if budget_bytes <= 0:
+            raise ValueError("Cache budget must be positive")
+        self.budget_bytes = budget_bytes
+        self.evictions = 0
+        self._entries: Dict[str, "OrderedDict[str, Tuple[Any, int]]"] = {}
+        self._usage: Dict[str, int] = {}
+        self._attached: Dict[Tuple[str, str], Set[str]] = {}  # (tenant, key) -> attached keys
+        self._parents: Dict[Tuple[str, str], str] = {}
+        self._total = 0
+        self._lock = threading.RLock()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def usage(self) -> Dict[str, int]:
+        """Return the approximate bytes held per tenant."""
+        with self._lock:
+            return {tenant: used for tenant, used in self._usage.items() if used}
+
+    def tenant(self, name: str) -> "TenantCache":
+        """Return the cache view of a tenant."""
+        with self._lock:
+            self._entries.setdefault(name, OrderedDict())
+            self._usage.setdefault(name, 0)
+        return TenantCache(self, name)
+
+    def get(self, tenant: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entries = self._entries[tenant]
+            item = entries.get(key)
+            if item is None:
+                return default
+            entries.move_to_end(key)
+            return item[0]
+
+    def put(
+        self,
+        tenant: str,
+        key: str,
+        value: Any,
+        parent: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> None:
+        """
+        Store an entry, evicting others if the budget is exceeded.
+
+        Args:
+            tenant: Tenant owning the entry
+            key: Entry key
+            value: Entry value
+            parent: Key of an entry this one is derived from; the entry is
+                removed with its parent, and not stored if the parent is gone
+            size: Size of the entry in bytes, if known (see approximate_size)
+        """
+        if size is None:
+            size = approximate_size(value)
+        with self._lock:
+            self.remove(tenant, key)
+            if parent is not None:
+                if parent not in self._entries[tenant]:
+                    return
+                self._attached.setdefault((tenant, parent), set()).add(key)
+                self._parents[(tenant, key)] = parent
+            self._entries[tenant][key] = (value, size)
+            self._usage[tenant] += size
+            self._total += size
+            self._evict(keep=(tenant, key))
+
+    def remove(self, tenant: str, key: str) -> bool:
+        with self._lock:
+            item = self._entries[tenant].pop(key, None)
+            if item is None:
+                return False
+            self._usage[tenant] -= item[1]
+            self._total -= item[1]
+            parent = self._parents.pop((tenant, key), None)
+            if parent is not None:
+                self._attached.get((tenant, parent), set()).discard(key)
+            for attached in self._attached.pop((tenant, key), ()):
+                self.remove(tenant, attached)
+            return True
+
+    def clear(self, tenant: str) -> None:
+        with self._lock:
+            self._total -= self._usage[tenant]
+            self._usage[tenant] = 0
+            self._entries[tenant].clear()
+            for links in (self._attached, self._parents):
+                for link in [link for link in links if link[0] == tenant]:
+                    del links[link]
+
+    def keys(self, tenant: str) -> list:
+        with self._lock:
+            return list(self._entries[tenant])
+
+    def _evict(self, keep: Tuple[str, str]) -> None:
+        """Evict from the largest tenant until within budget, never evicting ``keep``."""
+        while self._total > self.budget_bytes:
+            candidates = [
+                (used, tenant) for tenant, used in self._usage.items()
+                if used and (tenant != keep[0] or len(self._entries[tenant]) > 1)
+            ]
+            if not candidates:
+                return  # Only the entry just stored is left
+            _, tenant = max(candidates)
+            entries = self._entries[tenant]
+            key = next(key for key in entries if (tenant, key) != keep)
+            self.remove(tenant, key)
+            self.evictions += 1
+
+
+class TenantCache(MutableMapping):
+    """Dict-like view of one tenant's entries in a SharedCache."""
+
+    def __init__(self, shared: SharedCache, tenant: str):
+        self.shared = shared
+        self.tenant = tenant
+
+    def __getitem__(self, key: str) -> Any:
+        missing = object()
+        value = self.shared.get(self.tenant, key, missing)
+        if value is missing:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.shared.get(self.tenant, key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.shared.put(self.tenant, key, value)
+
+    def store(self, key: str, value: Any, size: int) -> None:
+        """Store an entry whose size in bytes is known to the caller."""
+        self.shared.put(self.tenant, key, value, size=size)
+
+    def attach(self, parent: str, key: str, value: Any) -> None:
+        """Store an entry that is removed together with ``parent``."""
+        self.shared.put(self.tenant, key, value, parent=parent)
+
+    def __delitem__(self, key: str) -> None:
+        if not self.shared.remove(self.tenant, key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.shared._entries[self.tenant]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.shared.keys(self.tenant))
+
+    def __len__(self) -> int:
+        return len(self.shared._entries[self.tenant])
+
+    def clear(self) -> None:
+        self.shared.clear(self.tenant)
@@ -6,14 +6,16 @@ with the ETRAP system for transaction verification and audit operations.
 """
 
 import asyncio
-import hashlib
+import contextvars
+import functools
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
-
-import boto3
-from py_near import account
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Set
 
 from .models import (
     VerificationHints, VerificationResult, BatchVerificationResult,
@@ -21,16 +23,31 @@ from .models import (
     SearchResults, TransactionLocation, TransactionFilter, TransactionHistory,
     ContractInfo, ContractStats, S3Config, ClientConfig, MerkleProof,
     VerificationSummary, S3Location, TimeRange, MerkleTree, BatchIndices,
-    TransactionRecord, OperationCounts, NFTInfo
+    TransactionRecord, OperationCounts, NFTInfo, VerificationTrace
 )
 from .exceptions import (
-    ETRAPError, VerificationError, BatchNotFoundError, NetworkError,
-    ContractError, S3AccessError, InvalidTransactionError
+    VerificationError, NetworkError, S3AccessError, ContractError,
+    InvalidTransactionError, ConfigurationError
 )
 from .utils import (
     normalize_transaction_data, compute_transaction_hash,
-    validate_merkle_proof, parse_timestamp
+    validate_merkle_proof, validate_merkle_proof_set
+)
+from .streaming import (
+    parse_batch_stream, RECORD_METADATA_FIELDS, ENCODING_SUFFIXES,
+    available_encodings, encoding_for, open_decoded
 )
+from .compact import CompactBatch, as_batch_view
+from .batch_file import MappedBatch, FILE_SUFFIX
+from .offsets import RangedBatch, build_offset_index, offsets_key
+from .tx_index import IndexEntry, TransactionIndex
+from .stats import ContractStatsEngine
+from .watch import PollSchedule
+from .bundle import VerificationBundle
+from .history import (
+    HistoryIndex, HistoryMerge, decode_cursor, encode_cursor, record_key, scan_positions
+)
+from .tracing import MetricsHook, percentile, record, timed, traced, tracing
 
 
 logger = logging.getLogger(__name__)
@@ -44,6 +61,23 @@ class ETRAPClient:
     and accessing audit trail data stored on NEAR blockchain and S3.
     """
     
+    # Most recent batches read by the first stats sync, and the first page
+    # size of incremental syncs and batch watches
+    SYNC_MAX_BATCHES = 1000
+    SYNC_PAGE = 50
+    # Most batches the contract returns for one listing query
+    CONTRACT_PAGE = 100
+
+    # State derived from a cached batch, stored as batch_<name>_<batch_id>
+    BATCH_STATE = ('history', 'attested')
+
+    # Most Merkle roots remembered for the single-transaction batch shortcut
+    BATCH_ROOTS = 10000
+
+    # S3 error codes meaning an object is absent; without s3:ListBucket S3
+    # answers 403 AccessDenied for a missing key instead of 404 NoSuchKey
+    MISSING_OBJECT_CODES = frozenset({'NoSuchKey', '404', 'AccessDenied', '403'})
+
     def __init__(
         self,
         organization_id: str,
@@ -85,19 +119,51 @@ class ETRAPClient:
         if not rpc_endpoint:
             rpc_endpoint = self._get_default_rpc_endpoint(network)
         
-        self.near_account = account.Account(
-            account_id=self.contract_id,
-            rpc_addr=rpc_endpoint
-        )
+        self.rpc_endpoint = rpc_endpoint
         
-        # Setup S3 client if configured
-        self.s3_client = None
+        # The NEAR account and S3 client are created on first use, so that
+        # boto3 and py_near are only imported by calls that need them
+        self._near_account = None
+        self._s3_client = None
+        self._s3_config: Optional[S3Config] = None
+        self._lazy_lock = threading.Lock()
+        # Set by ClientManager to share connection pools and bound per-tenant I/O
+        self._s3_factory: Optional[Callable[[S3Config], Any]] = None
+        self._near_factory: Optional[Callable[[str], Any]] = None
+        self._io_limiter = None
         if s3_config:
             self._setup_s3_client(s3_config)
         
         # Cache for frequently accessed data
         self._cache = {}
         self._cache_timestamps = {}
+        self._cache_validators = {}
+        # Load generation of each cached batch; state derived from a batch
+        # (history index, attestation) records the generation it was built from
+        self._batch_generations: Dict[str, int] = {}
+        self._generation = 0
+        # In-flight batch downloads, shared by concurrent lookups and prefetches
+        self._batch_loads: Dict[str, asyncio.Future] = {}
+        # Lookups and prefetches holding each in-flight download; a download
+        # is cancelled only when the last of them lets go before it finishes
+        self._load_holders: Dict[asyncio.Future, int] = {}
+        # Key prefix (the directory above a batch's) -> suffix of the batch
+        # data object last found there, tried first for other batches
+        self._object_suffixes: Dict[str, str] = {}
+        # In-flight batch attestations, shared by concurrent proof lookups
+        self._attestations: Dict[str, asyncio.Future] = {}
+        # Merkle root -> batch for the BATCH_ROOTS batches seen last; a
+        # single-transaction batch's root is its transaction hash
+        self._batch_roots: "OrderedDict[str, BatchInfo]" = OrderedDict()
+        # Opened on first use from config.transaction_index_path
+        self._tx_index: Optional[TransactionIndex] = None
+        # Contract statistics maintained by sync_contract_stats()
+        self._stats = ContractStatsEngine()
+        self._stats_synced_at: Optional[float] = None
+        self._stats_lock: Optional[asyncio.Lock] = None
+
+        # Callables receiving a VerificationTrace after each verification
+        self._metrics_hooks: List[MetricsHook] = []
         
         logger.info(f"ETRAP Client initialized for organization '{organization_id}' (contract: {self.contract_id}, bucket: etrap-{organization_id})")
     
@@ -110,8 +176,53 @@ class ETRAPClient:
         }
         return endpoints.get(network, endpoints["testnet"])
     
+    @property
+    def near_account(self):
+        """py_near Account for contract view calls, created on first use."""
+        if self._near_account is None:
+            with self._lazy_lock:
+                if self._near_account is None and self._near_factory is not None:
+                    self._near_account = self._near_factory(self.rpc_endpoint)
+                elif self._near_account is None:
+                    from py_near import account
+                    self._near_account = account.Account(
+                        account_id=self.contract_id,
+                        rpc_addr=self.rpc_endpoint
+                    )
+        return self._near_account
+
+    @near_account.setter
+    def near_account(self, value):
+        self._near_account = value
+
+    @property
+    def s3_client(self):
+        """boto3 S3 client, created on first use (None without S3 configuration)."""
+        if self._s3_client is None and self._s3_config is not None:
+            with self._lazy_lock:
+                if self._s3_client is None and self._s3_config is not None:
+                    create = self._s3_factory or self._create_s3_client
+                    self._s3_client = create(self._s3_config)
+        return self._s3_client
+
+    @s3_client.setter
+    def s3_client(self, value):
+        # An explicitly assigned client (or None) replaces the configured one
+        self._s3_client = value
+        self._s3_config = None
+
     def _setup_s3_client(self, s3_config: S3Config):
-        """Setup S3 client with provided configuration."""
+        """Setup S3 access with provided configuration."""
+        self._s3_config = s3_config
+        # Use bucket from config if provided, otherwise derive from organization ID
+        self.s3_bucket = s3_config.bucket_name or f"etrap-{self.organization_id}"
+
+    @staticmethod
+    def _create_s3_client(s3_config: S3Config):
+        """Create the boto3 S3 client for an S3 configuration."""
+        import boto3
+        from botocore.config import Config as BotoConfig
+
         session_config = {}
         if s3_config.access_key_id and s3_config.secret_access_key:
             session_config = {
@@ -120,10 +231,20 @@ class ETRAPClient:
                 'region_name': s3_config.region
             }
         
-        self.s3_client = boto3.client('s3', **session_config)
-        # Use bucket from config if provided, otherwise derive from organization ID
-        self.s3_bucket = s3_config.bucket_name or f"etrap-{self.organization_id}"
+        client_config = {}
+        if s3_config.max_pool_connections:
+            client_config['max_pool_connections'] = s3_config.max_pool_connections
+        if s3_config.endpoint_url:
+            # S3-compatible stores such as MinIO expect path-style requests
+            session_config['endpoint_url'] = s3_config.endpoint_url
+            session_config['region_name'] = s3_config.region
+            client_config['s3'] = {'addressing_style': 'path'}
+        if client_config:
+            session_config['config'] = BotoConfig(**client_config)
+
+        return boto3.client('s3', **session_config)
     
+    @traced
     async def verify_transaction(
         self,
         transaction_data: Dict[str, Any],
@@ -174,6 +295,35 @@ class ETRAPClient:
                         error=f"Transaction not found in specified batch {hints.batch_id}"
                     )
             
+            # A hash equal to a known batch root is that single-transaction batch
+            root_batch = self._batch_roots.get(tx_hash)
+            if root_batch is not None and self._matches_hints(root_batch, hints):
+                logger.debug(f"Transaction hash is the merkle root of known batch {root_batch.batch_id}")
+                try:
+                    result = await self._verify_in_batch(tx_hash, root_batch, use_contract_verification, hints.expected_operation if hints else None)
+                    if result:
+                        return result
+                except VerificationError:
+                    # Fall back to the hint-based search
+                    pass
+
+            # Batches the transaction index has seen this hash in, each probed
+            # once even when the hash sits at several of its leaves
+            probed = set()
+            for entry in self._index_lookup(tx_hash, hints.expected_operation if hints else None):
+                if entry.batch_id in probed:
+                    continue
+                probed.add(entry.batch_id)
+                batch = await self.get_batch(entry.batch_id)
+                if not batch or not self._matches_hints(batch, hints):
+                    continue
+                try:
+                    result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, hints.expected_operation if hints else None)
+                    if result:
+                        return result
+                except VerificationError:
+                    continue
+
             # Time range search if provided
             time_range_attempted = False
             if hints and hints.time_range:
@@ -186,14 +336,9 @@ class ETRAPClient:
                         database=hints.database_name if hints else None,
                         limit=100
                     )
-                    for batch in batches:
-                        try:
-                            result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, hints.expected_operation if hints else None)
-                            if result:
-                                return result
-                        except VerificationError:
-                            # Skip this batch and continue searching
-                            continue
+                    result = await self._probe_batches(tx_hash, batches, use_contract_verification, hints.expected_operation if hints else None)
+                    if result:
+                        return result
                     
                     # Time range search completed but didn't find transaction
                     logger.debug(f"Time range search found {len(batches)} batches but transaction not verified")
@@ -219,14 +364,9 @@ class ETRAPClient:
                     
                     logger.debug(f"Fallback found {len(filtered_batches)} batches in time range")
                     
-                    for batch in filtered_batches:
-                        try:
-                            result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, hints.expected_operation if hints else None)
-                            if result:
-                                return result
-                        except VerificationError:
-                            # Skip this batch and continue searching
-                            continue
+                    result = await self._probe_batches(tx_hash, filtered_batches, use_contract_verification, hints.expected_operation if hints else None)
+                    if result:
+                        return result
                     
                     # Both time range and fallback search failed
                     return VerificationResult(
@@ -239,40 +379,25 @@ class ETRAPClient:
             if hints and hints.database_name and not hints.time_range:
                 logger.debug(f"Using database hint: {hints.database_name}")
                 batches = await self._get_batches_by_database(hints.database_name, limit=100)
-                for batch in batches:
-                    try:
-                        result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, hints.expected_operation if hints else None)
-                        if result:
-                            return result
-                    except VerificationError:
-                        # Skip this batch and continue searching
-                        continue
+                result = await self._probe_batches(tx_hash, batches, use_contract_verification, hints.expected_operation if hints else None)
+                if result:
+                    return result
             
             # Table search if hinted
             if hints and hints.table_name:
                 logger.debug(f"Using table hint: {hints.table_name}")
                 batches = await self._get_batches_by_table(hints.table_name, limit=50)
-                for batch in batches:
-                    try:
-                        result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, hints.expected_operation if hints else None)
-                        if result:
-                            return result
-                    except VerificationError:
-                        # Skip this batch and continue searching
-                        continue
+                result = await self._probe_batches(tx_hash, batches, use_contract_verification, hints.expected_operation if hints else None)
+                if result:
+                    return result
             
             # Fall back to recent batches only if no hints provided and time range wasn't attempted
             if not hints or (not any([hints.batch_id, hints.table_name, hints.database_name, hints.time_range]) and not time_range_attempted):
                 logger.debug("No hints provided, searching recent batches")
                 recent_batches = await self._get_recent_batches(100)
-                for batch in recent_batches:
-                    try:
-                        result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, hints.expected_operation if hints else None)
-                        if result:
-                            return result
-                    except VerificationError:
-                        # Skip this batch and continue searching
-                        continue
+                result = await self._probe_batches(tx_hash, recent_batches, use_contract_verification, hints.expected_operation if hints else None)
+                if result:
+                    return result
             
             # Not found
             return VerificationResult(
@@ -322,12 +447,25 @@ class ETRAPClient:
             would produce identical hashes but represent different database events.
         """
         results = []
-        start_time = datetime.now()
+        latencies = []
+        traces = []
+        start_time = time.perf_counter()
+
+        async def verify_one(tx):
+            # Each verification records into its own trace so cache hits can
+            # be counted per transaction even when verifications overlap
+            trace = VerificationTrace()
+            started = time.perf_counter()
+            with tracing(trace):
+                result = await self.verify_transaction(tx, hints=hints)
+            latencies.append((time.perf_counter() - started) * 1000)
+            traces.append(trace)
+            return result
         
         if parallel:
             # Verify in parallel
             tasks = [
-                self.verify_transaction(tx, hints=hints)
+                verify_one(tx)
                 for tx in transactions
             ]
             
@@ -346,7 +484,7 @@ class ETRAPClient:
         else:
             # Verify sequentially
             for i, tx in enumerate(transactions):
-                result = await self.verify_transaction(tx, hints=hints)
+                result = await verify_one(tx)
                 results.append(result)
                 
                 if progress_callback:
@@ -355,14 +493,24 @@ class ETRAPClient:
                 if fail_fast and not result.verified:
                     break
         
-        # Calculate summary
+        # Calculate summary from per-transaction latencies; wall time only
+        # feeds throughput since parallel verifications overlap
         verified_count = sum(1 for r in results if r.verified)
-        total_time = (datetime.now() - start_time).total_seconds() * 1000
+        wall_seconds = time.perf_counter() - start_time
+        ordered = sorted(latencies)
+        cache_hits = sum(t.cache_hits for t in traces)
+        cache_lookups = cache_hits + sum(t.cache_misses for t in traces)
         
         summary = VerificationSummary(
             success_rate=verified_count / len(results) if results else 0,
-            average_verification_time_ms=total_time / len(results) if results else 0,
-            blockchain_confirmations=verified_count
+            average_verification_time_ms=sum(ordered) / len(ordered) if ordered else 0,
+            blockchain_confirmations=len({r.batch_id for r in results if r.verified and r.batch_id}),
+            p50_verification_time_ms=percentile(ordered, 0.50),
+            p90_verification_time_ms=percentile(ordered, 0.90),
+            p99_verification_time_ms=percentile(ordered, 0.99),
+            max_verification_time_ms=ordered[-1] if ordered else 0,
+            throughput_tx_per_sec=len(results) / wall_seconds if wall_seconds > 0 else 0,
+            cache_hit_ratio=cache_hits / cache_lookups if cache_lookups else None
         )
         
         return BatchVerificationResult(
@@ -373,6 +521,74 @@ class ETRAPClient:
             summary=summary
         )
     
+    async def export_bundle(
+        self,
+        transactions: List[Dict[str, Any]],
+        hints: Optional[VerificationHints] = None,
+        path: Optional[str] = None
+    ) -> VerificationBundle:
+        """
+        Verify transactions and export what is needed to verify them offline.
+
+        The bundle holds the on-chain metadata and merkle root of every batch
+        involved and a compact Merkle proof per verified transaction. Check
+        rows against it later with ``verify_offline(bundle, rows)``, which
+        needs no NEAR or S3 access.
+
+        Args:
+            transactions: Transactions to include
+            hints: Optional optimization hints, as for verify_batch
+            path: Write the bundle to this file (gzip-compressed if it ends in .gz)
+
+        Returns:
+            VerificationBundle with the transactions that verified; the others
+            are left out and logged
+        """
+        bundle = VerificationBundle(self.contract_id, self.network)
+        verification = await self.verify_batch(transactions, hints=hints)
+
+        for result in verification.results:
+            if not result.verified or not result.batch_id:
+                continue
+            try:
+                batch = await self.get_batch(result.batch_id)
+                if batch is None:
+                    continue
+                tx_hash = result.transaction_hash
+                if tx_hash == batch.merkle_root:
+                    # Single-transaction batch: the leaf is the root
+                    bundle.add(batch, tx_hash, 0, result.operation_type, [])
+                    continue
+
+                batch_view = await self._batch_view(batch.batch_id)
+                if batch_view is None:
+                    continue
+                positions = batch_view.find(tx_hash)
+                await self._prefetch_ranges(batch.batch_id, batch_view, positions)
+                for position in positions:
+                    if (batch_view.operation_type(position) or 'INSERT') != (result.operation_type or 'INSERT'):
+                        continue
+                    proof = batch_view.proof(position)
+                    if proof is None:
+                        continue
+                    proof_path = proof.get('proof_path', [])
+                    sibling_positions = proof.get('sibling_positions', [])
+                    # Only proofs that reach the on-chain root go into the bundle
+                    if self._validate_merkle_proof_with_context(
+                        tx_hash, proof_path, sibling_positions, batch.merkle_root, position, len(batch_view)
+                    ):
+                        bundle.add(batch, tx_hash, position, result.operation_type, proof_path, sibling_positions)
+                        break
+            except Exception as e:
+                logger.warning(f"Could not export proof for {result.transaction_hash[:16]}...: {e}")
+
+        skipped = len(transactions) - len(bundle)
+        if skipped > 0:
+            logger.warning(f"{skipped} of {len(transactions)} transactions were not verified and are not in the bundle")
+        if path:
+            bundle.save(path)
+        return bundle
+
     async def get_batch(self, batch_id: str) -> Optional[BatchInfo]:
         """
         Get information about a specific batch.
@@ -386,8 +602,7 @@ class ETRAPClient:
         try:
             # Try direct NFT query first for efficiency
             logger.debug(f"Direct lookup for batch {batch_id}")
-            result = await self.near_account.view_function(
-                self.contract_id,
+            result = await self._view_function(
                 "nft_token",
                 {"token_id": batch_id}
             )
@@ -401,8 +616,7 @@ class ETRAPClient:
                 if batch_info:
                     # Try to get enhanced batch summary if available
                     try:
-                        summary_result = await self.near_account.view_function(
-                            self.contract_id,
+                        summary_result = await self._view_function(
                             "get_batch_summary",
                             {"token_id": batch_id}
                         )
@@ -416,13 +630,14 @@ class ETRAPClient:
                             # Update table names if provided
                             if 'table_names' in summary_result:
                                 batch_info.table_names = summary_result.get('table_names', batch_info.table_names)
+                            self._index_batch_root(batch_info)
                     except:
                         pass  # Use basic info if summary not available
                     
                     return batch_info
             
             # If direct lookup fails, try recent batches (for compatibility)
-            logger.debug(f"Direct lookup failed, searching recent batches")
+            logger.debug("Direct lookup failed, searching recent batches")
             recent_batches = await self._get_recent_batches(20)  # Reduced limit
             for batch in recent_batches:
                 if batch.batch_id == batch_id:
@@ -559,9 +774,25 @@ class ETRAPClient:
             # Get recent batches to search
             all_batches = await self._get_recent_batches(max_results)
             
+            # Batches the transaction index has seen the hash in; other
+            # indexed batches are known not to contain it. Index entries are
+            # only candidates and are still proven before they match
+            indexed_batches = set()
+            indexed_matches = set()
+            index = self._transaction_index()
+            if criteria.transaction_hash and index is not None:
+                indexed_batches = index.batch_ids()
+                indexed_matches = {entry.batch_id for entry in index.lookup(criteria.transaction_hash)}
+
             for batch in all_batches:
                 # Check transaction hash
-                if criteria.transaction_hash:
+                if criteria.transaction_hash and batch.batch_id in indexed_batches:
+                    if batch.batch_id in indexed_matches:
+                        result = await self._verify_in_batch(criteria.transaction_hash, batch, False)
+                        if result and result.verified:
+                            matching_batches.append(batch)
+                            continue
+                elif criteria.transaction_hash:
                     result = await self._verify_in_batch(criteria.transaction_hash, batch, False)
                     if result and result.verified:
                         matching_batches.append(batch)
@@ -622,40 +853,115 @@ class ETRAPClient:
             
         Raises:
             S3AccessError: If S3 access fails
+
+        Note:
+            With ``config.streaming_parse`` enabled the object is parsed
+            incrementally and only verification fields are kept, so the
+            returned merkle_tree has no ``nodes``. Batches found as binary
+            files in ``config.local_batch_dir`` are memory-mapped instead of
+            downloaded; their merkle_tree carries only the root.
         """
-        if not self.s3_client:
+        if not self.s3_client and not self.config.local_batch_dir:
             raise S3AccessError("S3 client not configured")
         
+        # Prefer a locally synced binary batch file over S3; its header
+        # usually carries the batch info, so the contract is not queried
+        local_batch = self._open_local_batch(batch_id)
+        if local_batch is not None:
+            batch_info = self._local_batch_info(batch_id, local_batch) or await self.get_batch(batch_id)
+            if not batch_info:
+                return None
+            cache_key = f"batch_data_{batch_id}"
+            if self._cache.get(cache_key) is local_batch:
+                self._cache_timestamps[cache_key] = datetime.now()
+            else:
+                self._store_batch(batch_id, local_batch)
+                await self._index_batch(batch_id, local_batch, batch_info.timestamp)
+            return self._batch_data_from_view(batch_info, local_batch, include_merkle_tree)
+
         # Get batch info first
         batch_info = await self.get_batch(batch_id)
         if not batch_info:
             return None
         
+        if not self.s3_client:
+            raise S3AccessError("S3 client not configured")
+
         try:
             # Download batch data from S3
             s3_key = f"{batch_info.s3_location.key}batch-data.json"
-            logger.debug(f"Fetching from S3: bucket={batch_info.s3_location.bucket}, key={s3_key}")
-            
-            try:
-                response = self.s3_client.get_object(
-                    Bucket=batch_info.s3_location.bucket,
-                    Key=s3_key
-                )
-            except Exception as e:
-                if "NoSuchKey" in str(e):
-                    # Fallback: try the correct CDC agent path structure
-                    table_name = batch_info.table_names[0] if batch_info.table_names else 'unknown'
-                    fallback_key = f"{batch_info.database_name}/{table_name}/{batch_id}/batch-data.json"
-                    logger.debug(f"Primary path failed, trying fallback: {fallback_key}")
-                    
-                    response = self.s3_client.get_object(
-                        Bucket=batch_info.s3_location.bucket,
-                        Key=fallback_key
-                    )
+            cache_key = f"batch_data_{batch_id}"
+            bucket = batch_info.s3_location.bucket
+
+            # Revalidate a previously downloaded copy with a conditional GET
+            batch_json = None
+            response = None
+            object_bytes = None
+            changed = False
+            cached = self._cache.get(cache_key)
+            validator = self._cache_validators.get(cache_key)
+            if cached is not None and validator is not None:
+                with timed('s3'):
+                    response = await self._run_blocking(self._revalidate, bucket, validator)
+                if response is None:
+                    logger.debug(f"Batch {batch_id} not modified, reusing cached copy")
+                    self._cache_timestamps[cache_key] = datetime.now()
+                    if not isinstance(cached, dict):
+                        return self._batch_data_from_view(batch_info, cached, include_merkle_tree)
+                    batch_json = cached
+                    object_bytes = validator.get('size')
                 else:
-                    raise
-            
-            batch_json = json.loads(response['Body'].read())
+                    key = validator['key']
+                    changed = True
+
+            if batch_json is None:
+                if response is None:
+                    logger.debug(f"Fetching from S3: bucket={bucket}, key={s3_key}")
+                    with timed('s3'):
+                        response, key = await self._run_blocking(
+                            self._get_batch_object,
+                            bucket,
+                            self._batch_object_keys(batch_info, batch_id)
+                        )
+                body = open_decoded(response['Body'], encoding_for(key, response.get('ContentEncoding')))
+
+                if self.config.streaming_parse:
+                    # Keep only metadata, root, proofs and indices; skip tree
+                    # nodes (download time is included in parse time here)
+                    with timed('parse'):
+                        batch_json = await self._run_blocking(
+                            functools.partial(parse_batch_stream, body, metadata_fields=RECORD_METADATA_FIELDS)
+                        )
+                else:
+                    with timed('s3'):
+                        raw = await self._run_blocking(body.read)
+                    with timed('parse'):
+                        batch_json = await self._run_blocking(json.loads, raw)
+                content_length = response.get('ContentLength')
+                if isinstance(content_length, int):
+                    record('s3_bytes', content_length)
+                elif not self.config.streaming_parse:
+                    record('s3_bytes', len(raw))
+                object_bytes = len(raw) if not self.config.streaming_parse else content_length
+                ranges_key = f"batch_ranges_{batch_id}"
+                if (not self.config.streaming_parse and self.config.range_requests and body is response['Body']
+                        and (changed or cached is None or self._cache.get(ranges_key) is None)):
+                    # Plain object: remember byte offsets for ranged reads once
+                    # the full copy expires, unless this copy is indexed already
+                    await self._cache_offset_index(bucket, key, batch_id, raw)
+
+                # Remember validators so an expired entry can be revalidated
+                etag = response.get('ETag')
+                last_modified = response.get('LastModified')
+                if etag or last_modified:
+                    self._cache_validators[cache_key] = {
+                        'key': key,
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'size': object_bytes
+                    }
+                else:
+                    self._cache_validators.pop(cache_key, None)
             
             # Parse Merkle tree if requested
             merkle_tree = None
@@ -708,9 +1014,11 @@ class ETRAPClient:
                         deletes=deletes
                     )
             
-            # Store raw batch data for transaction access
-            self._cache[f"batch_data_{batch_id}"] = batch_json
-            self._cache_timestamps[f"batch_data_{batch_id}"] = datetime.now()
+            # Store batch data for transaction access, charged by its
+            # downloaded size rather than by walking the parsed tree
+            entry = self._cache_entry(batch_json)
+            self._store_batch(batch_id, entry, object_bytes if isinstance(entry, dict) else None)
+            await self._index_batch(batch_id, as_batch_view(self._cache[cache_key]), batch_info.timestamp)
             
             return BatchData(
                 batch_info=batch_info,
@@ -722,7 +1030,7 @@ class ETRAPClient:
             
         except Exception as e:
             # Create a more descriptive error that can be caught appropriately
-            if "NoSuchKey" in str(e):
+            if self._is_missing_object(e):
                 raise S3AccessError(f"Batch data not found in S3: {e}", 
                                   bucket=batch_info.s3_location.bucket,
                                   key=s3_key)
@@ -746,58 +1054,48 @@ class ETRAPClient:
         Returns:
             MerkleProof or None if not found
         """
-        # Check cache first
-        cache_key = f"batch_data_{batch_id}"
-        if cache_key in self._cache:
-            batch_json = self._cache[cache_key]
-        else:
-            # Get batch data
-            batch_data = await self.get_batch_data(batch_id, include_merkle_tree=True)
-            if not batch_data or not batch_data.merkle_tree:
-                return None
-            batch_json = self._cache.get(cache_key)
-            if not batch_json:
-                return None
+        batch_view = await self._batch_view(batch_id)
+        if batch_view is None:
+            return None
         
         # Find transaction by hash
-        transaction_index = None
-        for i, tx in enumerate(batch_json.get('transactions', [])):
-            if tx.get('metadata', {}).get('hash') == transaction_hash:
-                transaction_index = i
-                break
-        
-        if transaction_index is None:
+        positions = batch_view.find(transaction_hash)
+        if not positions:
             return None
-        
-        # Extract proof from merkle tree
-        merkle_tree = batch_json.get('merkle_tree', {})
-        proof_index = merkle_tree.get('proof_index', {})
+        transaction_index = positions[0]
+        await self._prefetch_ranges(batch_id, batch_view, [transaction_index])
         
         # Get proof for this transaction
-        tx_key = f"tx-{transaction_index}"
-        if tx_key not in proof_index:
+        proof_data = batch_view.proof(transaction_index)
+        if proof_data is None:
             return None
         
-        proof_data = proof_index[tx_key]
-        
         # Get total transaction count to handle edge cases
-        total_transactions = len(batch_json.get('transactions', []))
-        
-        # Validate the proof
-        is_valid = self._validate_merkle_proof_with_context(
-            transaction_hash,
-            proof_data.get('proof_path', []),
-            proof_data.get('sibling_positions', []),
-            merkle_tree.get('root', ''),
-            transaction_index,
-            total_transactions
-        )
+        total_transactions = len(batch_view)
         
-        return MerkleProof(
+        # In an attested batch finding the leaf hash proves membership; the
+        # proof is still returned for output but not hashed again
+        if await self._attest_batch(batch_id, batch_view):
+            record('proofs_skipped')
+            is_valid = True
+        else:
+            # Validate the proof
+            with timed('proof'):
+                is_valid = self._validate_merkle_proof_with_context(
+                    transaction_hash,
+                    proof_data.get('proof_path', []),
+                    proof_data.get('sibling_positions', []),
+                    batch_view.root,
+                    transaction_index,
+                    total_transactions
+                )
+
+        return self._model(
+            MerkleProof,
             leaf_hash=transaction_hash,
             proof_path=proof_data.get('proof_path', []),
             sibling_positions=proof_data.get('sibling_positions', []),
-            merkle_root=merkle_tree.get('root', ''),
+            merkle_root=batch_view.root,
             is_valid=is_valid
         )
     
@@ -818,6 +1116,20 @@ class ETRAPClient:
         Returns:
             TransactionLocation or None if not found
         """
+        # One index probe plus a proof check against the on-chain root when
+        # the hash has been indexed
+        for entry in self._index_lookup(transaction_hash):
+            batch = await self.get_batch(entry.batch_id)
+            if not batch or (time_range and not time_range.start <= batch.timestamp <= time_range.end):
+                continue
+            proof = await self.get_merkle_proof(entry.batch_id, transaction_hash)
+            if proof and proof.is_valid and proof.merkle_root == batch.merkle_root:
+                return TransactionLocation(
+                    batch_id=entry.batch_id,
+                    position=entry.leaf_index,
+                    batch_info=batch
+                )
+
         # Warn about contract limitations
         if search_depth > 100:
             logger.warning(f"Requested search_depth={search_depth} exceeds contract limit of 100. Only 100 recent batches will be searched.")
@@ -838,16 +1150,15 @@ class ETRAPClient:
             result = await self._verify_in_batch(transaction_hash, batch, False)
             if result and result.verified:
                 # Get position in batch
-                cache_key = f"batch_data_{batch.batch_id}"
-                if cache_key in self._cache:
-                    batch_json = self._cache[cache_key]
-                    for i, tx in enumerate(batch_json.get('transactions', [])):
-                        if tx.get('metadata', {}).get('hash') == transaction_hash:
-                            return TransactionLocation(
-                                batch_id=batch.batch_id,
-                                position=i,
-                                batch_info=batch
-                            )
+                batch_view = self._cached_view(batch.batch_id)
+                if batch_view is not None:
+                    positions = batch_view.find(transaction_hash)
+                    if positions:
+                        return TransactionLocation(
+                            batch_id=batch.batch_id,
+                            position=positions[0],
+                            batch_info=batch
+                        )
                 else:
                     # Position 0 if we can't determine exact position
                     return TransactionLocation(
@@ -858,10 +1169,53 @@ class ETRAPClient:
         
         return None
     
+    async def build_transaction_index(self, max_batches: int = 100, concurrency: int = 4) -> int:
+        """
+        Index the transactions of recent batches not indexed yet.
+
+        Requires ``config.transaction_index_path``. Batches loaded by other
+        calls are indexed as they are downloaded; this crawler fills in the
+        rest and can run as a background task, e.g.
+        ``asyncio.create_task(client.build_transaction_index())``.
+
+        Args:
+            max_batches: Number of recent batches to consider (max 100 due to contract limit)
+            concurrency: Batches downloaded at the same time
+
+        Returns:
+            Number of batches newly indexed
+        """
+        index = self._transaction_index()
+        if index is None:
+            raise ConfigurationError("transaction_index_path is not configured")
+
+        batches = await self._get_recent_batches(max_batches)
+        pending = [b for b in batches if not index.has_batch(b.batch_id)]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def crawl(batch):
+            async with semaphore:
+                try:
+                    batch_view = self._cached_view(batch.batch_id)
+                    if batch_view is not None and not isinstance(batch_view, RangedBatch):
+                        await self._index_batch(batch.batch_id, batch_view, batch.timestamp)
+                    else:
+                        # Full download; get_batch_data indexes what it loads
+                        await self.get_batch_data(batch.batch_id, include_merkle_tree=False)
+                    return index.has_batch(batch.batch_id)
+                except Exception as e:
+                    logger.warning(f"Could not index batch {batch.batch_id}: {e}")
+                    return False
+
+        indexed = await asyncio.gather(*(crawl(batch) for batch in pending))
+        logger.info(f"Indexed {sum(indexed)} of {len(pending)} unindexed batches")
+        return sum(indexed)
+
     async def get_transaction_history(
         self,
         filter: TransactionFilter,
-        limit: int = 1000
+        limit: int = 1000,
+        cursor: Optional[str] = None
     ) -> TransactionHistory:
         """
         Get transaction history matching filter.
@@ -869,71 +1223,32 @@ class ETRAPClient:
         Args:
             filter: Filter criteria
             limit: Maximum transactions to return
+            cursor: ``next_cursor`` of a previous page to continue from
             
         Returns:
-            TransactionHistory with matching transactions
+            TransactionHistory with matching transactions, newest first, and
+            a ``next_cursor`` for the following page
         """
         transactions = []
         start_time = None
         end_time = None
+        next_cursor = None
         
         try:
-            # Get batches that might contain matching transactions
-            batch_filter = BatchFilter()
             if filter.time_range:
-                batch_filter.time_range = filter.time_range
                 start_time = filter.time_range.start
                 end_time = filter.time_range.end
             
-            batch_list = await self.list_batches(batch_filter, limit=100)
-            
-            # Search through batches
-            for batch in batch_list.batches:
-                if len(transactions) >= limit:
-                    break
-                
-                # Get batch data
+            if limit > 0:
+                records = self.iter_transaction_history(filter, cursor=cursor)
                 try:
-                    batch_data = await self.get_batch_data(batch.batch_id)
-                    if not batch_data:
-                        continue
-                    
-                    # Get cached batch JSON
-                    cache_key = f"batch_data_{batch.batch_id}"
-                    batch_json = self._cache.get(cache_key, {})
-                    
-                    # Filter transactions
-                    for tx in batch_json.get('transactions', []):
-                        metadata = tx.get('metadata', {})
-                        
-                        # Apply filters
-                        if filter.operation_types:
-                            if metadata.get('operation_type') not in filter.operation_types:
-                                continue
-                        
-                        # For account_id and amount filtering, we'd need the actual
-                        # transaction data which is not stored (privacy by design)
-                        # So we can only filter by metadata
-                        
-                        # Create transaction record
-                        tx_record = TransactionRecord(
-                            transaction_id=metadata.get('transaction_id', ''),
-                            timestamp=datetime.fromtimestamp(metadata.get('timestamp', 0) / 1000),
-                            operation_type=metadata.get('operation_type', ''),
-                            database_name=metadata.get('database_name', ''),
-                            table_affected=metadata.get('table_affected', ''),
-                            transaction_hash=metadata.get('hash', ''),
-                            metadata=metadata
-                        )
-                        
+                    async for tx_record in records:
                         transactions.append(tx_record)
-                        
                         if len(transactions) >= limit:
+                            next_cursor = tx_record.cursor
                             break
-                            
-                except Exception as e:
-                    logger.error(f"Error processing batch {batch.batch_id}: {e}")
-                    continue
+                finally:
+                    await records.aclose()  # Cancel downloads still in flight
             
             # Determine time range covered
             if transactions:
@@ -945,9 +1260,10 @@ class ETRAPClient:
                 start_time = end_time = datetime.now()
             
             return TransactionHistory(
-                transactions=transactions[:limit],
+                transactions=transactions,
                 total_found=len(transactions),
-                time_range_covered=TimeRange(start=start_time, end=end_time)
+                time_range_covered=TimeRange(start=start_time, end=end_time),
+                next_cursor=next_cursor
             )
             
         except Exception as e:
@@ -958,55 +1274,161 @@ class ETRAPClient:
                 time_range_covered=TimeRange(start=datetime.now(), end=datetime.now())
             )
     
+    async def iter_transaction_history(
+        self,
+        filter: TransactionFilter,
+        cursor: Optional[str] = None,
+        concurrency: int = 4,
+        max_batches: int = 100
+    ) -> AsyncIterator[TransactionRecord]:
+        """
+        Stream transaction history matching filter, newest first.
+
+        Up to ``concurrency`` batches are downloaded at once and their records
+        are merged by timestamp as they arrive, so the first records are
+        yielded before the remaining batches are loaded. Batches are listed
+        page by page as the iteration proceeds, until the time window is
+        exhausted. Each record carries a ``cursor``; pass it back to continue
+        after that record. Batches that were fully returned before the cursor
+        are not downloaded again.
+
+        Args:
+            filter: Filter criteria
+            cursor: ``cursor`` of the last record already processed
+            concurrency: Batches downloaded at the same time
+            max_batches: Batches listed per query (max 100 due to contract limit)
+
+        Yields:
+            TransactionRecord objects in descending timestamp order
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        # Batches that might contain matching transactions, newest first; a
+        # cursor bounds the listing at the newest batch not fully returned
+        start = filter.time_range.start if filter.time_range else datetime.fromtimestamp(0)
+        end = filter.time_range.end if filter.time_range else datetime.now()
+        if after:
+            end = min(end, datetime.fromtimestamp(after.end_ms / 1000))
+        listing = self._iter_batches_in_window(start, end, page=max_batches)
+
+        batches: List[BatchInfo] = []
+        merge = HistoryMerge([], complete=False)
+        loads: List[asyncio.Future] = []
+
+        async def list_next() -> bool:
+            try:
+                batch = await listing.__anext__()
+            except StopAsyncIteration:
+                merge.finish()
+                return False
+            batches.append(batch)
+            merge.extend([int(batch.timestamp.timestamp() * 1000)])
+            return True
+
+        try:
+            rank = 0
+            while True:
+                while len(loads) < rank + max(concurrency, 1) and (len(loads) < len(batches) or await list_next()):
+                    loads.append(asyncio.ensure_future(
+                        self._history_records(batches[len(loads)], filter, after)
+                    ))
+                if rank == len(loads):
+                    break
+                merge.add(rank, await loads[rank])
+                rank += 1
+                for tx_record, position in merge.pop_ready():
+                    tx_record.cursor = encode_cursor(position)
+                    yield tx_record
+            for tx_record, position in merge.pop_ready():
+                tx_record.cursor = encode_cursor(position)
+                yield tx_record
+        finally:
+            for load in loads:
+                if not load.done():
+                    load.cancel()
+            await listing.aclose()
+
+    async def watch_batches(
+        self,
+        since: Optional[str] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0
+    ) -> AsyncIterator[BatchInfo]:
+        """
+        Yield batches as they are recorded on the contract.
+
+        The contract is polled from the timestamp of the last batch yielded,
+        remembering every batch yielded at that timestamp, since batches
+        sharing a timestamp can be listed in any order. The poll interval
+        follows the batch arrival rate and backs off while no batches arrive
+        (see etrap_sdk.watch.PollSchedule). The iterator runs until the
+        consumer stops it.
+
+        Args:
+            since: Batch ID to resume after; by default only batches created
+                after the watch starts are yielded
+            min_interval: Shortest delay between polls in seconds (> 0)
+            max_interval: Longest delay between polls in seconds
+
+        Yields:
+            New BatchInfo objects, oldest first
+
+        Raises:
+            ValueError: If the poll intervals are invalid
+        """
+        schedule = PollSchedule(min_interval, max_interval)
+        # Cursor: newest timestamp yielded and the batches yielded at it
+        cursor_time: Optional[datetime] = None
+        cursor_ids: Set[str] = set()
+        if since is None:
+            head = await self._get_recent_batches(self.SYNC_PAGE)
+            if head:
+                cursor_time = max(batch.timestamp for batch in head)
+                cursor_ids = {batch.batch_id for batch in head if batch.timestamp == cursor_time}
+
+        def is_known(batch: BatchInfo) -> bool:
+            if cursor_time is None:
+                return batch.batch_id == since
+            return batch.timestamp < cursor_time or batch.batch_id in cursor_ids
+
+        while True:
+            batches = await self._batches_since(is_known, self.SYNC_PAGE)
+
+            for batch in reversed(batches):
+                if cursor_time is None or batch.timestamp > cursor_time:
+                    cursor_time, cursor_ids = batch.timestamp, set()
+                cursor_ids.add(batch.batch_id)
+                yield batch
+
+            delay = schedule.update(len(batches), time.monotonic())
+            logger.debug(f"Batch watch found {len(batches)} new batches; next poll in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
     async def get_contract_info(self) -> ContractInfo:
         """
         Get information about the smart contract.
         
+        Statistics come from the incrementally synced stats engine, which is
+        refreshed at most every config.stats_refresh_interval seconds.
+
         Returns:
             ContractInfo with contract details
         """
         try:
-            # Get contract metadata if available
-            metadata = await self.near_account.view_function(
-                self.contract_id,
-                "nft_metadata",
-                {}
-            )
-            
-            # Handle ViewFunctionResult object
-            if hasattr(metadata, 'result'):
-                metadata = metadata.result
-            
-            # Get recent batches to determine stats
-            recent_batches = await self._get_recent_batches(1000)
-            
-            # Calculate statistics
-            total_batches = len(recent_batches)
-            total_transactions = sum(b.transaction_count for b in recent_batches)
-            
-            # Extract unique tables and databases
-            databases = set()
-            tables = set()
-            earliest = None
-            latest = None
-            
-            for batch in recent_batches:
-                databases.add(batch.database_name)
-                tables.update(batch.table_names)
-                
-                if not earliest or batch.timestamp < earliest:
-                    earliest = batch.timestamp
-                if not latest or batch.timestamp > latest:
-                    latest = batch.timestamp
+            await self._refresh_contract_stats()
+            totals = self._stats.totals
             
             return ContractInfo(
                 contract_id=self.contract_id,
-                total_batches=total_batches,
-                total_transactions=total_transactions,
-                earliest_batch=earliest or datetime.now(),
-                latest_batch=latest or datetime.now(),
-                supported_tables=sorted(list(tables)),
-                supported_databases=sorted(list(databases))
+                total_batches=totals.batches,
+                total_transactions=totals.transactions,
+                earliest_batch=self._stats.earliest or datetime.now(),
+                latest_batch=self._stats.latest or datetime.now(),
+                supported_tables=sorted(totals.tables),
+                supported_databases=sorted(totals.databases)
             )
             
         except Exception as e:
@@ -1029,6 +1451,9 @@ class ETRAPClient:
         """
         Get contract statistics.
         
+        Rolling 1h/24h/7d/30d windows are maintained by the stats engine, so
+        no batches are listed per call.
+
         Args:
             time_period: Time period for stats (1h/24h/7d/30d/all)
             
@@ -1036,40 +1461,14 @@ class ETRAPClient:
             ContractStats with usage statistics
         """
         try:
-            # Calculate time range
-            end_time = datetime.now()
-            if time_period == "1h":
-                start_time = end_time - timedelta(hours=1)
-            elif time_period == "24h":
-                start_time = end_time - timedelta(days=1)
-            elif time_period == "7d":
-                start_time = end_time - timedelta(days=7)
-            elif time_period == "30d":
-                start_time = end_time - timedelta(days=30)
-            else:  # all
-                start_time = datetime(2020, 1, 1)  # Arbitrary old date
-            
-            # Get batches in time range
-            filter = BatchFilter(time_range=TimeRange(start=start_time, end=end_time))
-            batch_list = await self.list_batches(filter, limit=1000)
-            
-            # Calculate statistics
-            batches_created = batch_list.total_count
-            transactions_recorded = sum(b.transaction_count for b in batch_list.batches)
-            
-            # Unique tables and databases
-            unique_tables = set()
-            unique_databases = set()
-            
-            for batch in batch_list.batches:
-                unique_databases.add(batch.database_name)
-                unique_tables.update(batch.table_names)
+            await self._refresh_contract_stats()
+            stats = self._stats.window(time_period)
             
             return ContractStats(
-                batches_created=batches_created,
-                transactions_recorded=transactions_recorded,
-                unique_tables=len(unique_tables),
-                unique_databases=len(unique_databases),
+                batches_created=stats.batches,
+                transactions_recorded=stats.transactions,
+                unique_tables=len(stats.tables),
+                unique_databases=len(stats.databases),
                 gas_consumed="0",  # Would need to query blockchain for this
                 storage_used="0",  # Would need to query blockchain for this
                 time_period=time_period
@@ -1087,6 +1486,33 @@ class ETRAPClient:
                 time_period=time_period
             )
     
+    async def sync_contract_stats(self) -> int:
+        """
+        Add batches created since the last sync to the contract statistics.
+
+        The first sync reads up to SYNC_MAX_BATCHES recent batches. Later
+        syncs read a small page of recent batches and keep paging back until
+        a batch seen before comes back, however many batches were created in
+        between, so a sync costs O(new batches) and leaves no gaps.
+
+        Returns:
+            Number of new batches
+        """
+        if self._stats_lock is None:
+            self._stats_lock = asyncio.Lock()
+        async with self._stats_lock:
+            if self._stats.latest_batch_id:
+                batches = await self._batches_since(lambda batch: batch.batch_id in self._stats, self.SYNC_PAGE)
+            else:
+                batches = await self._batches_since(
+                    lambda batch: False, self.SYNC_MAX_BATCHES, max_batches=self.SYNC_MAX_BATCHES
+                )
+
+            added = self._stats.add_batches(batches)
+            self._stats_synced_at = time.monotonic()
+            logger.debug(f"Contract stats sync added {added} batches")
+            return added
+
     async def get_nft_info(self, nft_token_id: str) -> Optional[NFTInfo]:
         """
         Get NFT information for a specific batch token.
@@ -1099,8 +1525,7 @@ class ETRAPClient:
         """
         try:
             # Get NFT token info from NEAR contract
-            nft_token = await self.near_account.view_function(
-                self.contract_id,
+            nft_token = await self._view_function(
                 "nft_token",
                 {"token_id": nft_token_id}
             )
@@ -1224,8 +1649,830 @@ class ETRAPClient:
         """Get current configuration."""
         return self.config
     
+    def add_metrics_hook(self, hook: MetricsHook):
+        """
+        Register a callable that receives the VerificationTrace of every
+        verify_transaction call.
+
+        See ``etrap_sdk.tracing`` for OpenTelemetry and Prometheus adapters.
+        """
+        self._metrics_hooks.append(hook)
+
+    def remove_metrics_hook(self, hook: MetricsHook):
+        """Unregister a metrics hook."""
+        self._metrics_hooks.remove(hook)
+
     # Private helper methods
     
+    async def _view_function(self, method_name: str, args: Dict[str, Any]):
+        """Call a view method of the ETRAP contract, recording RPC time."""
+        record('rpc_calls')
+        if self._io_limiter is not None:
+            async with self._io_limiter:
+                with timed('rpc'):
+                    return await self.near_account.view_function(self.contract_id, method_name, args)
+        with timed('rpc'):
+            return await self.near_account.view_function(self.contract_id, method_name, args)
+
+    def _open_local_batch(self, batch_id: str) -> Optional[MappedBatch]:
+        """
+        Open the local binary batch file for a batch, if one exists.
+
+        A file already mapped in the cache is reused rather than mapped again;
+        batch files are written once per anchored batch and do not change.
+        """
+        if not self.config.local_batch_dir:
+            return None
+
+        path = os.path.join(self.config.local_batch_dir, f"{batch_id}{FILE_SUFFIX}")
+        cached = self._cache.get(f"batch_data_{batch_id}")
+        if isinstance(cached, MappedBatch) and cached.path == path:
+            return cached
+        if not os.path.exists(path):
+            return None
+
+        try:
+            return MappedBatch(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable local batch file {path}: {e}")
+            return None
+
+    def _local_batch_info(self, batch_id: str, local_batch: MappedBatch) -> Optional[BatchInfo]:
+        """
+        Build BatchInfo from the header of a local batch file.
+
+        Returns:
+            BatchInfo, or None if the header does not identify the batch and
+            its creation time (the caller then asks the contract)
+        """
+        info = local_batch.batch_info or {}
+        created_at = info.get('created_at', info.get('timestamp'))
+        if info.get('batch_id') != batch_id or not local_batch.root or not isinstance(created_at, (int, float)):
+            return None
+
+        # Not added to _batch_roots: the root here is the file's own, and
+        # attestation must compare against the on-chain root
+        database_name = info.get('database_name', 'unknown')
+        return self._model(
+            BatchInfo,
+            batch_id=batch_id,
+            database_name=database_name,
+            table_names=info.get('table_names', []),
+            transaction_count=len(local_batch),
+            merkle_root=local_batch.root,
+            timestamp=datetime.fromtimestamp(created_at / 1000),
+            s3_location=self._model(
+                S3Location,
+                bucket=info.get('s3_bucket', f"etrap-{self.organization_id}"),
+                key=info.get('s3_key', f"{database_name}/{batch_id}/"),
+                region='us-west-2'
+            ),
+            size_bytes=info.get('size_bytes', 0)
+        )
+
+    def _batch_object_keys(self, batch_info: BatchInfo, batch_id: str) -> List[str]:
+        """
+        List candidate S3 keys for a batch's data object, preferred first.
+
+        The primary location comes from the batch's S3 location; the CDC agent
+        path structure is used as fallback. With ``config.compressed_transfer``
+        the compressed variants of each key are tried before the plain one.
+        Batches under one prefix are stored alike, so the key found last under
+        a prefix is tried before any other candidate, avoiding a failed GET
+        per missing variant and location.
+        """
+        bases = [f"{batch_info.s3_location.key}batch-data.json"]
+        table_name = batch_info.table_names[0] if batch_info.table_names else 'unknown'
+        fallback_key = f"{batch_info.database_name}/{table_name}/{batch_id}/batch-data.json"
+        if fallback_key not in bases:
+            bases.append(fallback_key)
+
+        suffixes = [""]
+        if self.config.compressed_transfer:
+            suffixes = [ENCODING_SUFFIXES[encoding] for encoding in available_encodings()] + suffixes
+
+        keys = [base + suffix for base in bases for suffix in suffixes]
+        known = [
+            base + self._object_suffixes[self._key_prefix(base)] for base in bases
+            if self._object_suffixes.get(self._key_prefix(base)) in suffixes
+        ]
+        return known + [key for key in keys if key not in known]
+
+    @staticmethod
+    def _key_prefix(key: str) -> str:
+        """Return the part of a batch data key above the batch's directory."""
+        return key.rsplit('/', 2)[0]
+
+    def _is_missing_object(self, error: Exception) -> bool:
+        """Check whether an S3 error means the requested object does not exist."""
+        response = getattr(error, 'response', None) or {}
+        code = response.get('Error', {}).get('Code')
+        if code is not None:
+            return str(code) in self.MISSING_OBJECT_CODES
+        return "NoSuchKey" in str(error)
+
+    def _get_batch_object(self, bucket: str, keys: List[str]):
+        """
+        Fetch the first existing object among candidate keys.
+
+        Returns:
+            Tuple of the S3 response and the key that was found
+
+        Raises:
+            The error of the last attempt if no key exists, or the first
+            error that is not a missing key
+        """
+        error = None
+        for key in keys:
+            record('s3_requests')
+            try:
+                response = self.s3_client.get_object(Bucket=bucket, Key=key)
+                encoding = encoding_for(key)
+                base = key[:-len(ENCODING_SUFFIXES[encoding])] if encoding else key
+                self._object_suffixes[self._key_prefix(base)] = key[len(base):]
+                return response, key
+            except Exception as e:
+                if not self._is_missing_object(e):
+                    raise
+                logger.debug(f"No batch object at {key}, trying next candidate")
+                error = e
+        raise error
+
+    def _cached_view(self, batch_id: str):
+        """Return a view over the cached batch data or ranged batch, if any."""
+        cache_key = f"batch_data_{batch_id}"
+        entry = self._cache.get(cache_key)
+        if entry is not None and not self._cache_expired(cache_key):
+            return as_batch_view(entry)
+        return self._cache.get(f"batch_ranges_{batch_id}")
+
+    async def _batch_view(self, batch_id: str, include_merkle_tree: bool = True):
+        """
+        Return a view over a batch for single-transaction lookups.
+
+        Uses the cached batch when present. With ``config.range_requests`` a
+        batch that has an offset index is read with S3 Range GETs instead of
+        being downloaded in full.
+        """
+        batch_view = self._cached_view(batch_id)
+        if batch_view is not None:
+            record('cache_hits')
+            return batch_view
+
+        load = self._batch_loads.get(batch_id)
+        if load is None:
+            load = self._start_batch_load(batch_id, include_merkle_tree)
+        else:
+            # Another lookup or a prefetch is already downloading this batch
+            record('cache_hits')
+
+        self._hold_load(load)
+        try:
+            return await asyncio.shield(load)
+        except asyncio.CancelledError:
+            if not load.cancelled():
+                raise
+        finally:
+            self._release_load(load)
+        # A prefetch we joined was cancelled; load the batch ourselves
+        return await self._batch_view(batch_id, include_merkle_tree)
+
+    def _start_batch_load(self, batch_id: str, include_merkle_tree: bool = True) -> asyncio.Future:
+        """Start downloading a batch as a task shared by all lookups of it."""
+        record('cache_misses')
+        load = asyncio.ensure_future(self._load_batch_view(batch_id, include_merkle_tree))
+        self._batch_loads[batch_id] = load
+
+        def finished(task):
+            if self._batch_loads.get(batch_id) is task:
+                del self._batch_loads[batch_id]
+            if not task.cancelled():
+                task.exception()  # Errors surface to the lookups awaiting the load
+
+        load.add_done_callback(finished)
+        return load
+
+    def _hold_load(self, load: asyncio.Future) -> None:
+        """Register interest in an in-flight batch download."""
+        self._load_holders[load] = self._load_holders.get(load, 0) + 1
+
+    def _release_load(self, load: asyncio.Future) -> None:
+        """Drop interest in a download, cancelling it if no one else still needs it."""
+        holders = self._load_holders.get(load, 0) - 1
+        if holders > 0:
+            self._load_holders[load] = holders
+            return
+        self._load_holders.pop(load, None)
+        if not load.done():
+            load.cancel()
+
+    async def _load_batch_view(self, batch_id: str, include_merkle_tree: bool = True):
+        """Download a batch into the cache and return a view over it."""
+        if self.config.range_requests:
+            batch_view = await self._load_ranged_batch(batch_id)
+            if batch_view is not None:
+                return batch_view
+
+        batch_data = await self.get_batch_data(batch_id, include_merkle_tree=include_merkle_tree)
+        if not batch_data:
+            return None
+        entry = self._cache.get(f"batch_data_{batch_id}")
+        return as_batch_view(entry) if entry is not None else None
+
+    async def _history_records(self, batch: BatchInfo, filter: TransactionFilter, after=None) -> List:
+        """
+        Load a batch and build its matching history records.
+
+        Returns:
+            (order key, TransactionRecord) pairs, skipping records at or
+            before the ``after`` cursor
+        """
+        try:
+            batch_data = await self.get_batch_data(batch.batch_id, include_merkle_tree=False)
+            if not batch_data:
+                return []
+            entry = self._cache.get(f"batch_data_{batch.batch_id}")
+            if entry is None:
+                return []
+            batch_view = as_batch_view(entry)
+
+            # Select matching positions before materializing any metadata
+            start_ms = end_ms = None
+            if filter.time_range:
+                start_ms = int(filter.time_range.start.timestamp() * 1000)
+                end_ms = int(filter.time_range.end.timestamp() * 1000)
+            if after is not None:
+                end_ms = after.timestamp if end_ms is None else min(end_ms, after.timestamp)
+
+            history_index = self._history_index(batch.batch_id, batch_view)
+            if history_index is not None:
+                positions = history_index.positions(filter.operation_types, start_ms, end_ms)
+            else:
+                positions = scan_positions(batch_view, filter.operation_types, start_ms, end_ms)
+
+            records = []
+            for position in positions:
+                metadata = batch_view.metadata(position)
+                timestamp = metadata.get('timestamp', 0)
+                key = record_key(timestamp, batch.batch_id, position)
+                if after is not None and key >= record_key(after.timestamp, after.batch_id, after.position):
+                    continue  # Returned before the cursor
+
+                # For account_id and amount filtering, we'd need the actual
+                # transaction data which is not stored (privacy by design)
+                # So we can only filter by metadata
+                records.append((key, TransactionRecord(
+                    transaction_id=metadata.get('transaction_id', ''),
+                    timestamp=datetime.fromtimestamp(timestamp / 1000),
+                    operation_type=metadata.get('operation_type', ''),
+                    database_name=metadata.get('database_name', ''),
+                    table_affected=metadata.get('table_affected', ''),
+                    transaction_hash=metadata.get('hash', ''),
+                    metadata=metadata
+                )))
+            return records
+
+        except Exception as e:
+            logger.error(f"Error processing batch {batch.batch_id}: {e}")
+            return []
+
+    def _store_batch(self, batch_id: str, entry, size: Optional[int] = None) -> None:
+        """
+        Cache a loaded batch, dropping state derived from its previous copy.
+
+        ``size`` is the entry's size in bytes when the caller knows it (the
+        downloaded length of raw batch JSON); a SharedCache charges it
+        instead of measuring the entry.
+        """
+        for name in self.BATCH_STATE:
+            self._cache.pop(f"batch_{name}_{batch_id}", None)
+        cache_key = f"batch_data_{batch_id}"
+        store = getattr(self._cache, 'store', None)
+        if store is not None and size is not None:
+            store(cache_key, entry, size)
+        else:
+            self._cache[cache_key] = entry
+        self._cache_timestamps[cache_key] = datetime.now()
+        self._generation += 1
+        self._batch_generations[batch_id] = self._generation
+
+    def _batch_state(self, batch_id: str, name: str) -> Optional[tuple]:
+        """
+        Return ``(generation, value)`` of state derived from a cached batch.
+
+        Returns None when the state is missing or was built from a copy of
+        the batch that has since been reloaded or evicted.
+        """
+        if f"batch_data_{batch_id}" not in self._cache:
+            return None
+        state = self._cache.get(f"batch_{name}_{batch_id}")
+        if state is None or state[0] != self._batch_generations.get(batch_id):
+            return None
+        return state
+
+    def _set_batch_state(self, batch_id: str, name: str, value: Any) -> None:
+        """
+        Store state derived from a cached batch.
+
+        The state holds the batch's load generation, not the batch itself, so
+        it neither keeps an evicted batch alive nor counts its size again in
+        a SharedCache, which also evicts it together with the batch.
+        """
+        state = (self._batch_generations.get(batch_id), value)
+        key = f"batch_{name}_{batch_id}"
+        attach = getattr(self._cache, 'attach', None)
+        if attach is not None:
+            attach(f"batch_data_{batch_id}", key, state)
+        else:
+            self._cache[key] = state
+
+    def _history_index(self, batch_id: str, batch_view) -> Optional[HistoryIndex]:
+        """Return the HistoryIndex of a cached batch, building it on first use."""
+        state = self._batch_state(batch_id, 'history')
+        if state is not None:
+            return state[1]
+        history_index = HistoryIndex.from_view(batch_view)
+        self._set_batch_state(batch_id, 'history', history_index)
+        return history_index
+
+    async def _attest_batch(self, batch_id: str, batch_view) -> bool:
+        """
+        Return whether a cached batch is attested against its on-chain root.
+
+        A batch is attested once the proofs of its full leaf set have been
+        checked against the on-chain merkle root. Membership in an attested
+        batch then needs only the hash lookup. The check runs on the second
+        proof lookup in a batch, so a single lookup keeps its O(log n) cost.
+        The state is tied to the cached copy; a reloaded batch is attested
+        again.
+        """
+        if (not self.config.attest_batches or isinstance(batch_view, RangedBatch)
+                or f"batch_data_{batch_id}" not in self._cache):
+            return False  # Only a full leaf set can be attested
+
+        state = self._batch_state(batch_id, 'attested')
+        if state is None:
+            self._set_batch_state(batch_id, 'attested', None)
+            return False
+        if state[1] is not None:
+            return state[1]
+
+        attestation = self._attestations.get(batch_id)
+        if attestation is None:
+            # Concurrent lookups of the batch share one check
+            attestation = asyncio.ensure_future(self._run_attestation(batch_id, batch_view, state[0]))
+            self._attestations[batch_id] = attestation
+
+            def finished(task):
+                if self._attestations.get(batch_id) is task:
+                    del self._attestations[batch_id]
+                if not task.cancelled():
+                    task.exception()
+
+            attestation.add_done_callback(finished)
+        return await asyncio.shield(attestation)
+
+    async def _run_attestation(self, batch_id: str, batch_view, generation: Optional[int]) -> bool:
+        """Check a batch's full leaf set in the executor and record the outcome."""
+        try:
+            batch = self._batch_roots.get(batch_view.root)
+            if batch is None or batch.batch_id != batch_id:
+                batch = await self.get_batch(batch_id)
+            if batch is None:
+                return False
+
+            attested = False
+            if batch.merkle_root == batch_view.root:
+                with timed('proof'):
+                    attested = await self._run_blocking(self._check_leaf_set, batch_view, batch.merkle_root)
+            if not attested:
+                logger.debug(f"Batch {batch_id} not attested; validating its proofs individually")
+        except Exception as e:
+            logger.debug(f"Could not attest batch {batch_id}: {e}")
+            return False  # Retried on the next lookup
+
+        if self._batch_generations.get(batch_id) == generation:
+            self._set_batch_state(batch_id, 'attested', attested)
+        return attested
+
+    @staticmethod
+    def _check_leaf_set(batch_view, merkle_root: str) -> bool:
+        """Validate the proofs of every leaf in a batch against its root (blocking)."""
+        proofs = []
+        for position in range(len(batch_view)):
+            leaf_hash = batch_view.leaf_hash(position)
+            proof = batch_view.proof(position)
+            if proof is None and leaf_hash != merkle_root:
+                return False  # A leaf without a proof cannot be checked
+            proof = proof or {}
+            proofs.append((leaf_hash, proof.get('proof_path', []), proof.get('sibling_positions', []), position))
+        return validate_merkle_proof_set(proofs, merkle_root)
+
+    async def _batches_since(
+        self,
+        is_known: Callable[[BatchInfo], bool],
+        first_page: int,
+        max_batches: Optional[int] = None
+    ) -> List[BatchInfo]:
+        """
+        Return recent batches newer than the newest known one, newest first.
+
+        The page of recent batches grows until it reaches a known batch, the
+        contract runs out of batches, or ``max_batches`` is reached. When the
+        contract caps the page at CONTRACT_PAGE, older batches are listed by
+        time window instead. Unknown batches sharing the timestamp of the
+        first known one are kept, as ties are listed in no fixed order.
+
+        Args:
+            is_known: Whether a batch was seen before
+            first_page: Size of the first page of recent batches
+            max_batches: Most batches to return; None pages back until a
+                known batch or the first batch, so no new batch is skipped
+        """
+        limit = first_page
+        while True:
+            batches = sorted(await self._get_recent_batches(limit), key=lambda b: b.timestamp, reverse=True)
+            for position, batch in enumerate(batches):
+                if is_known(batch):
+                    ties = [b for b in batches[position + 1:] if b.timestamp == batch.timestamp and not is_known(b)]
+                    return batches[:position] + ties
+            if len(batches) == self.CONTRACT_PAGE < limit:
+                break  # Capped by the contract, not out of batches
+            if len(batches) < limit or (max_batches is not None and limit >= max_batches):
+                return batches
+            limit = limit * 4 if max_batches is None else min(limit * 4, max_batches)
+
+        seen = {batch.batch_id for batch in batches}
+        known_at = None
+        older = self._iter_batches_in_window(datetime.fromtimestamp(0), batches[-1].timestamp)
+        try:
+            async for batch in older:
+                if known_at is not None and batch.timestamp < known_at:
+                    break
+                if max_batches is not None and len(batches) >= max_batches:
+                    break
+                if is_known(batch):
+                    known_at = batch.timestamp
+                    continue
+                if batch.batch_id not in seen:
+                    seen.add(batch.batch_id)
+                    batches.append(batch)
+        finally:
+            await older.aclose()
+        return batches
+
+    async def _iter_batches_in_window(
+        self,
+        start: datetime,
+        end: datetime,
+        page: int = CONTRACT_PAGE
+    ) -> AsyncIterator[BatchInfo]:
+        """
+        Yield every batch created in ``[start, end]``, newest first.
+
+        A time range query returns at most ``page`` batches and the contract
+        does not define which ones when more match, so only a query returning
+        fewer than ``page`` batches lists its window completely. A full page
+        is discarded and its window queried again in two halves. A batch is
+        yielded once no part of the window still to be queried can hold a
+        newer one.
+
+        Raises:
+            ContractError: If more than ``page`` batches share a millisecond,
+                so part of the window cannot be listed completely
+        """
+        page = max(1, min(page, self.CONTRACT_PAGE))
+        windows = [(start, end)]
+        found = set()
+        pending: List[BatchInfo] = []
+        while windows:
+            windows.sort(key=lambda window: window[1])
+            low, high = windows.pop()
+            listed = await self._get_batches_by_time_range(low, high, limit=page)
+            if len(listed) >= page:
+                if high - low <= timedelta(milliseconds=1):
+                    raise ContractError(
+                        f"More than {page} batches between {low} and {high}; cannot list them completely",
+                        contract_id=self.contract_id,
+                        method="get_batches_by_time_range"
+                    )
+                # Halves share their midpoint; batches found twice are dropped
+                middle = low + (high - low) / 2
+                windows.extend([(low, middle), (middle, high)])
+            else:
+                new = [b for b in listed if low <= b.timestamp <= high and b.batch_id not in found]
+                found.update(b.batch_id for b in new)
+                pending.extend(new)
+
+            pending.sort(key=lambda b: b.timestamp, reverse=True)
+            bound = max((window[1] for window in windows), default=None)
+            while pending and (bound is None or pending[0].timestamp > bound):
+                yield pending.pop(0)
+
+    async def _refresh_contract_stats(self) -> None:
+        """Sync contract statistics if the last sync is older than the refresh interval."""
+        synced_at = self._stats_synced_at
+        if synced_at is None or time.monotonic() - synced_at >= self.config.stats_refresh_interval:
+            await self.sync_contract_stats()
+
+    def _transaction_index(self) -> Optional[TransactionIndex]:
+        """Return the transaction index, opening it on first use."""
+        path = self.config.transaction_index_path
+        if not path:
+            return None
+        if self._tx_index is None or self._tx_index.path != path:
+            self._tx_index = TransactionIndex(path)
+        return self._tx_index
+
+    def _index_lookup(self, tx_hash: str, expected_operation: Optional[str] = None) -> List[IndexEntry]:
+        """Return indexed locations of a hash, newest batch first."""
+        index = self._transaction_index()
+        if index is None:
+            return []
+        try:
+            entries = index.lookup(tx_hash)
+        except Exception as e:
+            logger.warning(f"Transaction index lookup failed: {e}")
+            return []
+        if expected_operation:
+            entries = [e for e in entries if e.operation_type in (expected_operation, None)]
+        return entries
+
+    async def _index_batch(self, batch_id: str, batch_view, created_at: Optional[datetime] = None) -> None:
+        """Add a loaded batch to the transaction index, if configured."""
+        index = self._transaction_index()
+        if index is None or isinstance(batch_view, RangedBatch):
+            return  # Ranged batches would need one read per transaction
+        try:
+            await self._run_blocking(index.add_batch, batch_id, batch_view, created_at)
+        except Exception as e:
+            logger.warning(f"Could not index batch {batch_id}: {e}")
+
+    async def _probe_batches(
+        self,
+        tx_hash: str,
+        batches: List[BatchInfo],
+        use_contract_verification: bool = False,
+        expected_operation: Optional[str] = None
+    ) -> Optional[VerificationResult]:
+        """
+        Verify a transaction against candidate batches in order.
+
+        With ``config.prefetch_batches`` set to K, the data of the next K
+        candidates is downloaded while the current batch is probed. Downloads
+        still outstanding when the transaction is found are cancelled unless
+        another lookup is waiting for them.
+
+        With ``config.parallel_probes`` above 1 the candidates are probed
+        concurrently instead (see _probe_batches_concurrently).
+
+        Returns:
+            The first VerificationResult found, or None
+        """
+        if self.config.parallel_probes > 1 and len(batches) > 1:
+            return await self._probe_batches_concurrently(tx_hash, batches, use_contract_verification, expected_operation)
+
+        prefetches: List[asyncio.Future] = []
+        try:
+            for i, batch in enumerate(batches):
+                for upcoming in batches[i + 1:i + 1 + self.config.prefetch_batches]:
+                    self._prefetch_batch(upcoming, prefetches)
+                try:
+                    result = await self._verify_in_batch(tx_hash, batch, use_contract_verification, expected_operation)
+                    if result:
+                        return result
+                except VerificationError:
+                    # Skip this batch and continue searching
+                    continue
+            return None
+        finally:
+            for load in prefetches:
+                self._release_load(load)
+
+    async def _probe_batches_concurrently(
+        self,
+        tx_hash: str,
+        batches: List[BatchInfo],
+        use_contract_verification: bool = False,
+        expected_operation: Optional[str] = None
+    ) -> Optional[VerificationResult]:
+        """
+        Probe up to ``config.parallel_probes`` candidate batches at once.
+
+        Candidates are ordered newest first. A match is returned once every
+        newer candidate has been ruled out, so the result is always the most
+        recent batch containing the transaction, whichever probe finishes
+        first. Probes of older candidates are then cancelled, and with them
+        the downloads that no other lookup is waiting for.
+        """
+        ordered = sorted(batches, key=lambda b: b.timestamp, reverse=True)
+        probes: Dict[asyncio.Future, int] = {}
+        results: Dict[int, Optional[VerificationResult]] = {}
+        next_index = 0
+        best = None
+
+        async def probe(batch):
+            try:
+                return await self._verify_in_batch(tx_hash, batch, use_contract_verification, expected_operation)
+            except VerificationError:
+                return None
+
+        try:
+            while True:
+                while (next_index < len(ordered) and len(probes) < self.config.parallel_probes
+                       and (best is None or next_index < best)):
+                    probes[asyncio.ensure_future(probe(ordered[next_index]))] = next_index
+                    next_index += 1
+
+                if best is not None and all(index > best for index in probes.values()):
+                    return results[best]
+                if not probes:
+                    return None
+
+                done, _ = await asyncio.wait(list(probes), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = probes.pop(task)
+                    results[index] = task.result()
+                    if results[index] and (best is None or index < best):
+                        best = index
+                        logger.debug(f"Batch {ordered[index].batch_id} matched, waiting for newer candidates")
+        finally:
+            # A cancelled probe releases its download in _batch_view
+            for task in probes:
+                task.cancel()
+
+    def _prefetch_batch(self, batch: BatchInfo, prefetches: List[asyncio.Future]) -> None:
+        """Start downloading a candidate batch unless it is cached or loading."""
+        batch_id = batch.batch_id
+        if batch_id in self._batch_loads or self._cached_view(batch_id) is not None:
+            return
+        logger.debug(f"Prefetching batch {batch_id}")
+        load = self._start_batch_load(batch_id)
+        self._hold_load(load)
+        prefetches.append(load)
+
+    async def _run_blocking(self, func: Callable, *args):
+        """Run blocking S3 or parsing work in the default executor, keeping the active trace."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args)
+        if self._io_limiter is not None:
+            async with self._io_limiter:
+                return await loop.run_in_executor(None, call)
+        return await loop.run_in_executor(None, call)
+
+    async def _load_ranged_batch(self, batch_id: str) -> Optional[RangedBatch]:
+        """Load the S3 offset index of a batch written by the CDC agent."""
+        if not self.s3_client:
+            return None
+
+        batch_info = await self.get_batch(batch_id)
+        if not batch_info:
+            return None
+
+        bucket = batch_info.s3_location.bucket
+        for data_key in self._batch_object_keys(batch_info, batch_id):
+            if encoding_for(data_key) is not None:
+                continue  # Offsets only apply to the uncompressed object
+            index_key = offsets_key(data_key)
+            record('s3_requests')
+            try:
+                with timed('s3'):
+                    data = await self._run_blocking(self._read_object, bucket, index_key)
+                record('s3_bytes', len(data))
+                with timed('parse'):
+                    index = json.loads(data)
+                ranged = RangedBatch(index, self._range_reader(bucket, data_key), len(data))
+            except Exception as e:
+                if not self._is_missing_object(e):
+                    logger.debug(f"Ignoring offset index {index_key}: {e}")
+                continue
+
+            logger.debug(f"Using offset index {index_key} for ranged reads")
+            self._cache[f"batch_ranges_{batch_id}"] = ranged
+            return ranged
+
+        return None
+
+    def _read_object(self, bucket: str, key: str) -> bytes:
+        """Read and decode a whole S3 object (blocking)."""
+        response = self.s3_client.get_object(Bucket=bucket, Key=key)
+        return open_decoded(response['Body'], encoding_for(key, response.get('ContentEncoding'))).read()
+
+    async def _prefetch_ranges(self, batch_id: str, batch_view, positions: List[int]) -> None:
+        """Fetch ranged metadata and proofs of ``positions`` off the event loop."""
+        if isinstance(batch_view, RangedBatch) and positions:
+            await self._run_blocking(batch_view.prefetch, positions)
+            # Store again so a SharedCache charges the fetched entries
+            cache_key = f"batch_ranges_{batch_id}"
+            if self._cache.get(cache_key) is batch_view:
+                self._cache[cache_key] = batch_view
+
+    def _cache_expired(self, cache_key: str) -> bool:
+        """Check whether a cache entry is older than ``config.cache_ttl``."""
+        cached_at = self._cache_timestamps.get(cache_key)
+        if cached_at is None:
+            return False
+        return datetime.now() - cached_at > timedelta(seconds=self.config.cache_ttl)
+
+    def _revalidate(self, bucket: str, validator: Dict[str, Any]):
+        """
+        Conditionally re-fetch a cached batch object.
+
+        Sends ``IfNoneMatch`` with the stored ETag (or ``IfModifiedSince``
+        with the stored Last-Modified time).
+
+        Returns:
+            None if S3 answers 304 Not Modified, else the new S3 response
+        """
+        conditions = {}
+        if validator.get('etag'):
+            conditions['IfNoneMatch'] = validator['etag']
+        else:
+            conditions['IfModifiedSince'] = validator['last_modified']
+
+        record('s3_requests')
+        try:
+            return self.s3_client.get_object(Bucket=bucket, Key=validator['key'], **conditions)
+        except Exception as e:
+            error = getattr(e, 'response', None) or {}
+            code = str(error.get('Error', {}).get('Code', ''))
+            if code in ('304', 'NotModified') or 'Not Modified' in str(e):
+                return None
+            raise
+
+    def _batch_data_from_view(self, batch_info: BatchInfo, batch_view, include_merkle_tree: bool) -> BatchData:
+        """Build BatchData from a cached or memory-mapped batch view (root only)."""
+        counts = {}
+        for position in range(len(batch_view)):
+            op = batch_view.operation_type(position)
+            counts[op] = counts.get(op, 0) + 1
+
+        return BatchData(
+            batch_info=batch_info,
+            merkle_tree=MerkleTree(
+                algorithm=getattr(batch_view, 'algorithm', 'sha256'),
+                root=batch_view.root,
+                height=getattr(batch_view, 'height', 0),
+                nodes=[],
+                proof_index={}
+            ) if include_merkle_tree else None,
+            transaction_count=len(batch_view),
+            operation_counts=OperationCounts(
+                inserts=counts.get('INSERT', 0),
+                updates=counts.get('UPDATE', 0),
+                deletes=counts.get('DELETE', 0)
+            )
+        )
+
+    async def _cache_offset_index(self, bucket: str, key: str, batch_id: str, raw: bytes):
+        """Build (in the executor) and cache an offset index from a full read of a batch object."""
+        try:
+            with timed('parse'):
+                index = await self._run_blocking(build_offset_index, raw)
+        except ValueError as e:
+            logger.debug(f"Cannot build offset index for {key}: {e}")
+            self._cache.pop(f"batch_ranges_{batch_id}", None)
+            return
+        self._cache[f"batch_ranges_{batch_id}"] = RangedBatch(index, self._range_reader(bucket, key))
+
+    def _range_reader(self, bucket: str, key: str) -> Callable[[int, int], bytes]:
+        """Return a function reading ``[start, end)`` of an S3 object."""
+        def read_range(start: int, end: int) -> bytes:
+            record('s3_requests')
+            record('s3_bytes', end - start)
+            with timed('s3'):
+                response = self.s3_client.get_object(
+                    Bucket=bucket,
+                    Key=key,
+                    Range=f"bytes={start}-{end - 1}"
+                )
+                return response['Body'].read()
+        return read_range
+
+    def _cache_entry(self, batch_json: Dict[str, Any]):
+        """Return the representation to cache for freshly loaded batch JSON."""
+        if self.config.compact_cache:
+            try:
+                return CompactBatch.from_batch_json(batch_json)
+            except ValueError as e:
+                logger.debug(f"Keeping raw batch JSON in cache: {e}")
+        return batch_json
+
+    def _model(self, model_cls, **fields):
+        """
+        Build a result model from SDK-produced data.
+
+        In fast-result mode (``config.fast_results``) the model is created with
+        ``model_construct``, skipping pydantic validation for data that the SDK
+        already parsed itself. The returned object is still an instance of
+        ``model_cls``; use ``model_cls.model_validate(obj.model_dump())`` to get
+        a validated copy when one is needed.
+        """
+        if self.config.fast_results:
+            return model_cls.model_construct(**fields)
+        return model_cls(**fields)
+
     async def _verify_document_in_batch_contract(
         self,
         token_id: str,
@@ -1246,8 +2493,7 @@ class ETRAPClient:
             True if verification succeeds
         """
         try:
-            result = await self.near_account.view_function(
-                self.contract_id,
+            result = await self._view_function(
                 "verify_document_in_batch",
                 {
                     "token_id": token_id,
@@ -1269,50 +2515,49 @@ class ETRAPClient:
     
     async def _verify_in_batch(self, tx_hash: str, batch: BatchInfo, use_contract_verification: bool = False, expected_operation: Optional[str] = None) -> Optional[VerificationResult]:
         """Verify if transaction exists in a specific batch."""
+        record('batches_probed')
         try:
             # First check if this is a single-transaction batch where tx_hash == merkle_root
             # For single-transaction batches, we still fetch S3 data to get operation type
             if batch.merkle_root and tx_hash == batch.merkle_root:
                 logger.debug(f"Transaction hash matches merkle root in batch {batch.batch_id}")
                 
-                # Always fetch batch data to get operation type for single-transaction batches
+                # The root alone proves inclusion; batch data is only needed for
+                # the operation type, so skip the download when it isn't wanted
                 verified_operation_type = None
-                logger.debug(f"Fetching S3 data to get operation type for single-transaction batch")
-                
-                batch_data = await self.get_batch_data(
-                    batch.batch_id,
-                    include_merkle_tree=False,
-                    include_indices=False
-                )
+                batch_view = None
+                if expected_operation or self.config.resolve_root_operation:
+                    logger.debug("Fetching S3 data to get operation type for single-transaction batch")
+                    batch_view = await self._batch_view(batch.batch_id, include_merkle_tree=False)
                 
-                if batch_data:
+                if batch_view is not None:
+                    positions = batch_view.find(tx_hash)
+                    await self._prefetch_ranges(batch.batch_id, batch_view, positions)
                     # Check operation type in batch data
-                    cache_key = f"batch_data_{batch.batch_id}"
-                    batch_json = self._cache.get(cache_key, {})
-                    
-                    for tx in batch_json.get('transactions', []):
-                        if tx.get('metadata', {}).get('hash') == tx_hash:
-                            tx_operation = tx.get('metadata', {}).get('operation_type', 'INSERT')
-                            verified_operation_type = tx_operation
-                            
-                            # If expected_operation is specified, verify it matches
-                            if expected_operation and tx_operation != expected_operation:
-                                logger.debug(f"Operation type mismatch: found {tx_operation}, expected {expected_operation}")
-                                return None  # Hash matches but operation type doesn't
-                            break
+                    for position in positions:
+                        tx_operation = batch_view.operation_type(position) or 'INSERT'
+                        verified_operation_type = tx_operation
+
+                        # If expected_operation is specified, verify it matches
+                        if expected_operation and tx_operation != expected_operation:
+                            logger.debug(f"Operation type mismatch: found {tx_operation}, expected {expected_operation}")
+                            return None  # Hash matches but operation type doesn't
+                        break
                     else:
                         # Transaction not found in batch data (shouldn't happen)
                         logger.warning(f"Transaction {tx_hash} not found in batch data for {batch.batch_id}")
-                else:
+                elif expected_operation or self.config.resolve_root_operation:
                     # Can't get operation type without batch data
                     logger.warning(f"Cannot get operation type for batch {batch.batch_id} - no S3 data available")
                     # In this case, we'll proceed with verification but operation_type will be None
                 
-                return VerificationResult(
+                return self._model(
+                    VerificationResult,
                     verified=True,
                     transaction_hash=tx_hash,
                     batch_id=batch.batch_id,
-                    merkle_proof=MerkleProof(
+                    merkle_proof=self._model(
+                        MerkleProof,
                         leaf_hash=tx_hash,
                         proof_path=[],  # Single transaction, no proof needed
                         sibling_positions=[],
@@ -1325,71 +2570,66 @@ class ETRAPClient:
                 )
             
             # Otherwise, try to get batch data from S3 for full verification
-            batch_data = await self.get_batch_data(
-                batch.batch_id,
-                include_merkle_tree=True,
-                include_indices=False
-            )
+            batch_view = await self._batch_view(batch.batch_id)
             
-            if not batch_data:
+            if batch_view is None:
                 return None
             
-            # Search for transaction in batch using cached batch JSON
-            cache_key = f"batch_data_{batch.batch_id}"
-            batch_json = self._cache.get(cache_key, {})
-            
-            for tx in batch_json.get('transactions', []):
-                if tx.get('metadata', {}).get('hash') == tx_hash:
-                    # Check operation type if expected_operation is specified
-                    tx_operation = tx.get('metadata', {}).get('operation_type', 'INSERT')
-                    if expected_operation and tx_operation != expected_operation:
-                        # Hash matches but operation type doesn't - continue searching
-                        continue
-                    
-                    # Found the transaction with matching hash and operation type
-                    tx_id = tx['metadata']['transaction_id']
-                    tx_index = int(tx_id.split('-')[-1])
-                    
-                    # Get Merkle proof
-                    merkle_proof = await self.get_merkle_proof(batch.batch_id, tx_hash)
+            # Search for transaction in batch using the cached batch view
+            positions = batch_view.find(tx_hash)
+            await self._prefetch_ranges(batch.batch_id, batch_view, positions)
+            for position in positions:
+                # Check operation type if expected_operation is specified
+                tx_operation = batch_view.operation_type(position) or 'INSERT'
+                if expected_operation and tx_operation != expected_operation:
+                    # Hash matches but operation type doesn't - continue searching
+                    continue
+
+                # Found the transaction with matching hash and operation type
+                tx_id = batch_view.transaction_id(position)
+                tx_index = int(tx_id.split('-')[-1])
+
+                # Get Merkle proof
+                merkle_proof = await self.get_merkle_proof(batch.batch_id, tx_hash)
+
+                # Determine verification status
+                if use_contract_verification and merkle_proof:
+                    # Use smart contract for verification
+                    # Handle the odd leaf duplication case for contract compatibility
+                    contract_document_hash = tx_hash
+                    contract_proof_path = merkle_proof.proof_path
+                    contract_leaf_index = tx_index
                     
-                    # Determine verification status
-                    if use_contract_verification and merkle_proof:
-                        # Use smart contract for verification
-                        # Handle the odd leaf duplication case for contract compatibility
-                        contract_document_hash = tx_hash
-                        contract_proof_path = merkle_proof.proof_path
-                        contract_leaf_index = tx_index
-                        
-                        # Check if this is the last leaf in an odd-numbered batch (duplication case)
-                        if (batch.transaction_count % 2 == 1 and 
-                            tx_index == batch.transaction_count - 1):
-                            # For odd leaf case, the proof assumes duplication already happened
-                            # So we need to duplicate the hash and adjust the index for the contract
-                            import hashlib
-                            contract_document_hash = hashlib.sha256((tx_hash + tx_hash).encode()).hexdigest()
-                            # After duplication, this becomes index 1 at the parent level for 3-leaf tree
-                            contract_leaf_index = 1
-                        
-                        verified = await self._verify_document_in_batch_contract(
-                            token_id=batch.batch_id,
-                            document_hash=contract_document_hash,
-                            merkle_proof=contract_proof_path,
-                            leaf_index=contract_leaf_index
-                        )
-                    else:
-                        # Use local verification
-                        verified = merkle_proof.is_valid if merkle_proof else False
+                    # Check if this is the last leaf in an odd-numbered batch (duplication case)
+                    if (batch.transaction_count % 2 == 1 and 
+                        tx_index == batch.transaction_count - 1):
+                        # For odd leaf case, the proof assumes duplication already happened
+                        # So we need to duplicate the hash and adjust the index for the contract
+                        import hashlib
+                        contract_document_hash = hashlib.sha256((tx_hash + tx_hash).encode()).hexdigest()
+                        # After duplication, this becomes index 1 at the parent level for 3-leaf tree
+                        contract_leaf_index = 1
                     
-                    return VerificationResult(
-                        verified=verified,
-                        transaction_hash=tx_hash,
-                        batch_id=batch.batch_id,
-                        merkle_proof=merkle_proof,
-                        blockchain_timestamp=batch.timestamp,
-                        gas_used=None,  # Could be extracted from batch metadata
-                        operation_type=tx_operation
+                    verified = await self._verify_document_in_batch_contract(
+                        token_id=batch.batch_id,
+                        document_hash=contract_document_hash,
+                        merkle_proof=contract_proof_path,
+                        leaf_index=contract_leaf_index
                     )
+                else:
+                    # Use local verification
+                    verified = merkle_proof.is_valid if merkle_proof else False
+
+                return self._model(
+                    VerificationResult,
+                    verified=verified,
+                    transaction_hash=tx_hash,
+                    batch_id=batch.batch_id,
+                    merkle_proof=merkle_proof,
+                    blockchain_timestamp=batch.timestamp,
+                    gas_used=None,  # Could be extracted from batch metadata
+                    operation_type=tx_operation
+                )
             
             return None
             
@@ -1407,8 +2647,7 @@ class ETRAPClient:
         """Get recent batches from contract."""
         try:
             # Query NEAR contract for recent batches
-            result = await self.near_account.view_function(
-                self.contract_id,
+            result = await self._view_function(
                 "get_recent_batches",
                 {"limit": limit}
             )
@@ -1426,14 +2665,14 @@ class ETRAPClient:
                 if batch_info:
                     batches.append(batch_info)
             
+            record('batches_listed', len(batches))
             return batches
             
         except Exception as e:
             logger.error(f"Error getting recent batches: {e}")
             # Fallback to NFT tokens method
             try:
-                result = await self.near_account.view_function(
-                    self.contract_id,
+                result = await self._view_function(
                     "nft_tokens",
                     {"from_index": "0", "limit": limit}
                 )
@@ -1507,8 +2746,7 @@ class ETRAPClient:
                 params["database"] = database
             
             # Use contract method for time-based search
-            result = await self.near_account.view_function(
-                self.contract_id,
+            result = await self._view_function(
                 "get_batches_by_time_range",
                 params
             )
@@ -1523,6 +2761,7 @@ class ETRAPClient:
                     batch_info = self._parse_batch_info(batch_data)
                     if batch_info:
                         batches.append(batch_info)
+                record('batches_listed', len(batches))
                 return batches
                 
         except Exception as e:
@@ -1538,7 +2777,35 @@ class ETRAPClient:
         return filtered[:limit]
     
     def _parse_batch_info(self, contract_data: Dict) -> Optional[BatchInfo]:
-        """Parse contract response into BatchInfo."""
+        """Parse contract response into BatchInfo, indexing its Merkle root."""
+        batch_info = self._decode_batch_info(contract_data)
+        if batch_info:
+            self._index_batch_root(batch_info)
+        return batch_info
+
+    def _index_batch_root(self, batch_info: BatchInfo) -> None:
+        """Remember which batch a Merkle root belongs to, forgetting the oldest beyond BATCH_ROOTS."""
+        if batch_info.merkle_root:
+            self._batch_roots[batch_info.merkle_root] = batch_info
+            self._batch_roots.move_to_end(batch_info.merkle_root)
+            while len(self._batch_roots) > self.BATCH_ROOTS:
+                self._batch_roots.popitem(last=False)
+
+    @staticmethod
+    def _matches_hints(batch: BatchInfo, hints: Optional[VerificationHints]) -> bool:
+        """Check a batch against the database, table and time range hints."""
+        if hints is None:
+            return True
+        if hints.database_name and batch.database_name != hints.database_name:
+            return False
+        if hints.table_name and hints.table_name not in batch.table_names:
+            return False
+        if hints.time_range and not hints.time_range.start <= batch.timestamp <= hints.time_range.end:
+            return False
+        return True
+
+    def _decode_batch_info(self, contract_data: Dict) -> Optional[BatchInfo]:
+        """Decode the NFT token formats written by the ETRAP contract."""
         try:
             # Handle NFT token format
             token_id = contract_data.get('token_id', '')
@@ -1549,14 +2816,16 @@ class ETRAPClient:
             
             # If we have batch_summary at top level with merkle_root, use it directly
             if batch_summary_top and 'merkle_root' in batch_summary_top:
-                return BatchInfo(
+                return self._model(
+                    BatchInfo,
                     batch_id=token_id,
                     database_name=batch_summary_top.get('database_name', 'unknown'),
                     table_names=batch_summary_top.get('table_names', []),
                     transaction_count=batch_summary_top.get('tx_count', 0),
                     merkle_root=batch_summary_top.get('merkle_root', ''),
                     timestamp=datetime.fromtimestamp(batch_summary_top.get('timestamp', 0) / 1000),  # Blockchain batch creation time
-                    s3_location=S3Location(
+                    s3_location=self._model(
+                        S3Location,
                         bucket=batch_summary_top.get('s3_bucket', f"etrap-{self.organization_id}"),
                         key=batch_summary_top.get('s3_key', ''),
                         region='us-west-2'
@@ -1599,14 +2868,16 @@ class ETRAPClient:
                     else:
                         timestamp = datetime.now()
                     
-                    return BatchInfo(
+                    return self._model(
+                        BatchInfo,
                         batch_id=token_id,
                         database_name='unknown',  # Not in this metadata format
                         table_names=[table_name] if table_name != 'unknown' else [],
                         transaction_count=tx_count,
                         merkle_root='',  # Not in this metadata format
                         timestamp=timestamp,
-                        s3_location=S3Location(
+                        s3_location=self._model(
+                            S3Location,
                             bucket=bucket,
                             key=batch_key,
                             region='us-west-2'
@@ -1640,14 +2911,16 @@ class ETRAPClient:
             
             if isinstance(s3_loc, dict) and s3_loc.get('key'):
                 # Use the exact S3 location from NFT metadata (preferred)
-                s3_location = S3Location(
+                s3_location = self._model(
+                    S3Location,
                     bucket=s3_loc.get('bucket', self.s3_bucket if hasattr(self, 's3_bucket') else f"etrap-{self.organization_id}"),
                     key=s3_loc.get('key'),  # Use exact key from metadata
                     region=s3_loc.get('region', 'us-west-2')
                 )
             else:
                 # Legacy format - construct path
-                s3_location = S3Location(
+                s3_location = self._model(
+                    S3Location,
                     bucket=self.s3_bucket if hasattr(self, 's3_bucket') else f"etrap-{self.organization_id}",
                     key=f"{batch_summary.get('database_name', 'unknown')}/{table_name}/{token_id}/",
                     region='us-west-2'
@@ -1660,7 +2933,8 @@ class ETRAPClient:
             else:
                 timestamp = datetime.now()
             
-            return BatchInfo(
+            return self._model(
+                BatchInfo,
                 batch_id=token_id,
                 database_name=batch_summary.get('database_name', 'unknown'),
                 table_names=batch_summary.get('table_names', []),
@@ -0,0 +1,365 @@
+"""
+In-memory views over loaded batch data.
+
+The client caches one entry per loaded batch. An entry is either the raw
+batch JSON dictionary or a CompactBatch, a columnar representation that
+stores leaf hashes as one contiguous block of 32-byte digests, interns
+repeated strings and materializes full metadata dictionaries only on
+request. Both are accessed through the same small view interface so the
+client does not need to know which one it holds.
+"""
+
+import json
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+DIGEST_SIZE = 32
+
+# Metadata fields stored as columns when every transaction has them
+_TEXT_COLUMNS = ("operation_type", "database_name", "table_affected")
+
+
+class JsonBatch:
+    """View over a raw batch JSON dictionary."""
+
+    def __init__(self, batch_json: Dict[str, Any]):
+        self.batch_json = batch_json
+        self._transactions = batch_json.get('transactions', [])
+        self._merkle_tree = batch_json.get('merkle_tree', {})
+
+    @property
+    def root(self) -> str:
+        """Merkle root recorded in the batch file."""
+        return self._merkle_tree.get('root', '')
+
+    @property
+    def batch_info(self) -> Dict[str, Any]:
+        """Batch header section of the file."""
+        return self.batch_json.get('batch_info', {})
+
+    @property
+    def indices(self) -> Optional[Dict[str, Any]]:
+        """Search indices section written by the CDC agent, if present."""
+        return self.batch_json.get('indices')
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def find(self, tx_hash: str) -> List[int]:
+        """Return positions of all transactions with the given hash."""
+        return [
+            i for i, tx in enumerate(self._transactions)
+            if tx.get('metadata', {}).get('hash') == tx_hash
+        ]
+
+    def leaf_hash(self, position: int) -> str:
+        """Return the transaction hash at a position."""
+        return self._transactions[position].get('metadata', {}).get('hash', '')
+
+    def hashes(self) -> Iterator[str]:
+        """Iterate over transaction hashes in file order."""
+        for tx in self._transactions:
+            yield tx.get('metadata', {}).get('hash', '')
+
+    def metadata(self, position: int) -> Dict[str, Any]:
+        """Return the metadata dictionary of a transaction."""
+        return self._transactions[position].get('metadata', {})
+
+    def operation_type(self, position: int) -> Optional[str]:
+        """Return the operation type of a transaction."""
+        return self.metadata(position).get('operation_type')
+
+    def transaction_id(self, position: int) -> Optional[str]:
+        """Return the transaction ID of a transaction."""
+        return self.metadata(position).get('transaction_id')
+
+    def timestamp(self, position: int) -> Optional[int]:
+        """Return the transaction timestamp in milliseconds."""
+        return self.metadata(position).get('timestamp')
+
+    def proof(self, position: int) -> Optional[Dict[str, Any]]:
+        """Return the proof index entry for a transaction position."""
+        return self._merkle_tree.get('proof_index', {}).get(f"tx-{position}")
+
+
+class CompactBatch:
+    """
+    Columnar representation of a loaded batch.
+
+    Leaf hashes and proof paths are kept as raw digests in contiguous
+    ``bytes`` blocks, operation types, databases and tables as small integer
+    codes into interned name tables, and timestamps in an ``array``. Hash
+    lookups use a permutation of positions sorted by digest. Metadata fields
+    that are not stored as columns are kept as compact JSON per row and only
+    decoded when ``metadata()`` is called.
+    """
+
+    def __init__(self):
+        self.root = ''
+        self.algorithm = 'sha256'
+        self.height = 0
+        self.batch_info: Dict[str, Any] = {}
+        self._count = 0
+        self._digests = b''
+        self._order = array('I')
+        self._names: List[str] = []
+        self._columns: Dict[str, array] = {}
+        self._timestamps: Optional[array] = None
+        self._id_prefix: Optional[str] = None
+        self._ids: Optional[List[str]] = None
+        self._extra = b''
+        self._extra_offsets = array('I', [0])
+        self._proofs = b''
+        self._proof_offsets = array('I', [0])
+        self._proof_sides = array('Q')
+        self._proof_flags = b''
+
+    @classmethod
+    def from_batch_json(cls, batch_json: Dict[str, Any]) -> "CompactBatch":
+        """
+        Build a compact batch from raw batch JSON.
+
+        Args:
+            batch_json: Batch JSON as stored in S3 (full or reduced)
+
+        Returns:
+            CompactBatch with the same transactions, root and proofs
+
+        Raises:
+            ValueError: If hashes are not 32-byte hex digests or proofs use
+                keys other than ``tx-<position>``
+        """
+        batch = cls()
+        transactions = batch_json.get('transactions', [])
+        merkle_tree = batch_json.get('merkle_tree', {}) or {}
+        metadata_rows = [tx.get('metadata', {}) for tx in transactions]
+        count = len(metadata_rows)
+
+        batch.root = merkle_tree.get('root', '')
+        batch.algorithm = merkle_tree.get('algorithm', 'sha256')
+        batch.height = merkle_tree.get('height', 0)
+        batch.batch_info = dict(batch_json.get('batch_info', {}))
+        batch._count = count
+
+        # Leaf digests and hash lookup permutation
+        batch._digests = b''.join(_digest(m.get('hash', '')) for m in metadata_rows)
+        digests = batch._digests
+        batch._order = array('I', sorted(
+            range(count),
+            key=lambda i: digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+        ))
+
+        # Interned text columns
+        columnar = {'hash'}
+        codes: Dict[str, int] = {}
+        for field in _TEXT_COLUMNS:
+            if count and all(isinstance(m.get(field), str) for m in metadata_rows):
+                column = array('H')
+                for m in metadata_rows:
+                    value = m[field]
+                    if value not in codes:
+                        codes[value] = len(batch._names)
+                        batch._names.append(value)
+                    column.append(codes[value])
+                batch._columns[field] = column
+                columnar.add(field)
+
+        if count and all(type(m.get('timestamp')) is int for m in metadata_rows):
+            batch._timestamps = array('q', (m['timestamp'] for m in metadata_rows))
+            columnar.add('timestamp')
+
+        # Transaction IDs are normally "<batch_id>-<position>"
+        if count and all(isinstance(m.get('transaction_id'), str) for m in metadata_rows):
+            prefix = metadata_rows[0]['transaction_id'].rsplit('-', 1)[0] + '-'
+            if all(m['transaction_id'] == f"{prefix}{i}" for i, m in enumerate(metadata_rows)):
+                batch._id_prefix = prefix
+            else:
+                batch._ids = [m['transaction_id'] for m in metadata_rows]
+            columnar.add('transaction_id')
+
+        # Remaining metadata as compact JSON, decoded on demand
+        extra = bytearray()
+        for m in metadata_rows:
+            rest = {k: v for k, v in m.items() if k not in columnar}
+            if rest:
+                extra += json.dumps(rest, separators=(',', ':')).encode()
+            batch._extra_offsets.append(len(extra))
+        batch._extra = bytes(extra)
+
+        # Proofs as digest runs plus a left/right bitmask per transaction
+        proof_index = merkle_tree.get('proof_index', {}) or {}
+        expected_keys = {f"tx-{i}" for i in range(count)}
+        if not set(proof_index) <= expected_keys:
+            raise ValueError("Proof index keys do not match transaction positions")
+
+        proofs = bytearray()
+        flags = bytearray()
+        for i in range(count):
+            entry = proof_index.get(f"tx-{i}")
+            sides = 0
+            flag = 0
+            if entry is not None:
+                path = entry.get('proof_path', [])
+                positions = entry.get('sibling_positions', [])
+                if len(path) > 64:
+                    raise ValueError("Proof path too long for compact storage")
+                for sibling in path:
+                    proofs += _digest(sibling)
+                for level, position in enumerate(positions):
+                    if position == 'left':
+                        sides |= 1 << level
+                flag = 1 | (2 if positions else 0)
+            batch._proof_offsets.append(len(proofs) // DIGEST_SIZE)
+            batch._proof_sides.append(sides)
+            flags.append(flag)
+        batch._proofs = bytes(proofs)
+        batch._proof_flags = bytes(flags)
+
+        return batch
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the columnar data in bytes."""
+        size = len(self._digests) + len(self._extra) + len(self._proofs)
+        size += len(self._proof_flags)
+        for arr in (self._order, self._extra_offsets, self._proof_offsets, self._proof_sides):
+            size += arr.itemsize * len(arr)
+        for column in self._columns.values():
+            size += column.itemsize * len(column)
+        if self._timestamps is not None:
+            size += self._timestamps.itemsize * len(self._timestamps)
+        if self._ids is not None:
+            size += sum(len(i) for i in self._ids)
+        return size
+
+    def find(self, tx_hash: str) -> List[int]:
+        """Return positions of all transactions with the given hash."""
+        try:
+            digest = _digest(tx_hash)
+        except ValueError:
+            return []
+
+        digests = self._digests
+        order = self._order
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = order[mid] * DIGEST_SIZE
+            if digests[start:start + DIGEST_SIZE] < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        positions = []
+        while lo < self._count:
+            start = order[lo] * DIGEST_SIZE
+            if digests[start:start + DIGEST_SIZE] != digest:
+                break
+            positions.append(order[lo])
+            lo += 1
+        return positions
+
+    def leaf_hash(self, position: int) -> str:
+        """Return the transaction hash at a position."""
+        start = position * DIGEST_SIZE
+        return self._digests[start:start + DIGEST_SIZE].hex()
+
+    def hashes(self) -> Iterator[str]:
+        """Iterate over transaction hashes in file order."""
+        for position in range(self._count):
+            yield self.leaf_hash(position)
+
+    def operation_type(self, position: int) -> Optional[str]:
+        """Return the operation type of a transaction."""
+        return self._text('operation_type', position)
+
+    def transaction_id(self, position: int) -> Optional[str]:
+        """Return the transaction ID of a transaction."""
+        if self._id_prefix is not None:
+            return f"{self._id_prefix}{position}"
+        if self._ids is not None:
+            return self._ids[position]
+        return self._extra_row(position).get('transaction_id')
+
+    def timestamp(self, position: int) -> Optional[int]:
+        """Return the transaction timestamp in milliseconds."""
+        if self._timestamps is not None:
+            return self._timestamps[position]
+        return self._extra_row(position).get('timestamp')
+
+    def metadata(self, position: int) -> Dict[str, Any]:
+        """Materialize the metadata dictionary of a transaction."""
+        metadata = self._extra_row(position)
+        metadata['hash'] = self.leaf_hash(position)
+        for field in self._columns:
+            metadata[field] = self._text(field, position)
+        if self._timestamps is not None:
+            metadata['timestamp'] = self._timestamps[position]
+        if self._id_prefix is not None or self._ids is not None:
+            metadata['transaction_id'] = self.transaction_id(position)
+        return metadata
+
+    def proof(self, position: int) -> Optional[Dict[str, Any]]:
+        """Return the proof index entry for a transaction position."""
+        if position < 0 or position >= self._count:
+            return None
+        flag = self._proof_flags[position]
+        if not flag & 1:
+            return None
+
+        start = self._proof_offsets[position]
+        end = self._proof_offsets[position + 1]
+        path = [
+            self._proofs[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE].hex()
+            for i in range(start, end)
+        ]
+        proof = {'leaf_index': position, 'proof_path': path, 'sibling_positions': []}
+        if flag & 2:
+            sides = self._proof_sides[position]
+            proof['sibling_positions'] = [
+                'left' if sides >> level & 1 else 'right'
+                for level in range(len(path))
+            ]
+        return proof
+
+    def _text(self, field: str, position: int) -> Optional[str]:
+        column = self._columns.get(field)
+        if column is None:
+            return self._extra_row(position).get(field)
+        return self._names[column[position]]
+
+    def _extra_row(self, position: int) -> Dict[str, Any]:
+        start = self._extra_offsets[position]
+        end = self._extra_offsets[position + 1]
+        if start == end:
+            return {}
+        return json.loads(self._extra[start:end])
+
+
+BatchView = Union[JsonBatch, CompactBatch]
+
+
+def as_batch_view(entry: Union[Dict[str, Any], BatchView]) -> BatchView:
+    """
+    Return a view for a cached batch entry.
+
+    Args:
+        entry: Raw batch JSON dictionary or an existing view
+
+    Returns:
+        The entry itself if it is already a view, else a JsonBatch over it
+    """
+    if isinstance(entry, dict):
+        return JsonBatch(entry)
+    return entry
+
+
+def _digest(hex_hash: str) -> bytes:
+    """Convert a hex hash to its 32-byte digest."""
+    digest = bytes.fromhex(hex_hash)
+    if len(digest) != DIGEST_SIZE:
+        raise ValueError(f"Expected a {DIGEST_SIZE}-byte hex digest")
+    return digest
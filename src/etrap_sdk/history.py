@@ -0,0 +1,255 @@
+"""
+Newest-first merging and cursors for transaction history queries.
+
+History is read from several batches at once. Every transaction in a batch
+is older than the batch's on-chain creation time, so when batches are loaded
+in descending creation order, a record can be emitted as soon as it is newer
+than the creation time of the next batch still to be loaded. HistoryMerge
+implements that k-way merge.
+
+A cursor records the last emitted record and the creation time of the newest
+batch that still had records left, so a follow-up query skips batches that
+were already fully returned instead of rescanning from the newest batch.
+
+Within a batch, HistoryIndex uses the ``indices`` section written by the CDC
+agent to select matching positions, so only matching transactions are
+materialized as records.
+"""
+
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+CURSOR_VERSION = 1
+
+
+class HistoryCursor(NamedTuple):
+    """Resume point of a history query."""
+    timestamp: int  # Milliseconds of the last emitted record
+    batch_id: str
+    position: int
+    end_ms: int  # Creation time of the newest batch with records left
+
+
+def record_key(timestamp: int, batch_id: str, position: int) -> Tuple[int, str, int]:
+    """Order key of a record; history is emitted in descending key order."""
+    return (timestamp, batch_id, position)
+
+
+def encode_cursor(cursor: HistoryCursor) -> str:
+    """Encode a cursor as an opaque URL-safe string."""
+    payload = json.dumps([CURSOR_VERSION, *cursor], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(text: str) -> HistoryCursor:
+    """
+    Decode a cursor returned by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or from another version
+    """
+    try:
+        payload = base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+        version, timestamp, batch_id, position, end_ms = json.loads(payload)
+    except Exception as e:
+        raise ValueError(f"Invalid history cursor: {e}")
+    if version != CURSOR_VERSION:
+        raise ValueError(f"Unsupported history cursor version: {version}")
+    return HistoryCursor(int(timestamp), str(batch_id), int(position), int(end_ms))
+
+
+class _Newest:
+    """Heap entry that pops the largest key first."""
+    __slots__ = ('key', 'rank', 'record')
+
+    def __init__(self, key: Tuple[int, str, int], rank: int, record: Any):
+        self.key = key
+        self.rank = rank
+        self.record = record
+
+    def __lt__(self, other: "_Newest") -> bool:
+        return self.key > other.key
+
+
+class HistoryMerge:
+    """
+    k-way merge of per-batch records, newest first.
+
+    Batches are identified by their rank in descending creation order and
+    must be added in that order. When batches are listed page by page, the
+    merge is created incomplete, extended as batches are listed and
+    finished once the listing is exhausted.
+    """
+
+    def __init__(self, created_ms: List[int], complete: bool = True):
+        """
+        Args:
+            created_ms: Creation time of each batch, newest first
+            complete: False if older batches will be added with extend()
+        """
+        self._created = list(created_ms)
+        self._complete = complete
+        self._heap: List[_Newest] = []
+        self._remaining = [0] * len(created_ms)
+        self._loaded = 0
+        self._open = 0  # Newest batch that may still have records to emit
+
+    def extend(self, created_ms: List[int]) -> None:
+        """Append the creation times of further batches, no newer than those known."""
+        if self._complete:
+            raise ValueError("Cannot extend a complete merge")
+        self._created.extend(created_ms)
+        self._remaining.extend([0] * len(created_ms))
+
+    def finish(self) -> None:
+        """Mark the batch list complete; the last batch then releases all records."""
+        self._complete = True
+
+    def add(self, rank: int, records: List[Tuple[Tuple[int, str, int], Any]]) -> None:
+        """Add the (key, record) pairs of the next batch."""
+        if rank != self._loaded:
+            raise ValueError(f"Batch {rank} added out of order (expected {self._loaded})")
+        self._loaded += 1
+        self._remaining[rank] = len(records)
+        for key, record in records:
+            heapq.heappush(self._heap, _Newest(key, rank, record))
+
+    def pop_ready(self) -> Iterator[Tuple[Any, HistoryCursor]]:
+        """
+        Yield (record, cursor) pairs that no unloaded batch can precede.
+
+        Once every batch has been added and the list is complete, all
+        remaining records are yielded.
+        """
+        if self._loaded < len(self._created):
+            watermark = self._created[self._loaded]
+        elif not self._complete:
+            if not self._created:
+                return
+            # Batches still to be listed are no newer than the last one known
+            watermark = self._created[-1]
+        else:
+            watermark = None
+        while self._heap and (watermark is None or self._heap[0].key[0] > watermark):
+            entry = heapq.heappop(self._heap)
+            self._remaining[entry.rank] -= 1
+            timestamp, batch_id, position = entry.key
+            yield entry.record, HistoryCursor(timestamp, batch_id, position, self._open_end())
+
+    def _open_end(self) -> int:
+        """Creation time of the newest batch not fully emitted."""
+        while self._open < self._loaded and self._remaining[self._open] == 0:
+            self._open += 1
+        if self._open < len(self._created):
+            return self._created[self._open]
+        return self._created[-1] if self._created else 0
+
+
+class HistoryIndex:
+    """
+    Time and operation lookups over a batch's ``indices`` section.
+
+    ``by_timestamp`` is kept as sorted timestamps with their transaction
+    positions, so a time range is two bisections, and ``by_operation`` as
+    position sets. Build once per loaded batch with from_view().
+    """
+
+    def __init__(self, timestamps: List[int], positions: List[List[int]], operations: Dict[str, Set[int]]):
+        self._timestamps = timestamps
+        self._positions = positions
+        self._operations = operations
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the index in bytes."""
+        entries = len(self._timestamps) + sum(len(group) for group in self._positions)
+        entries += sum(len(positions) for positions in self._operations.values())
+        return 64 * (len(self._positions) + len(self._operations)) + 40 * entries
+
+    @classmethod
+    def from_view(cls, batch_view) -> Optional["HistoryIndex"]:
+        """
+        Build the index from a batch view's ``indices`` section.
+
+        Returns:
+            HistoryIndex, or None if the batch has no usable indices (for
+            example a CompactBatch, or IDs that do not resolve to positions)
+        """
+        indices = getattr(batch_view, 'indices', None)
+        if not indices or 'by_timestamp' not in indices:
+            return None
+
+        count = len(batch_view)
+        by_id = {batch_view.transaction_id(position): position for position in range(count)}
+
+        def resolve(tx_ids: Sequence[str]) -> Optional[List[int]]:
+            resolved = []
+            for tx_id in tx_ids:
+                position = by_id.get(tx_id)
+                if position is None and str(tx_id).isdigit() and int(tx_id) < count:
+                    position = int(tx_id)
+                if position is None:
+                    return None
+                resolved.append(position)
+            return resolved
+
+        try:
+            entries = sorted((int(ts), ids) for ts, ids in indices['by_timestamp'].items())
+            operations = {}
+            for operation, tx_ids in indices.get('by_operation', {}).items():
+                resolved = resolve(tx_ids)
+                if resolved is None:
+                    return None
+                operations[operation] = set(resolved)
+        except (TypeError, ValueError):
+            return None
+
+        timestamps, positions = [], []
+        for ts, tx_ids in entries:
+            resolved = resolve(tx_ids)
+            if resolved is None:
+                return None
+            timestamps.append(ts)
+            positions.append(resolved)
+        if sum(len(p) for p in positions) != count:
+            return None  # Index does not cover every transaction
+        return cls(timestamps, positions, operations)
+
+    def positions(
+        self,
+        operation_types: Optional[Sequence[str]] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> List[int]:
+        """Return positions within [start_ms, end_ms] with a matching operation type."""
+        lo = bisect_left(self._timestamps, start_ms) if start_ms is not None else 0
+        hi = bisect_right(self._timestamps, end_ms) if end_ms is not None else len(self._timestamps)
+        selected = [position for group in self._positions[lo:hi] for position in group]
+        if operation_types:
+            allowed = set()
+            for operation in operation_types:
+                allowed |= self._operations.get(operation, set())
+            selected = [position for position in selected if position in allowed]
+        return sorted(selected)
+
+
+def scan_positions(
+    batch_view,
+    operation_types: Optional[Sequence[str]] = None,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None
+) -> List[int]:
+    """Select matching positions by scanning timestamp and operation columns."""
+    selected = []
+    for position in range(len(batch_view)):
+        if operation_types and batch_view.operation_type(position) not in operation_types:
+            continue
+        if start_ms is not None or end_ms is not None:
+            timestamp = batch_view.timestamp(position) or 0
+            if (start_ms is not None and timestamp < start_ms) or (end_ms is not None and timestamp > end_ms):
+                continue
+        selected.append(position)
+    return selected
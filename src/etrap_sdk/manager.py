@@ -0,0 +1,151 @@
+"""
+Per-organization clients that share connection pools and a cache budget.
+
+A process that verifies for many organizations would otherwise build one
+boto3 client, one NEAR RPC connection pool and one unbounded cache per
+ETRAPClient. ClientManager hands out one ETRAPClient per organization, all
+backed by:
+
+- a single boto3 S3 client (boto3 clients are thread-safe, and batch
+  locations name their bucket explicitly)
+- a single py_near account, whose HTTP pool serves every contract, since
+  view calls name the contract they query
+- a SharedCache with one memory budget, evicting from the largest tenant
+  first
+- a per-tenant limit on concurrent S3 reads and RPC calls, so one
+  organization's bulk job cannot hold every pooled connection and executor
+  thread
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+from .cache import SharedCache
+from .client import ETRAPClient
+from .models import S3Config
+
+
+class TenantLimiter:
+    """Async context manager admitting at most ``limit`` operations at once."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        if self._semaphore is None:
+            # Created on first use so it belongs to the running loop
+            self._semaphore = asyncio.Semaphore(self.limit)
+        await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class ClientManager:
+    """
+    Hands out per-organization ETRAPClients backed by shared resources.
+
+    Example:
+        manager = ClientManager(network="testnet", s3_config=S3Config(region="us-west-2"))
+        result = await manager.client("acme").verify_transaction(tx)
+        manager.cache_usage()  # {"acme": 1843200}
+    """
+
+    def __init__(
+        self,
+        network: str = "testnet",
+        rpc_endpoint: Optional[str] = None,
+        s3_config: Optional[S3Config] = None,
+        cache_budget_bytes: int = 512 * 1024 * 1024,
+        max_concurrent_per_tenant: int = 8,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            network: NEAR network (testnet/mainnet/localnet)
+            rpc_endpoint: Custom RPC endpoint (optional)
+            s3_config: S3 configuration shared by all organizations; leave
+                bucket_name unset so each organization uses etrap-<org>
+            cache_budget_bytes: Approximate memory budget of the shared cache
+            max_concurrent_per_tenant: S3 reads and RPC calls one
+                organization may have in flight
+            config: ClientConfig options applied to every client;
+                transaction_index_path may use an {organization_id} placeholder
+        """
+        if max_concurrent_per_tenant < 1:
+            raise ValueError("max_concurrent_per_tenant must be at least 1")
+        index_path = (config or {}).get('transaction_index_path')
+        if index_path and '{organization_id}' not in index_path:
+            raise ValueError("transaction_index_path must contain '{organization_id}' so tenants do not share an index")
+        self.network = network
+        self.rpc_endpoint = rpc_endpoint
+        self.s3_config = s3_config
+        self.max_concurrent_per_tenant = max_concurrent_per_tenant
+        self.config = dict(config or {})
+        self.cache = SharedCache(cache_budget_bytes)
+
+        self._clients: Dict[str, ETRAPClient] = {}
+        self._s3_client = None
+        self._near_account = None
+        self._lock = threading.Lock()
+
+    def client(self, organization_id: str) -> ETRAPClient:
+        """Return the client of an organization, creating it on first use."""
+        with self._lock:
+            client = self._clients.get(organization_id)
+            if client is None:
+                client = ETRAPClient(
+                    organization_id=organization_id,
+                    network=self.network,
+                    rpc_endpoint=self.rpc_endpoint,
+                    s3_config=self.s3_config
+                )
+                if self.config:
+                    client.update_config(self._tenant_config(organization_id))
+                client._cache = self.cache.tenant(organization_id)
+                client._s3_factory = self._shared_s3_client
+                client._near_factory = self._shared_near_account
+                client._io_limiter = TenantLimiter(self.max_concurrent_per_tenant)
+                self._clients[organization_id] = client
+            return client
+
+    __getitem__ = client
+
+    def organizations(self) -> list:
+        """Return the organizations with a client."""
+        with self._lock:
+            return sorted(self._clients)
+
+    def cache_usage(self) -> Dict[str, int]:
+        """Return the approximate cache bytes held per organization."""
+        return self.cache.usage()
+
+    def close(self) -> None:
+        """Close per-organization transaction indexes and drop all clients."""
+        with self._lock:
+            for client in self._clients.values():
+                if client._tx_index is not None:
+                    client._tx_index.close()
+            self._clients.clear()
+
+    def _tenant_config(self, organization_id: str) -> Dict[str, Any]:
+        config = dict(self.config)
+        if config.get('transaction_index_path'):
+            config['transaction_index_path'] = config['transaction_index_path'].format(organization_id=organization_id)
+        return config
+
+    def _shared_s3_client(self, s3_config: S3Config):
+        with self._lock:
+            if self._s3_client is None:
+                self._s3_client = ETRAPClient._create_s3_client(s3_config)
+            return self._s3_client
+
+    def _shared_near_account(self, rpc_endpoint: str):
+        with self._lock:
+            if self._near_account is None:
+                from py_near import account
+                self._near_account = account.Account(rpc_addr=rpc_endpoint)
+            return self._near_account
@@ -48,6 +48,24 @@ class MerkleProof(BaseModel):
     is_valid: bool = False
 
 
+class VerificationTrace(BaseModel):
+    """Counters and per-phase timings recorded during one verification."""
+    verified: Optional[bool] = None
+    total_ms: float = 0.0
+    batches_listed: int = 0
+    batches_probed: int = 0
+    rpc_calls: int = 0
+    rpc_ms: float = 0.0
+    s3_requests: int = 0
+    s3_bytes: int = 0
+    s3_ms: float = 0.0
+    parse_ms: float = 0.0
+    proof_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    proofs_skipped: int = 0
+
+
 class VerificationResult(BaseModel):
     """Result of transaction verification."""
     verified: bool
@@ -58,13 +76,20 @@ class VerificationResult(BaseModel):
     gas_used: Optional[str] = None
     error: Optional[str] = None
     operation_type: Optional[str] = None
+    trace: Optional[VerificationTrace] = None
 
 
 class VerificationSummary(BaseModel):
     """Summary statistics for batch verification."""
     success_rate: float
-    average_verification_time_ms: float
-    blockchain_confirmations: int
+    average_verification_time_ms: float  # Mean per-transaction latency
+    blockchain_confirmations: int  # Distinct batches anchoring the verified transactions
+    p50_verification_time_ms: float = 0.0
+    p90_verification_time_ms: float = 0.0
+    p99_verification_time_ms: float = 0.0
+    max_verification_time_ms: float = 0.0
+    throughput_tx_per_sec: float = 0.0  # Transactions completed per second of wall time
+    cache_hit_ratio: Optional[float] = None  # Batch cache hits / lookups, None without lookups
 
 
 class BatchVerificationResult(BaseModel):
@@ -186,6 +211,7 @@ class TransactionRecord(BaseModel):
     table_affected: str
     transaction_hash: str
     metadata: Dict[str, Any]
+    cursor: Optional[str] = None  # Resume point after this record (see iter_transaction_history)
 
 
 class TransactionHistory(BaseModel):
@@ -193,6 +219,7 @@ class TransactionHistory(BaseModel):
     transactions: List[TransactionRecord]
     total_found: int
     time_range_covered: TimeRange
+    next_cursor: Optional[str] = None  # Pass as cursor to fetch the next page
 
 
 # NFT Models
@@ -238,7 +265,8 @@ class S3Config(BaseModel):
     secret_access_key: Optional[str] = None
     region: str = "us-west-2"
     bucket_name: Optional[str] = Field(None, min_length=1)
-    endpoint_url: Optional[str] = None
+    endpoint_url: Optional[str] = None  # S3-compatible endpoint (MinIO, local stand-in)
+    max_pool_connections: Optional[int] = Field(None, ge=1)  # HTTP connection pool size
 
 
 class ClientConfig(BaseModel):
@@ -248,4 +276,17 @@ class ClientConfig(BaseModel):
     timeout: int = 30
     batch_size: int = 100
     verify_ssl: bool = True
-    log_level: str = "INFO"
\ No newline at end of file
+    log_level: str = "INFO"
+    fast_results: bool = False  # Build result models with model_construct (no validation)
+    streaming_parse: bool = False  # Parse batch data incrementally, keeping only needed fields
+    compact_cache: bool = False  # Cache loaded batches in columnar CompactBatch form
+    local_batch_dir: Optional[str] = None  # Directory of memory-mapped .etrapb batch files
+    compressed_transfer: bool = False  # Prefer batch-data.json.zst/.gz objects when present
+    range_requests: bool = False  # Read single proofs with S3 Range GETs via an offset index
+    trace_verifications: bool = False  # Attach a VerificationTrace to each VerificationResult
+    prefetch_batches: int = Field(0, ge=0)  # Candidate batches downloaded ahead while searching
+    parallel_probes: int = Field(1, ge=1)  # Candidate batches probed concurrently while searching
+    resolve_root_operation: bool = True  # Download single-transaction batches to report operation_type
+    transaction_index_path: Optional[str] = None  # SQLite file mapping transaction hashes to batches
+    stats_refresh_interval: float = Field(5.0, ge=0)  # Seconds between contract stats syncs on read
+    attest_batches: bool = True  # Check loaded batches against on-chain roots once, then skip per-leaf proof hashing
\ No newline at end of file
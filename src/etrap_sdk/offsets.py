@@ -0,0 +1,268 @@
+"""
+Byte-offset index for ranged reads of batch-data.json.
+
+Verifying a single transaction needs one ``transactions[i].metadata`` object
+and one ``merkle_tree.proof_index`` entry, a few hundred bytes of a file that
+can be hundreds of megabytes. An offset index records the byte span of each of
+those objects together with the leaf hashes and the Merkle root, so a reader
+can locate a transaction from the (much smaller) index and fetch only the
+spans it needs with HTTP Range requests.
+
+The index is stored as ``batch-data.offsets.json`` next to the batch data
+object. The CDC agent can write it with build_offset_index() when it uploads a
+batch; the SDK also builds it on the first full read of an uncompressed
+batch and keeps it in the client cache.
+"""
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+DATA_FILE = "batch-data.json"
+OFFSETS_FILE = "batch-data.offsets.json"
+OFFSETS_FORMAT = "etrap-offsets-1"
+
+# Approximate in-memory size of one transaction's index entries (hash, spans)
+_ENTRY_BYTES = 512
+
+_WS = re.compile(r'[ \t\n\r]*')
+
+
+def build_offset_index(raw: bytes) -> Dict[str, Any]:
+    """
+    Build the offset index for a serialized batch-data.json.
+
+    Args:
+        raw: Exact bytes of the uncompressed batch data object
+
+    Returns:
+        Offset index dictionary (JSON serializable) with the data size, Merkle
+        root, batch_info, leaf hashes in transaction order and ``[start, end)``
+        byte spans of every transaction's metadata and proof entry
+
+    Raises:
+        ValueError: If the data is not a batch JSON object
+    """
+    # Latin-1 maps every byte to one character, so string offsets are byte
+    # offsets even when the file contains multi-byte UTF-8 text
+    text = raw.decode('latin-1')
+    decoder = json.JSONDecoder()
+    index: Dict[str, Any] = {
+        'format': OFFSETS_FORMAT,
+        'size': len(raw),
+        'root': '',
+        'algorithm': 'sha256',
+        'batch_info': {},
+        'hashes': [],
+        'metadata': [],
+        'proofs': {},
+    }
+
+    def skip(pos: int) -> int:
+        return decoder.raw_decode(text, pos)[1]
+
+    def load(pos: int):
+        end = skip(pos)
+        return json.loads(raw[pos:end]), end
+
+    def visit_metadata(key: str, pos: int) -> int:
+        if key != 'metadata':
+            return skip(pos)
+        metadata, end = load(pos)
+        index['hashes'].append(metadata.get('hash', ''))
+        index['metadata'].append([pos, end])
+        return end
+
+    def visit_transaction(i: int, pos: int) -> int:
+        start = len(index['metadata'])
+        end = _walk_object(text, pos, visit_metadata)
+        if len(index['metadata']) == start:
+            # Transaction without metadata keeps its position
+            index['hashes'].append('')
+            index['metadata'].append([pos, pos])
+        return end
+
+    def visit_proof(key: str, pos: int) -> int:
+        end = skip(pos)
+        index['proofs'][key] = [pos, end]
+        return end
+
+    def visit_merkle_tree(key: str, pos: int) -> int:
+        if key == 'proof_index':
+            return _walk_object(text, pos, visit_proof)
+        if key in ('root', 'algorithm'):
+            index[key], end = load(pos)
+            return end
+        return skip(pos)
+
+    def visit_top(key: str, pos: int) -> int:
+        if key == 'transactions':
+            return _walk_array(text, pos, visit_transaction)
+        if key == 'merkle_tree':
+            return _walk_object(text, pos, visit_merkle_tree)
+        if key == 'batch_info':
+            index['batch_info'], end = load(pos)
+            return end
+        return skip(pos)
+
+    try:
+        _walk_object(text, _WS.match(text).end(), visit_top)
+    except (IndexError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot index batch data: {e}")
+    return index
+
+
+class RangedBatch:
+    """
+    Batch view backed by an offset index and a byte-range reader.
+
+    Hash lookups are answered from the index; metadata and proof entries are
+    fetched on first access through ``read_range(start, end)`` and memoized.
+    Provides the same accessors as the views in ``etrap_sdk.compact``, but is
+    meant for point lookups: iterating over all metadata issues one read per
+    transaction.
+    """
+
+    def __init__(
+        self,
+        index: Dict[str, Any],
+        read_range: Callable[[int, int], bytes],
+        index_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            index: Offset index from build_offset_index()
+            read_range: Function reading ``[start, end)`` of the batch object
+            index_bytes: Serialized size of the index, if known
+        """
+        if index.get('format') != OFFSETS_FORMAT:
+            raise ValueError(f"Unsupported offset index format: {index.get('format')}")
+        self.root = index.get('root', '')
+        self.algorithm = index.get('algorithm', 'sha256')
+        self.batch_info = index.get('batch_info', {})
+        self.size = index.get('size')
+        self._hashes: List[str] = index.get('hashes', [])
+        self._spans: List[List[int]] = index.get('metadata', [])
+        self._proof_spans: Dict[str, List[int]] = index.get('proofs', {})
+        self._read_range = read_range
+        self._positions: Optional[Dict[str, List[int]]] = None
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._proofs: Dict[int, Optional[Dict[str, Any]]] = {}
+        self._index_bytes = index_bytes if index_bytes is not None else _ENTRY_BYTES * len(self._hashes)
+        self._fetched_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the index and the entries fetched so far in bytes."""
+        return self._index_bytes + self._fetched_bytes
+
+    def find(self, tx_hash: str) -> List[int]:
+        """Return positions of all transactions with the given hash."""
+        if self._positions is None:
+            self._positions = {}
+            for position, leaf in enumerate(self._hashes):
+                self._positions.setdefault(leaf, []).append(position)
+        return list(self._positions.get(tx_hash, []))
+
+    def leaf_hash(self, position: int) -> str:
+        """Return the transaction hash at a position."""
+        return self._hashes[position]
+
+    def hashes(self) -> Iterator[str]:
+        """Iterate over transaction hashes in file order."""
+        return iter(self._hashes)
+
+    def metadata(self, position: int) -> Dict[str, Any]:
+        """Fetch the metadata dictionary of a transaction."""
+        if position not in self._metadata:
+            start, end = self._spans[position]
+            self._metadata[position] = self._fetch(start, end) if end > start else {}
+        return self._metadata[position]
+
+    def operation_type(self, position: int) -> Optional[str]:
+        """Return the operation type of a transaction."""
+        return self.metadata(position).get('operation_type')
+
+    def transaction_id(self, position: int) -> Optional[str]:
+        """Return the transaction ID of a transaction."""
+        return self.metadata(position).get('transaction_id')
+
+    def timestamp(self, position: int) -> Optional[int]:
+        """Return the transaction timestamp in milliseconds."""
+        return self.metadata(position).get('timestamp')
+
+    def proof(self, position: int) -> Optional[Dict[str, Any]]:
+        """Fetch the proof index entry for a transaction position."""
+        if position not in self._proofs:
+            span = self._proof_spans.get(f"tx-{position}")
+            self._proofs[position] = self._fetch(*span) if span else None
+        return self._proofs[position]
+
+    def prefetch(self, positions: Iterable[int]) -> None:
+        """
+        Fetch the metadata and proofs of ``positions`` that are not loaded yet.
+
+        The reads block, so async callers run this in an executor before
+        using the accessors, which then answer from memory.
+        """
+        for position in positions:
+            if 0 <= position < len(self._hashes):
+                self.metadata(position)
+                self.proof(position)
+
+    def _fetch(self, start: int, end: int) -> Any:
+        data = self._read_range(start, end)
+        self._fetched_bytes += len(data)
+        return json.loads(data)
+
+
+def offsets_key(data_key: str) -> str:
+    """Return the offset index key stored next to a batch data key."""
+    if data_key.endswith(DATA_FILE):
+        return data_key[:-len(DATA_FILE)] + OFFSETS_FILE
+    return data_key + ".offsets"
+
+
+def _walk_object(text: str, pos: int, visit: Callable[[str, int], int]) -> int:
+    """Walk the members of the object at ``pos``; return the end offset."""
+    if text[pos] != '{':
+        raise ValueError(f"Expected object at offset {pos}")
+    pos = _WS.match(text, pos + 1).end()
+    if text[pos] == '}':
+        return pos + 1
+    while True:
+        if text[pos] != '"':
+            raise ValueError(f"Expected object key at offset {pos}")
+        key, pos = scanstring(text, pos + 1)
+        pos = _WS.match(text, pos).end()
+        if text[pos] != ':':
+            raise ValueError(f"Expected ':' at offset {pos}")
+        pos = visit(key, _WS.match(text, pos + 1).end())
+        pos = _WS.match(text, pos).end()
+        if text[pos] == '}':
+            return pos + 1
+        if text[pos] != ',':
+            raise ValueError(f"Expected ',' or '}}' at offset {pos}")
+        pos = _WS.match(text, pos + 1).end()
+
+
+def _walk_array(text: str, pos: int, visit: Callable[[int, int], int]) -> int:
+    """Walk the items of the array at ``pos``; return the end offset."""
+    if text[pos] != '[':
+        raise ValueError(f"Expected array at offset {pos}")
+    pos = _WS.match(text, pos + 1).end()
+    if text[pos] == ']':
+        return pos + 1
+    i = 0
+    while True:
+        pos = _WS.match(text, visit(i, pos)).end()
+        i += 1
+        if text[pos] == ']':
+            return pos + 1
+        if text[pos] != ',':
+            raise ValueError(f"Expected ',' or ']' at offset {pos}")
+        pos = _WS.match(text, pos + 1).end()
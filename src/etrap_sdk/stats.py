@@ -0,0 +1,136 @@
+"""
+Incrementally maintained contract statistics.
+
+ContractStatsEngine is fed each batch once, as batch sync discovers it, and
+keeps running totals, distinct database and table counts, and rolling
+1h/24h/7d/30d windows. Adding a batch costs O(log n) and reading stats is
+O(1) apart from expiring batches that have left a window, so dashboards can
+poll without re-listing batches from the contract.
+"""
+
+import heapq
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import BatchInfo
+
+WINDOWS: Dict[str, timedelta] = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+
+class StatsSnapshot:
+    """Batch, transaction and distinct name counts over a set of batches."""
+
+    def __init__(self):
+        self.batches = 0
+        self.transactions = 0
+        self.databases: Counter = Counter()
+        self.tables: Counter = Counter()
+
+    def add(self, batch: BatchInfo) -> None:
+        self.batches += 1
+        self.transactions += batch.transaction_count
+        self.databases[batch.database_name] += 1
+        self.tables.update(set(batch.table_names))
+
+    def remove(self, batch: BatchInfo) -> None:
+        self.batches -= 1
+        self.transactions -= batch.transaction_count
+        _decrement(self.databases, [batch.database_name])
+        _decrement(self.tables, set(batch.table_names))
+
+
+def _decrement(counter: Counter, names: Iterable[str]) -> None:
+    """Decrement counts, dropping names that reach zero so len() stays distinct."""
+    for name in names:
+        counter[name] -= 1
+        if counter[name] <= 0:
+            del counter[name]
+
+
+class RollingWindow(StatsSnapshot):
+    """Statistics over batches created within ``span`` of now."""
+
+    def __init__(self, span: timedelta):
+        super().__init__()
+        self.span = span
+        self._heap: List[Tuple[datetime, int, BatchInfo]] = []
+        self._sequence = 0
+
+    def add(self, batch: BatchInfo, now: Optional[datetime] = None) -> None:
+        if batch.timestamp < (now or datetime.now()) - self.span:
+            return  # Already outside the window
+        super().add(batch)
+        self._sequence += 1
+        heapq.heappush(self._heap, (batch.timestamp, self._sequence, batch))
+
+    def expire(self, now: Optional[datetime] = None) -> None:
+        """Drop batches that have left the window."""
+        cutoff = (now or datetime.now()) - self.span
+        while self._heap and self._heap[0][0] < cutoff:
+            _, _, batch = heapq.heappop(self._heap)
+            self.remove(batch)
+
+
+class ContractStatsEngine:
+    """
+    Materialized contract statistics fed by incremental batch sync.
+
+    Example:
+        engine = ContractStatsEngine()
+        engine.add_batches(new_batches)
+        engine.window("24h").transactions
+    """
+
+    def __init__(self):
+        self.totals = StatsSnapshot()
+        self.windows = {period: RollingWindow(span) for period, span in WINDOWS.items()}
+        self.earliest: Optional[datetime] = None
+        self.latest: Optional[datetime] = None
+        self.latest_batch_id: Optional[str] = None
+        self._seen = set()
+
+    def __contains__(self, batch_id: str) -> bool:
+        return batch_id in self._seen
+
+    def add_batches(self, batches: Iterable[BatchInfo], now: Optional[datetime] = None) -> int:
+        """
+        Add batches not seen before.
+
+        Returns:
+            Number of new batches
+        """
+        now = now or datetime.now()
+        added = 0
+        for batch in batches:
+            if batch.batch_id in self._seen:
+                continue
+            self._seen.add(batch.batch_id)
+            self.totals.add(batch)
+            for window in self.windows.values():
+                window.add(batch, now)
+            if self.earliest is None or batch.timestamp < self.earliest:
+                self.earliest = batch.timestamp
+            if self.latest is None or batch.timestamp > self.latest:
+                self.latest = batch.timestamp
+                self.latest_batch_id = batch.batch_id
+            added += 1
+        return added
+
+    def window(self, period: str, now: Optional[datetime] = None) -> StatsSnapshot:
+        """
+        Return statistics for a period.
+
+        Args:
+            period: 1h/24h/7d/30d; anything else returns the running totals
+        """
+        window = self.windows.get(period)
+        if window is None:
+            return self.totals
+        window.expire(now)
+        return window
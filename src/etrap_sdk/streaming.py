@@ -0,0 +1,300 @@
+"""
+Streaming parser for ETRAP batch data files.
+
+A batch-data.json object carries much more than verification needs: the full
+Merkle node list, per-transaction storage details, compliance and signature
+sections. These helpers read the object incrementally and keep only the parts
+the SDK uses, so large batches never exist in memory as a complete object tree.
+
+Incremental parsing uses the optional ``ijson`` package
+(``pip install etrap-sdk[streaming]``). Without it the stream is parsed with
+the standard ``json`` module and then projected to the same shape.
+
+Compressed objects (gzip, or zstd with the optional ``zstandard`` package,
+``pip install etrap-sdk[zstd]``) are decoded on the fly with open_decoded()
+so the parser reads decompressed bytes straight from the network stream.
+"""
+
+import gzip
+import json
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+try:
+    import ijson
+except ImportError:  # Optional dependency
+    ijson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+# Metadata fields needed to locate and verify a transaction
+DEFAULT_METADATA_FIELDS = ("hash", "operation_type", "transaction_id")
+
+# Metadata fields needed to build TransactionRecord objects
+RECORD_METADATA_FIELDS = DEFAULT_METADATA_FIELDS + (
+    "timestamp", "database_name", "table_affected"
+)
+
+_MERKLE_SCALARS = ("algorithm", "root", "height")
+_PROOF_PREFIX = "merkle_tree.proof_index."
+_METADATA_PREFIX = "transactions.item.metadata."
+
+# Containers the parser walks into instead of building or skipping whole
+_DESCEND = {
+    "",
+    "transactions",
+    "transactions.item",
+    "transactions.item.metadata",
+    "merkle_tree",
+    "merkle_tree.proof_index",
+}
+
+_VALUE_EVENTS = {"start_map", "start_array", "null", "boolean", "integer",
+                 "double", "number", "string"}
+
+# Object key suffix for each supported content encoding
+ENCODING_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def available_encodings() -> List[str]:
+    """Return the content encodings that can be decoded, preferred first."""
+    return [
+        encoding for encoding in ENCODING_SUFFIXES
+        if encoding != "zstd" or zstandard is not None
+    ]
+
+
+def encoding_for(key: str, content_encoding: Optional[str] = None) -> Optional[str]:
+    """
+    Determine the content encoding of a stored batch object.
+
+    Args:
+        key: Object key, e.g. ``.../batch-data.json.gz``
+        content_encoding: ``Content-Encoding`` reported by the store, if any
+
+    Returns:
+        "gzip", "zstd" or None for uncompressed data
+    """
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        if key.endswith(suffix):
+            return encoding
+    if content_encoding:
+        value = content_encoding.strip().lower()
+        if value in ("gzip", "x-gzip"):
+            return "gzip"
+        if value in ("zstd", "zst"):
+            return "zstd"
+    return None
+
+
+def open_decoded(stream: IO[bytes], encoding: Optional[str]) -> IO[bytes]:
+    """
+    Wrap a binary stream so that reads return decompressed bytes.
+
+    Args:
+        stream: Binary file-like object, e.g. an S3 response body
+        encoding: "gzip", "zstd" or None
+
+    Returns:
+        File-like object yielding the decoded data
+
+    Raises:
+        ValueError: If the encoding is unknown or its decoder is not installed
+    """
+    if encoding is None:
+        return stream
+    if encoding == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd batch data requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().stream_reader(stream, read_across_frames=True)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def parse_batch_stream(
+    stream: IO[bytes],
+    metadata_fields: Iterable[str] = DEFAULT_METADATA_FIELDS,
+    proof_keys: Optional[Iterable[str]] = None,
+    include_indices: bool = True
+) -> Dict[str, Any]:
+    """
+    Parse a batch-data.json stream, keeping only what verification needs.
+
+    The returned dictionary has the same layout as the original batch JSON
+    but contains only:
+
+    - top-level scalars and ``batch_info``
+    - ``transactions[*].metadata`` restricted to ``metadata_fields``
+    - ``merkle_tree`` algorithm, root, height and ``proof_index`` entries
+      (all of them, or only ``proof_keys`` such as ``"tx-0"``)
+    - ``indices`` when ``include_indices`` is True
+
+    Merkle tree nodes and all other sections are skipped.
+
+    Args:
+        stream: Binary file-like object positioned at the start of the JSON
+        metadata_fields: Transaction metadata fields to keep
+        proof_keys: Proof index keys to keep (None keeps all)
+        include_indices: Keep the batch search indices
+
+    Returns:
+        Reduced batch JSON dictionary
+    """
+    fields = frozenset(metadata_fields)
+    keys = frozenset(proof_keys) if proof_keys is not None else None
+
+    if ijson is None:
+        return project_batch_json(json.load(stream), fields, keys, include_indices)
+
+    return _parse_incremental(stream, fields, keys, include_indices)
+
+
+def project_batch_json(
+    batch_json: Dict[str, Any],
+    metadata_fields: Iterable[str] = DEFAULT_METADATA_FIELDS,
+    proof_keys: Optional[Iterable[str]] = None,
+    include_indices: bool = True
+) -> Dict[str, Any]:
+    """
+    Reduce an already parsed batch JSON to the shape of parse_batch_stream().
+
+    Args:
+        batch_json: Complete batch JSON dictionary
+        metadata_fields: Transaction metadata fields to keep
+        proof_keys: Proof index keys to keep (None keeps all)
+        include_indices: Keep the batch search indices
+
+    Returns:
+        Reduced batch JSON dictionary
+    """
+    fields = frozenset(metadata_fields)
+
+    result = {
+        key: value for key, value in batch_json.items()
+        if not isinstance(value, (dict, list))
+    }
+    if 'batch_info' in batch_json:
+        result['batch_info'] = batch_json['batch_info']
+
+    result['transactions'] = [
+        {'metadata': {
+            field: value for field, value in tx.get('metadata', {}).items()
+            if field in fields
+        }}
+        for tx in batch_json.get('transactions', [])
+    ]
+
+    merkle_tree = batch_json.get('merkle_tree')
+    if merkle_tree is not None:
+        reduced = {key: merkle_tree[key] for key in _MERKLE_SCALARS if key in merkle_tree}
+        proof_index = merkle_tree.get('proof_index', {})
+        if proof_keys is not None:
+            proof_keys = frozenset(proof_keys)
+            proof_index = {k: v for k, v in proof_index.items() if k in proof_keys}
+        reduced['proof_index'] = dict(proof_index)
+        result['merkle_tree'] = reduced
+
+    if include_indices and 'indices' in batch_json:
+        result['indices'] = batch_json['indices']
+
+    return result
+
+
+def _parse_incremental(
+    stream: IO[bytes],
+    fields: frozenset,
+    proof_keys: Optional[frozenset],
+    include_indices: bool
+) -> Dict[str, Any]:
+    """Event-driven parse with ijson (see parse_batch_stream)."""
+    result: Dict[str, Any] = {'transactions': []}
+    transactions = result['transactions']
+
+    builder = None
+    assign = None
+    depth = 0  # Nesting depth inside the value being built or skipped
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if depth:
+            # Inside a value that is being built (builder set) or skipped
+            if builder is not None:
+                builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0 and builder is not None:
+                    assign(builder.value)
+                    builder = None
+            continue
+
+        if event not in _VALUE_EVENTS:
+            continue  # map keys and ends of containers we walked into
+
+        is_container = event in ('start_map', 'start_array')
+
+        if is_container and prefix in _DESCEND:
+            if prefix == 'transactions.item':
+                transactions.append({'metadata': {}})
+            elif prefix == 'merkle_tree':
+                result['merkle_tree'] = {'proof_index': {}}
+            continue
+
+        assign = _target(result, prefix, is_container, fields, proof_keys, include_indices)
+        if assign is None:
+            if is_container:
+                depth = 1  # Skip the whole container
+            continue
+
+        if is_container:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+        else:
+            assign(value)
+
+    return result
+
+
+def _target(
+    result: Dict[str, Any],
+    prefix: str,
+    is_container: bool,
+    fields: frozenset,
+    proof_keys: Optional[frozenset],
+    include_indices: bool
+):
+    """Return a setter for a value at ``prefix``, or None to skip it."""
+    if prefix.startswith(_METADATA_PREFIX):
+        field = prefix[len(_METADATA_PREFIX):]
+        if field in fields:
+            metadata = result['transactions'][-1]['metadata']
+            return lambda value: metadata.__setitem__(field, value)
+        return None
+
+    if prefix.startswith(_PROOF_PREFIX):
+        key = prefix[len(_PROOF_PREFIX):]
+        if proof_keys is None or key in proof_keys:
+            proof_index = result['merkle_tree']['proof_index']
+            return lambda value: proof_index.__setitem__(key, value)
+        return None
+
+    if prefix.startswith('merkle_tree.'):
+        key = prefix[len('merkle_tree.'):]
+        if key in _MERKLE_SCALARS:
+            merkle_tree = result['merkle_tree']
+            return lambda value: merkle_tree.__setitem__(key, value)
+        return None
+
+    if prefix == 'batch_info' or (prefix == 'indices' and include_indices):
+        return lambda value: result.__setitem__(prefix, value)
+
+    if '.' not in prefix and not is_container:
+        # Top-level scalar such as batch_id
+        return lambda value: result.__setitem__(prefix, value)
+
+    return None
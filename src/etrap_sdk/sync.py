@@ -0,0 +1,153 @@
+"""
+Synchronous facade over ETRAPClient.
+
+Calling ``asyncio.run(client.verify_transaction(...))`` per request creates a
+new event loop each time, so connections, in-flight loads and anything bound
+to the loop cannot be reused. ETRAPSyncClient instead owns one event loop on
+a background thread for its whole lifetime and runs every call on it. Any
+number of threads may call the client concurrently; their calls share the
+loop, the cache and the connection pools.
+"""
+
+import asyncio
+import inspect
+import threading
+from typing import Any, Callable, Coroutine, Iterator, Optional
+
+from .client import ETRAPClient
+
+
+class ETRAPSyncClient:
+    """
+    Blocking client that mirrors the ETRAPClient API.
+
+    Coroutine methods block until their result is ready, async iterators
+    (iter_transaction_history, watch_batches) become regular iterators, and
+    other methods and attributes are passed through. Calls from any thread
+    run on the client's event loop thread.
+
+    Example:
+        client = ETRAPSyncClient(organization_id="acme", network="testnet")
+        result = client.verify_transaction(transaction_data)
+        client.close()
+    """
+
+    def __init__(self, *args, call_timeout: Optional[float] = None, **kwargs):
+        """
+        Start the event loop thread and create the underlying ETRAPClient.
+
+        Args:
+            *args: Positional arguments for ETRAPClient
+            call_timeout: Seconds to wait for each call (None waits indefinitely)
+            **kwargs: Keyword arguments for ETRAPClient
+        """
+        self.call_timeout = call_timeout
+        self._closed = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="etrap-sdk-loop", daemon=True)
+        self._thread.start()
+
+        async def create():
+            return ETRAPClient(*args, **kwargs)
+
+        try:
+            self.client: ETRAPClient = self._run(create())
+        except BaseException:
+            self.close()
+            raise
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _run(self, coroutine: Coroutine) -> Any:
+        """Run a coroutine on the loop thread and wait for its result."""
+        if self._closed or threading.current_thread() is self._thread:
+            coroutine.close()
+            if self._closed:
+                raise RuntimeError("ETRAPSyncClient is closed")
+            raise RuntimeError("ETRAPSyncClient cannot be called from its own event loop; use .client instead")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(self.call_timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def _call(self, method: Callable, *args, **kwargs) -> Any:
+        """Call a plain method on the loop thread."""
+        async def call():
+            return method(*args, **kwargs)
+        return self._run(call())
+
+    def _iterate(self, iterator) -> Iterator[Any]:
+        """Drive an async iterator from the calling thread."""
+        async def step():
+            return await iterator.__anext__()
+
+        async def close():
+            await iterator.aclose()
+
+        try:
+            while True:
+                try:
+                    item = self._run(step())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            if not self._closed:
+                self._run(close())
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'client':
+            raise AttributeError(name)  # Not created yet
+        attribute = getattr(self.client, name)
+        if inspect.isasyncgenfunction(attribute):
+            def iterate(*args, **kwargs):
+                return self._iterate(attribute(*args, **kwargs))
+            return iterate
+        if inspect.iscoroutinefunction(attribute):
+            def call(*args, **kwargs):
+                return self._run(attribute(*args, **kwargs))
+            return call
+        if callable(attribute):
+            def call_on_loop(*args, **kwargs):
+                return self._call(attribute, *args, **kwargs)
+            return call_on_loop
+        return attribute
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(dir(self.client)))
+
+    def close(self) -> None:
+        """Cancel outstanding work, stop the loop thread and release resources."""
+        if self._closed:
+            return
+
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            client = self.__dict__.get('client')
+            if client is not None and client._tx_index is not None:
+                client._tx_index.close()
+            await self._loop.shutdown_asyncgens()
+            if hasattr(self._loop, 'shutdown_default_executor'):  # Python 3.9+
+                await self._loop.shutdown_default_executor()
+
+        try:
+            if self._thread.is_alive():
+                asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(self.call_timeout)
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self) -> "ETRAPSyncClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,208 @@
+"""
+Per-verification tracing and metrics export.
+
+Each verify_transaction() call can record a VerificationTrace: how many
+batches were listed and probed, how many RPC calls and S3 requests were made,
+bytes downloaded, and the time spent in RPC, S3 transfer, JSON parsing and
+proof validation. The active trace is held in a context variable, so
+concurrent verifications on the same client record into their own traces.
+
+Traces are attached to results when ``ClientConfig.trace_verifications`` is
+set and are passed to every metrics hook registered with
+``ETRAPClient.add_metrics_hook()``. A hook is any callable taking a
+VerificationTrace; adapters for OpenTelemetry meters and Prometheus
+registries are provided.
+"""
+
+import functools
+import logging
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+from .models import VerificationResult, VerificationTrace
+
+logger = logging.getLogger(__name__)
+
+MetricsHook = Callable[[VerificationTrace], None]
+
+# Timed phases, recorded as VerificationTrace.<phase>_ms
+PHASES = ("rpc", "s3", "parse", "proof")
+
+_current_trace: ContextVar[Optional[VerificationTrace]] = ContextVar("etrap_trace", default=None)
+
+
+def current_trace() -> Optional[VerificationTrace]:
+    """Return the trace being recorded in the current context, if any."""
+    return _current_trace.get()
+
+
+def record(field: str, amount: float = 1) -> None:
+    """Add ``amount`` to a counter of the active trace (no-op without one)."""
+    trace = _current_trace.get()
+    if trace is not None:
+        setattr(trace, field, getattr(trace, field) + amount)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the elapsed time of the block to ``<phase>_ms`` of the active trace."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        field = f"{phase}_ms"
+        setattr(trace, field, getattr(trace, field) + (time.perf_counter() - start) * 1000)
+
+
+@contextmanager
+def tracing(trace: VerificationTrace) -> Iterator[VerificationTrace]:
+    """Record into ``trace`` for the duration of the block."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending sample list (0.0 when empty)."""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(fraction * len(ordered)) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def merge_trace(target: VerificationTrace, source: VerificationTrace) -> None:
+    """Add the counters and timings of ``source`` to ``target``."""
+    for field, value in source:
+        if field != 'verified' and isinstance(value, (int, float)):
+            setattr(target, field, getattr(target, field) + value)
+
+
+def traced(method):
+    """
+    Record a VerificationTrace around a client verification method.
+
+    Tracing is skipped entirely unless ``config.trace_verifications`` is set,
+    a metrics hook is registered, or a caller is collecting into an enclosing
+    trace (which then receives this call's counters as well).
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        parent = _current_trace.get()
+        if parent is None and not (self.config.trace_verifications or self._metrics_hooks):
+            return await method(self, *args, **kwargs)
+
+        trace = VerificationTrace()
+        result = None
+        start = time.perf_counter()
+        try:
+            with tracing(trace):
+                result = await method(self, *args, **kwargs)
+            return result
+        finally:
+            trace.total_ms = (time.perf_counter() - start) * 1000
+            if isinstance(result, VerificationResult):
+                trace.verified = result.verified
+                if self.config.trace_verifications:
+                    result.trace = trace
+            if parent is not None:
+                merge_trace(parent, trace)
+            _emit(self._metrics_hooks, trace)
+
+    return wrapper
+
+
+def _emit(hooks, trace: VerificationTrace) -> None:
+    for hook in hooks:
+        try:
+            hook(trace)
+        except Exception as e:
+            logger.warning(f"Metrics hook {hook!r} failed: {e}")
+
+
+class OpenTelemetryHook:
+    """
+    Export traces through an OpenTelemetry ``Meter``.
+
+    Records ``<prefix>.duration`` and ``<prefix>.phase.duration`` histograms
+    (milliseconds) and counters for batches probed, RPC calls, S3 requests and
+    S3 bytes. Any object with OpenTelemetry's ``create_histogram`` and
+    ``create_counter`` methods works as the meter.
+
+    Example:
+        from opentelemetry import metrics
+        client.add_metrics_hook(OpenTelemetryHook(metrics.get_meter("etrap")))
+    """
+
+    def __init__(self, meter: Any, prefix: str = "etrap.verification"):
+        self._duration = meter.create_histogram(
+            f"{prefix}.duration", unit="ms", description="Transaction verification time")
+        self._phase = meter.create_histogram(
+            f"{prefix}.phase.duration", unit="ms", description="Verification time per phase")
+        self._counters = {
+            field: meter.create_counter(f"{prefix}.{name}", unit=unit, description=description)
+            for field, name, unit, description in (
+                ("batches_probed", "batches.probed", "1", "Batches searched"),
+                ("rpc_calls", "rpc.calls", "1", "NEAR RPC calls"),
+                ("s3_requests", "s3.requests", "1", "S3 requests"),
+                ("s3_bytes", "s3.bytes", "By", "Bytes downloaded from S3"),
+            )
+        }
+
+    def __call__(self, trace: VerificationTrace) -> None:
+        self._duration.record(trace.total_ms, {"verified": bool(trace.verified)})
+        for phase in PHASES:
+            self._phase.record(getattr(trace, f"{phase}_ms"), {"phase": phase})
+        for field, counter in self._counters.items():
+            counter.add(getattr(trace, field))
+
+
+class PrometheusHook:
+    """
+    Export traces to a Prometheus registry (requires ``prometheus_client``).
+
+    Registers ``<namespace>_verification_duration_seconds`` and
+    ``<namespace>_verification_phase_seconds`` histograms and counters for
+    batches probed, RPC calls, S3 requests and S3 bytes.
+
+    Example:
+        client.add_metrics_hook(PrometheusHook())  # default registry
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "etrap"):
+        try:
+            from prometheus_client import Counter, Histogram
+        except ImportError:
+            raise ImportError("PrometheusHook requires the 'prometheus_client' package")
+
+        kwargs = {'registry': registry} if registry is not None else {}
+        self._duration = Histogram(
+            f"{namespace}_verification_duration_seconds", "Transaction verification time",
+            ["verified"], **kwargs)
+        self._phase = Histogram(
+            f"{namespace}_verification_phase_seconds", "Verification time per phase",
+            ["phase"], **kwargs)
+        self._counters = {
+            field: Counter(f"{namespace}_{field}", description, **kwargs)
+            for field, description in (
+                ("batches_probed", "Batches searched"),
+                ("rpc_calls", "NEAR RPC calls"),
+                ("s3_requests", "S3 requests"),
+                ("s3_bytes", "Bytes downloaded from S3"),
+            )
+        }
+
+    def __call__(self, trace: VerificationTrace) -> None:
+        self._duration.labels(verified=str(bool(trace.verified)).lower()).observe(trace.total_ms / 1000)
+        for phase in PHASES:
+            self._phase.labels(phase=phase).observe(getattr(trace, f"{phase}_ms") / 1000)
+        for field, counter in self._counters.items():
+            counter.inc(getattr(trace, field))
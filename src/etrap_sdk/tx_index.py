@@ -0,0 +1,154 @@
+"""
+Persistent transaction hash -> batch location index.
+
+Answering "which batch holds this transaction?" otherwise means downloading
+and scanning recent batches one by one. TransactionIndex keeps a SQLite file
+that maps every leaf hash of an indexed batch to its batch ID, leaf index and
+operation type, so repeated lookups take one index probe plus a proof check.
+
+The index only records where a hash was seen; callers still verify the
+Merkle proof against the on-chain root before trusting an entry. The same
+hash can appear in several batches (identical INSERT and DELETE rows), so
+lookups return every location, newest batch (by creation time) first.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    tx_hash TEXT NOT NULL,
+    batch_id TEXT NOT NULL,
+    leaf_index INTEGER NOT NULL,
+    operation_type TEXT,
+    PRIMARY KEY (tx_hash, batch_id, leaf_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    merkle_root TEXT,
+    transaction_count INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL,
+    created_at INTEGER
+);
+"""
+
+
+class IndexEntry(NamedTuple):
+    """Location of a transaction hash within a batch."""
+    batch_id: str
+    leaf_index: int
+    operation_type: Optional[str]
+
+
+class TransactionIndex:
+    """
+    SQLite-backed map from transaction hash to batch locations.
+
+    Safe to share between threads; writes are serialized by a lock.
+
+    Example:
+        index = TransactionIndex("etrap-index.sqlite")
+        index.add_batch("BATCH-2025-06-14-abc", batch_view)
+        index.lookup(tx_hash)  # [IndexEntry(batch_id=..., leaf_index=3, ...)]
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create an index file.
+
+        Args:
+            path: SQLite database path (":memory:" for a throwaway index)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(batches)")}
+            if 'created_at' not in columns:
+                # Index files written before batch creation times were stored
+                self._conn.execute("ALTER TABLE batches ADD COLUMN created_at INTEGER")
+            self._conn.commit()
+
+    def add_batch(self, batch_id: str, batch_view, created_at: Optional[datetime] = None) -> int:
+        """
+        Index every leaf of a loaded batch.
+
+        Args:
+            batch_id: Batch identifier
+            batch_view: View over the batch data (see etrap_sdk.compact)
+            created_at: Batch creation time, used to order lookups
+
+        Returns:
+            Number of transactions indexed (0 if the batch was already indexed)
+        """
+        if self.has_batch(batch_id):
+            return 0
+        rows = [
+            (batch_view.leaf_hash(position), batch_id, position, batch_view.operation_type(position))
+            for position in range(len(batch_view))
+        ]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO batches "
+                    "(batch_id, merkle_root, transaction_count, indexed_at, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        batch_id, batch_view.root, len(rows), datetime.now().isoformat(),
+                        int(created_at.timestamp() * 1000) if created_at else None
+                    )
+                )
+        return len(rows)
+
+    def lookup(self, tx_hash: str) -> List[IndexEntry]:
+        """
+        Return every indexed location of a transaction hash.
+
+        Locations are ordered by batch creation time, newest first; batches
+        indexed without a creation time come last.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.batch_id, t.leaf_index, t.operation_type FROM transactions t "
+                "LEFT JOIN batches b ON b.batch_id = t.batch_id WHERE t.tx_hash = ? "
+                "ORDER BY b.created_at IS NULL, b.created_at DESC, t.batch_id DESC, t.leaf_index",
+                (tx_hash,)
+            ).fetchall()
+        return [IndexEntry(*row) for row in rows]
+
+    def has_batch(self, batch_id: str) -> bool:
+        """Return True if a batch has been indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM batches WHERE batch_id = ?", (batch_id,)
+            ).fetchone()
+        return row is not None
+
+    def batch_ids(self) -> Set[str]:
+        """Return the IDs of all indexed batches."""
+        with self._lock:
+            rows = self._conn.execute("SELECT batch_id FROM batches").fetchall()
+        return {row[0] for row in rows}
+
+    def remove_batches(self, batch_ids: Iterable[str]) -> None:
+        """Drop batches from the index, e.g. after their data was rewritten."""
+        ids = [(batch_id,) for batch_id in batch_ids]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM transactions WHERE batch_id = ?", ids)
+                self._conn.executemany("DELETE FROM batches WHERE batch_id = ?", ids)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -7,7 +7,7 @@ Common functions used throughout the SDK for data manipulation and validation.
 import hashlib
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 
 
 def normalize_transaction_data(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -177,6 +177,49 @@ def validate_merkle_proof_indexed(leaf_hash: str, proof_path: list, leaf_index:
     return current_hash == root
 
 
+def validate_merkle_proof_set(proofs: Iterable[Tuple[str, list, list, int]], root: str) -> bool:
+    """
+    Validate the Merkle proofs of a whole leaf set against one root.
+
+    Proofs of one tree share their upper nodes. A proof that reaches a node
+    an earlier proof already carried to the root stops there, so a full leaf
+    set costs about one hash per tree node instead of a full path per leaf.
+
+    Args:
+        proofs: (leaf_hash, proof_path, sibling_positions, leaf_index) per leaf;
+            without sibling positions the leaf index gives the sides
+        root: Expected Merkle root
+
+    Returns:
+        True if every proof is valid
+    """
+    known = {}  # (level, index) -> hash of a node on a path to the root
+
+    for leaf_hash, proof_path, sibling_positions, leaf_index in proofs:
+        if sibling_positions:
+            steps = [(sibling, position == 'left') for sibling, position in zip(proof_path, sibling_positions)]
+            index = sum(1 << level for level, (_, is_left) in enumerate(steps) if is_left)
+        else:
+            steps = [(sibling, leaf_index >> level & 1 == 1) for level, sibling in enumerate(proof_path)]
+            index = leaf_index
+
+        current_hash = leaf_hash
+        for level, (sibling_hash, sibling_is_left) in enumerate(steps):
+            node = known.get((level, index >> level))
+            if node is not None:
+                if node != current_hash:
+                    return False
+                break  # The rest of the path is already proven
+            known[(level, index >> level)] = current_hash
+            combined = sibling_hash + current_hash if sibling_is_left else current_hash + sibling_hash
+            current_hash = hashlib.sha256(combined.encode()).hexdigest()
+        else:
+            if current_hash != root:
+                return False
+
+    return True
+
+
 def parse_timestamp(timestamp: Any) -> Optional[datetime]:
     """
     Parse various timestamp formats.
@@ -0,0 +1,70 @@
+"""
+Adaptive polling schedule for batch subscriptions.
+
+The contract has no push notifications, so ETRAPClient.watch_batches() polls
+for new batches. PollSchedule keeps a moving average of the time between
+batch arrivals and polls about twice per expected arrival, bounded by
+``min_interval`` and ``max_interval``. Polls that find nothing back off
+exponentially, so an idle contract is queried rarely.
+"""
+
+from typing import Optional
+
+
+class PollSchedule:
+    """
+    Poll interval that follows the batch arrival rate.
+
+    Example:
+        schedule = PollSchedule(min_interval=1.0, max_interval=60.0)
+        delay = schedule.update(new_batches=2, now=time.monotonic())
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        smoothing: float = 0.3
+    ):
+        """
+        Args:
+            min_interval: Shortest delay between polls in seconds
+            max_interval: Longest delay between polls in seconds
+            backoff: Factor applied to the delay after a poll finds nothing
+            smoothing: Weight of the newest gap in the arrival average
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Poll intervals must satisfy 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.interval = min_interval
+        self.arrival_gap: Optional[float] = None  # Average seconds between batches
+        self._last_arrival: Optional[float] = None
+
+    def update(self, new_batches: int, now: float) -> float:
+        """
+        Record the outcome of a poll.
+
+        Args:
+            new_batches: Batches found by the poll
+            now: Monotonic time of the poll in seconds
+
+        Returns:
+            Seconds to wait before the next poll
+        """
+        if new_batches:
+            if self._last_arrival is not None:
+                gap = (now - self._last_arrival) / new_batches
+                if self.arrival_gap is None:
+                    self.arrival_gap = gap
+                else:
+                    self.arrival_gap += self.smoothing * (gap - self.arrival_gap)
+            self._last_arrival = now
+            target = self.arrival_gap / 2 if self.arrival_gap is not None else self.min_interval
+        else:
+            target = max(self.interval, self.min_interval) * self.backoff
+        self.interval = min(max(target, self.min_interval), self.max_interval)
+        return self.interval
@@ -153,4 +153,90 @@ def mock_near_response():
                 "size_bytes": 50000
             }
         }
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture
+def cdc_batch_json():
+    """Four-transaction batch in the full CDC agent layout with a real Merkle tree."""
+    import hashlib
+
+    batch_id = "BATCH-2025-06-15-871d823f"
+    operations = ["INSERT", "UPDATE", "INSERT", "DELETE"]
+    leaves = [hashlib.sha256(f"row-{i}".encode()).hexdigest() for i in range(4)]
+
+    def parent(left, right):
+        return hashlib.sha256((left + right).encode()).hexdigest()
+
+    level1 = [parent(leaves[0], leaves[1]), parent(leaves[2], leaves[3])]
+    root = parent(level1[0], level1[1])
+
+    nodes = [{"index": i, "hash": h, "level": 0} for i, h in enumerate(leaves)]
+    nodes += [
+        {"index": 4, "hash": level1[0], "level": 1, "left_child": 0, "right_child": 1},
+        {"index": 5, "hash": level1[1], "level": 1, "left_child": 2, "right_child": 3},
+        {"index": 6, "hash": root, "level": 2, "left_child": 4, "right_child": 5},
+    ]
+    proof_index = {}
+    for i in range(4):
+        sibling = leaves[i ^ 1]
+        uncle = level1[1 - i // 2]
+        proof_index[f"tx-{i}"] = {
+            "leaf_index": i,
+            "proof_path": [sibling, uncle],
+            "sibling_positions": [
+                "left" if i % 2 else "right",
+                "left" if i // 2 else "right"
+            ]
+        }
+
+    transactions = []
+    for i, leaf in enumerate(leaves):
+        transactions.append({
+            "metadata": {
+                "transaction_id": f"{batch_id}-{i}",
+                "timestamp": 1749968587245 + i * 1000,
+                "operation_type": operations[i],
+                "database_name": "etrapdb",
+                "table_affected": "financial_transactions",
+                "rows_affected": {"inserted": 1, "updated": 0, "deleted": 0},
+                "hash": leaf,
+                "user_id": "system",
+                "lsn": 24981520 + i
+            },
+            "merkle_leaf": {"index": i, "hash": leaf},
+            "data_location": {
+                "encrypted": False,
+                "storage_path": f"etrapdb/financial_transactions/{batch_id}/transactions/tx-{i}.json"
+            }
+        })
+
+    by_operation: Dict[str, List[str]] = {}
+    by_timestamp: Dict[str, List[str]] = {}
+    for tx in transactions:
+        metadata = tx["metadata"]
+        by_operation.setdefault(metadata["operation_type"], []).append(metadata["transaction_id"])
+        by_timestamp.setdefault(str(metadata["timestamp"]), []).append(metadata["transaction_id"])
+
+    return {
+        "batch_info": {
+            "batch_id": batch_id,
+            "created_at": 1749968651632,
+            "organization_id": "acme",
+            "database_name": "etrapdb"
+        },
+        "transactions": transactions,
+        "merkle_tree": {
+            "algorithm": "sha256",
+            "root": root,
+            "height": 3,
+            "nodes": nodes,
+            "proof_index": proof_index
+        },
+        "indices": {
+            "by_timestamp": by_timestamp,
+            "by_operation": by_operation,
+            "by_date": {"2025-06-15": [tx["metadata"]["transaction_id"] for tx in transactions]}
+        },
+        "compliance": {"rules_applied": ["SOX"]},
+        "verification": {"batch_signature": "00" * 32}
+    }
@@ -0,0 +1,115 @@
+"""
+Tests for ETRAP SDK binary batch files.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from etrap_sdk.batch_file import FILE_SUFFIX, MappedBatch, write_batch_file
+from etrap_sdk.compact import JsonBatch
+
+
+class TestBatchFile:
+    """Test writing and memory-mapping binary batch files."""
+
+    def test_round_trip(self, tmp_path, cdc_batch_json):
+        """Test that the mapped file matches the JSON view."""
+        path = tmp_path / f"batch{FILE_SUFFIX}"
+        size = write_batch_file(cdc_batch_json, path)
+        assert path.stat().st_size == size
+
+        raw = JsonBatch(cdc_batch_json)
+        with MappedBatch(path) as mapped:
+            assert len(mapped) == len(raw)
+            assert mapped.root == raw.root
+            assert mapped.batch_info == raw.batch_info
+            for position in range(len(raw)):
+                tx_hash = raw.leaf_hash(position)
+                assert mapped.find(tx_hash) == [position]
+                assert mapped.metadata(position) == raw.metadata(position)
+                assert mapped.operation_type(position) == raw.operation_type(position)
+                assert mapped.timestamp(position) == raw.timestamp(position)
+                assert mapped.proof(position) == raw.proof(position)
+
+            assert mapped.find("ff" * 32) == []
+            assert mapped.operation_counts() == {"INSERT": 2, "UPDATE": 1, "DELETE": 1}
+
+    def test_levels(self, tmp_path, cdc_batch_json):
+        """Test that Merkle tree levels are stored from the node list."""
+        path = tmp_path / f"batch{FILE_SUFFIX}"
+        write_batch_file(cdc_batch_json, path)
+
+        with MappedBatch(path) as mapped:
+            levels = mapped.levels()
+
+        assert [len(level) for level in levels] == [4, 2, 1]
+        assert levels[-1] == [cdc_batch_json["merkle_tree"]["root"]]
+        assert levels[0] == list(JsonBatch(cdc_batch_json).hashes())
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test that files without the magic header are rejected."""
+        path = tmp_path / "not-a-batch.etrapb"
+        path.write_bytes(b"{}" * 100)
+
+        with pytest.raises(ValueError):
+            MappedBatch(path)
+
+
+class TestClientLocalBatches:
+    """Test client use of local batch files."""
+
+    @pytest.mark.asyncio
+    async def test_get_batch_data_from_local_file(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that a local batch file is used instead of S3."""
+        batch_id = sample_batch_info.batch_id
+        write_batch_file(cdc_batch_json, tmp_path / f"{batch_id}{FILE_SUFFIX}")
+
+        mock_client.s3_client = None
+        mock_client.update_config({"local_batch_dir": str(tmp_path)})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+
+        batch_data = await mock_client.get_batch_data(batch_id)
+
+        assert batch_data.transaction_count == 4
+        assert batch_data.operation_counts.deletes == 1
+        assert batch_data.merkle_tree.root == cdc_batch_json["merkle_tree"]["root"]
+
+        tx_hash = cdc_batch_json["transactions"][1]["metadata"]["hash"]
+        proof = await mock_client.get_merkle_proof(batch_id, tx_hash)
+        assert proof.is_valid
+
+    @pytest.mark.asyncio
+    async def test_local_file_header_skips_contract(self, mock_client, tmp_path, cdc_batch_json):
+        """Test that batch info comes from the file header without an RPC call."""
+        batch_id = cdc_batch_json["batch_info"]["batch_id"]
+        write_batch_file(cdc_batch_json, tmp_path / f"{batch_id}{FILE_SUFFIX}")
+
+        mock_client.s3_client = None
+        mock_client.update_config({"local_batch_dir": str(tmp_path)})
+        mock_client.get_batch = AsyncMock(side_effect=AssertionError("contract queried"))
+
+        batch_data = await mock_client.get_batch_data(batch_id)
+
+        assert batch_data.batch_info.batch_id == batch_id
+        assert batch_data.batch_info.database_name == "etrapdb"
+        assert batch_data.batch_info.merkle_root == cdc_batch_json["merkle_tree"]["root"]
+        assert batch_data.batch_info.transaction_count == 4
+
+    @pytest.mark.asyncio
+    async def test_mapped_file_reused(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that repeated loads reuse the mapped file instead of mapping it again."""
+        batch_id = sample_batch_info.batch_id
+        write_batch_file(cdc_batch_json, tmp_path / f"{batch_id}{FILE_SUFFIX}")
+
+        mock_client.s3_client = None
+        mock_client.update_config({"local_batch_dir": str(tmp_path)})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+
+        await mock_client.get_batch_data(batch_id)
+        mapped = mock_client._cache[f"batch_data_{batch_id}"]
+        generation = mock_client._batch_generations[batch_id]
+        await mock_client.get_batch_data(batch_id)
+
+        assert mock_client._cache[f"batch_data_{batch_id}"] is mapped
+        assert mock_client._batch_generations[batch_id] == generation
@@ -0,0 +1,160 @@
+"""
+Tests for ETRAP SDK offline verification bundles.
+"""
+
+import hashlib
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from etrap_sdk import (
+    S3Location,
+    VerificationBundle,
+    VerificationHints,
+    compute_transaction_hash,
+    verify_offline,
+)
+from etrap_sdk.bundle import BUNDLE_FORMAT
+
+ROWS = [
+    {"id": i, "account_id": f"ACC{i:03d}", "amount": f"{i * 10}.50", "type": "C"}
+    for i in range(4)
+]
+
+
+def _parent(left, right):
+    return hashlib.sha256((left + right).encode()).hexdigest()
+
+
+def _serve_batch(mock_client, sample_batch_info, rows=ROWS, with_sides=True):
+    """Serve one four-leaf batch built from `rows` with a real Merkle tree."""
+    batch_id = sample_batch_info.batch_id
+    leaves = [compute_transaction_hash(row) for row in rows]
+    level1 = [_parent(leaves[0], leaves[1]), _parent(leaves[2], leaves[3])]
+    root = _parent(level1[0], level1[1])
+    proof_index = {}
+    for i in range(4):
+        proof_index[f"tx-{i}"] = {
+            "leaf_index": i,
+            "proof_path": [leaves[i ^ 1], level1[1 - i // 2]],
+            "sibling_positions": [
+                "left" if i % 2 else "right",
+                "left" if i // 2 else "right"
+            ] if with_sides else []
+        }
+    batch_json = {
+        "batch_info": {"batch_id": batch_id},
+        "transactions": [
+            {"metadata": {
+                "transaction_id": f"{batch_id}-{i}",
+                "timestamp": 1749968587245 + i,
+                "operation_type": "DELETE" if i == 3 else "INSERT",
+                "hash": leaf,
+            }}
+            for i, leaf in enumerate(leaves)
+        ],
+        "merkle_tree": {"root": root, "proof_index": proof_index},
+    }
+    info = sample_batch_info.model_copy(update={
+        "transaction_count": 4,
+        "merkle_root": root,
+        "s3_location": S3Location(bucket="test-etrap-bucket", key=f"test_db/{batch_id}/"),
+    })
+    mock_client.get_batch = AsyncMock(return_value=info)
+    mock_client.s3_client = Mock()
+    mock_client.s3_client.get_object.return_value = {
+        'Body': Mock(read=lambda: json.dumps(batch_json).encode())
+    }
+    return info
+
+
+class TestVerificationBundle:
+    """Test bundle storage and offline checks."""
+
+    def test_shared_siblings_stored_once(self, sample_batch_info):
+        """Test that proofs of one batch share the sibling node table."""
+        bundle = VerificationBundle("test.testnet", "testnet")
+        bundle.add(sample_batch_info, "a", 0, "INSERT", ["b", "cd"], ["right", "right"])
+        bundle.add(sample_batch_info, "b", 1, "INSERT", ["a", "cd"], ["left", "right"])
+        bundle.add(sample_batch_info, "b", 1, "INSERT", ["a", "cd"], ["left", "right"])
+
+        batch = bundle.to_dict()["batches"][sample_batch_info.batch_id]
+        assert len(bundle) == 2
+        assert batch["nodes"] == ["b", "cd", "a"]
+        assert [tx["path"] for tx in batch["transactions"]] == [[0, 1], [2, 1]]
+        assert batch["transactions"][1]["sides"] == "lr"
+
+    def test_rejects_unknown_format(self):
+        """Test that bundles of another format are rejected."""
+        with pytest.raises(ValueError):
+            VerificationBundle.from_dict({"format": "other/1", "batches": {}})
+
+    def test_tampered_root_fails(self, mock_client, sample_batch_info):
+        """Test that proofs are checked against the recorded on-chain root."""
+        info = _serve_batch(mock_client, sample_batch_info)
+        bundle = VerificationBundle("test.testnet", "testnet")
+        leaf = compute_transaction_hash(ROWS[0])
+        bundle.add(info.model_copy(update={"merkle_root": "00" * 32}), leaf, 0, "INSERT", ["11" * 32], ["right"])
+
+        result = bundle.verify_hash(leaf)
+
+        assert not result.verified
+        assert "on-chain merkle root" in result.error
+
+
+class TestOfflineVerification:
+    """Test exporting a bundle and verifying against it offline."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("with_sides", [True, False])
+    async def test_export_and_verify(self, mock_client, sample_batch_info, tmp_path, with_sides):
+        """Test that exported transactions verify offline without network calls."""
+        info = _serve_batch(mock_client, sample_batch_info, with_sides=with_sides)
+        path = str(tmp_path / "audit.etrap.json.gz")
+
+        bundle = await mock_client.export_bundle(
+            ROWS[:3], hints=VerificationHints(batch_id=info.batch_id), path=path
+        )
+
+        assert len(bundle) == 3
+        assert bundle.roots() == {info.batch_id: info.merkle_root}
+
+        # Offline: any network access would fail
+        mock_client.get_batch.side_effect = AssertionError("network used")
+        mock_client.s3_client.get_object.side_effect = AssertionError("network used")
+        result = verify_offline(path, ROWS)
+
+        assert [r.verified for r in result.results] == [True, True, True, False]
+        assert result.verified == 3
+        assert result.results[0].batch_id == info.batch_id
+        assert result.results[0].merkle_proof.merkle_root == info.merkle_root
+        assert result.results[0].blockchain_timestamp == info.timestamp
+        assert "not found" in result.results[3].error
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_operation(self, mock_client, sample_batch_info):
+        """Test JSON round trip and expected operation filtering."""
+        info = _serve_batch(mock_client, sample_batch_info)
+
+        bundle = await mock_client.export_bundle(ROWS, hints=VerificationHints(batch_id=info.batch_id))
+        data = json.loads(json.dumps(bundle.to_dict()))
+
+        assert data["format"] == BUNDLE_FORMAT
+        assert data["batches"][info.batch_id]["batch"]["merkle_root"] == info.merkle_root
+        assert verify_offline(data, ROWS).verified == 4
+        assert verify_offline(data, ROWS, expected_operation="DELETE").verified == 1
+
+    @pytest.mark.asyncio
+    async def test_unverified_rows_left_out(self, mock_client, sample_batch_info):
+        """Test that rows that do not verify are not exported."""
+        info = _serve_batch(mock_client, sample_batch_info)
+        stranger = {"id": 99, "account_id": "ACC999"}
+
+        bundle = await mock_client.export_bundle(
+            [ROWS[0], stranger], hints=VerificationHints(batch_id=info.batch_id)
+        )
+
+        assert len(bundle) == 1
+        assert compute_transaction_hash(ROWS[0]) in bundle
+        assert compute_transaction_hash(stranger) not in bundle
@@ -2,6 +2,7 @@
 Tests for ETRAP SDK client functionality.
 """
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
@@ -38,6 +39,21 @@ class TestClientInitialization:
         assert client.s3_client is not None
         assert client.s3_bucket == "test-etrap-bucket"
     
+    def test_init_with_custom_endpoint(self):
+        """Test that endpoint_url and pool size reach the S3 client."""
+        s3_config = S3Config(
+            access_key_id="test",
+            secret_access_key="test",
+            bucket_name="test-etrap-bucket",
+            endpoint_url="http://127.0.0.1:9000",
+            max_pool_connections=64
+        )
+        client = ETRAPClient("test.testnet", s3_config=s3_config)
+
+        assert client.s3_client.meta.endpoint_url == "http://127.0.0.1:9000"
+        assert client.s3_client.meta.config.max_pool_connections == 64
+        assert client.s3_client.meta.config.s3['addressing_style'] == 'path'
+
     def test_init_custom_network(self):
         """Test client initialization with custom network."""
         client = ETRAPClient(
@@ -50,6 +66,33 @@ class TestClientInitialization:
         # Just verify client was created successfully
         assert client.near_account is not None
     
+    def test_lazy_construction(self, mock_s3_config):
+        """Test that the S3 client is built on first use and can be replaced."""
+        client = ETRAPClient("test", s3_config=mock_s3_config)
+
+        assert client._s3_client is None
+        assert client._near_account is None
+        assert client.s3_client is client.s3_client
+
+        client.s3_client = None
+        assert client.s3_client is None
+
+    def test_import_defers_network_libraries(self):
+        """Test that importing the SDK and creating a client skip boto3 and py_near."""
+        import subprocess
+        import sys
+
+        probe = (
+            "import sys, etrap_sdk; "
+            "etrap_sdk.ETRAPClient('test', s3_config=etrap_sdk.S3Config()); "
+            "print([m for m in ('boto3', 'botocore', 'py_near') if m in sys.modules])"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        ).stdout
+
+        assert output.strip() == "[]"
+
     def test_update_config(self, mock_client):
         """Test updating client configuration."""
         mock_client.update_config({
@@ -269,6 +312,34 @@ class TestBatchVerification:
         assert len(result.results) == 3  # Stopped after failure
 
 
+    @pytest.mark.asyncio
+    async def test_verify_batch_summary_statistics(self, mock_client):
+        """Test latency percentiles, throughput and confirmations in the summary."""
+        transactions = [{"id": i, "delay": i / 1000} for i in range(10)]
+
+        async def mock_verify(tx, hints=None):
+            await asyncio.sleep(tx["delay"])
+            return VerificationResult(
+                verified=tx["id"] != 9,
+                transaction_hash=f"hash_{tx['id']}",
+                batch_id=f"BATCH-{tx['id'] % 3}"
+            )
+
+        mock_client.verify_transaction = mock_verify
+
+        result = await mock_client.verify_batch(transactions, parallel=True)
+        summary = result.summary
+
+        assert summary.blockchain_confirmations == 3
+        assert summary.p50_verification_time_ms <= summary.p90_verification_time_ms
+        assert summary.p90_verification_time_ms <= summary.p99_verification_time_ms
+        assert summary.p99_verification_time_ms == summary.max_verification_time_ms
+        assert summary.max_verification_time_ms >= 9
+        assert summary.average_verification_time_ms < summary.max_verification_time_ms
+        assert summary.throughput_tx_per_sec > 0
+        assert summary.cache_hit_ratio is None
+
+
 class TestBatchOperations:
     """Test batch-related operations."""
     
@@ -441,6 +512,102 @@ class TestMerkleProofs:
         assert isinstance(result, bool)
 
 
+class TestAttestedBatches:
+    """Test skipping proof hashing in batches checked against their on-chain root."""
+
+    def _setup(self, mock_client, cdc_batch_json, sample_batch_info, compact=False, on_chain_root=None):
+        from etrap_sdk.compact import CompactBatch
+        batch_id = cdc_batch_json["batch_info"]["batch_id"]
+        root = cdc_batch_json["merkle_tree"]["root"]
+        entry = CompactBatch.from_batch_json(cdc_batch_json) if compact else cdc_batch_json
+        mock_client._cache[f"batch_data_{batch_id}"] = entry
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info.model_copy(
+            update={"batch_id": batch_id, "merkle_root": on_chain_root or root}
+        ))
+        leaves = [tx["metadata"]["hash"] for tx in cdc_batch_json["transactions"]]
+        return batch_id, leaves
+
+    async def _skipped(self, mock_client, batch_id, leaf):
+        from etrap_sdk import VerificationTrace
+        from etrap_sdk.tracing import tracing
+        trace = VerificationTrace()
+        with tracing(trace):
+            proof = await mock_client.get_merkle_proof(batch_id, leaf)
+        return proof, trace.proofs_skipped
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("compact", [False, True])
+    async def test_attested_after_second_lookup(self, mock_client, cdc_batch_json, sample_batch_info, compact):
+        """Test that proofs are still returned but no longer hashed once attested."""
+        batch_id, leaves = self._setup(mock_client, cdc_batch_json, sample_batch_info, compact)
+
+        first, skipped_first = await self._skipped(mock_client, batch_id, leaves[0])
+        mock_client.get_batch.assert_not_called()  # A single lookup stays O(log n)
+        second, skipped_second = await self._skipped(mock_client, batch_id, leaves[1])
+        third, skipped_third = await self._skipped(mock_client, batch_id, leaves[2])
+
+        assert (skipped_first, skipped_second, skipped_third) == (0, 1, 1)
+        assert mock_client.get_batch.await_count == 1
+        assert all(p.is_valid for p in (first, second, third))
+        assert third.proof_path == cdc_batch_json["merkle_tree"]["proof_index"]["tx-2"]["proof_path"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_attestation(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that concurrent lookups run one attestation, outside the event loop thread."""
+        import threading
+
+        from etrap_sdk import client as client_module
+        from etrap_sdk.utils import validate_merkle_proof_set
+        batch_id, leaves = self._setup(mock_client, cdc_batch_json, sample_batch_info)
+        threads = []
+
+        def check(proofs, root):
+            threads.append(threading.current_thread())
+            return validate_merkle_proof_set(proofs, root)
+
+        await mock_client.get_merkle_proof(batch_id, leaves[0])
+        with patch.object(client_module, "validate_merkle_proof_set", side_effect=check):
+            proofs = await asyncio.gather(*(mock_client.get_merkle_proof(batch_id, leaf) for leaf in leaves))
+
+        assert all(p.is_valid for p in proofs)
+        assert len(threads) == 1
+        assert threads[0] is not threading.current_thread()
+        assert mock_client.get_batch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_root_mismatch_not_attested(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a batch whose root differs from the chain keeps validating each proof."""
+        batch_id, leaves = self._setup(mock_client, cdc_batch_json, sample_batch_info, on_chain_root="00" * 32)
+
+        for leaf in leaves:
+            proof, skipped = await self._skipped(mock_client, batch_id, leaf)
+            assert skipped == 0
+            assert proof.is_valid
+
+    @pytest.mark.asyncio
+    async def test_tampered_proof_not_attested(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that one bad proof prevents attestation and is still reported invalid."""
+        cdc_batch_json["merkle_tree"]["proof_index"]["tx-3"]["proof_path"][0] = "ff" * 32
+        batch_id, leaves = self._setup(mock_client, cdc_batch_json, sample_batch_info)
+
+        await mock_client.get_merkle_proof(batch_id, leaves[0])
+        proof, skipped = await self._skipped(mock_client, batch_id, leaves[3])
+
+        assert skipped == 0
+        assert not proof.is_valid
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that attest_batches=False validates every proof."""
+        mock_client.update_config({"attest_batches": False})
+        batch_id, leaves = self._setup(mock_client, cdc_batch_json, sample_batch_info)
+
+        for leaf in leaves:
+            _, skipped = await self._skipped(mock_client, batch_id, leaf)
+            assert skipped == 0
+        mock_client.get_batch.assert_not_called()
+
+
 class TestTransactionSearch:
     """Test transaction search functionality."""
     
@@ -535,25 +702,21 @@ class TestContractOperations:
     @pytest.mark.asyncio
     async def test_get_contract_stats(self, mock_client):
         """Test getting contract statistics."""
-        # Mock list_batches
-        mock_client.list_batches = AsyncMock()
-        mock_client.list_batches.return_value = BatchList(
-            batches=[
-                BatchInfo(
-                    batch_id=f"BATCH-{i}",
-                    database_name="test_db",
-                    table_names=[f"table{i}"],
-                    transaction_count=100,
-                    merkle_root=f"root{i}",
-                    timestamp=datetime.now(),
-                    s3_location=S3Location(bucket="test-bucket", key="test/", region="us-west-2"),
-                    size_bytes=50000
-                )
-                for i in range(3)
-            ],
-            total_count=3,
-            has_more=False
-        )
+        # Mock the recent batches feeding the stats engine
+        mock_client._get_recent_batches = AsyncMock()
+        mock_client._get_recent_batches.return_value = [
+            BatchInfo(
+                batch_id=f"BATCH-{i}",
+                database_name="test_db",
+                table_names=[f"table{i}"],
+                transaction_count=100,
+                merkle_root=f"root{i}",
+                timestamp=datetime.now(),
+                s3_location=S3Location(bucket="test-bucket", key="test/", region="us-west-2"),
+                size_bytes=50000
+            )
+            for i in range(3)
+        ]
         
         stats = await mock_client.get_contract_stats("24h")
         
@@ -584,4 +747,337 @@ class TestUtilityMethods:
         hash2 = mock_client.compute_transaction_hash(data, normalize=True)
         
         assert len(hash1) == 64
-        assert len(hash2) == 64
\ No newline at end of file
+        assert len(hash2) == 64
+
+class TestFastResults:
+    """Test fast-result mode (unvalidated model construction)."""
+
+    @pytest.mark.asyncio
+    async def test_fast_merkle_proof_matches_validated(self, mock_client, sample_batch_data):
+        """Test that fast mode builds the same proof without validation."""
+        mock_client._cache["batch_data_BATCH-123"] = sample_batch_data
+        validated = await mock_client.get_merkle_proof("BATCH-123", "test_tx_hash_123")
+
+        mock_client.update_config({"fast_results": True})
+        fast = await mock_client.get_merkle_proof("BATCH-123", "test_tx_hash_123")
+
+        assert isinstance(fast, MerkleProof)
+        assert fast.model_dump() == validated.model_dump()
+
+    def test_fast_parse_batch_info(self, mock_client, mock_near_response):
+        """Test parsing batch info in fast mode."""
+        mock_client.update_config({"fast_results": True})
+
+        batch = mock_client._parse_batch_info(mock_near_response)
+
+        assert isinstance(batch, BatchInfo)
+        assert batch.batch_id == "BATCH-2025-06-14-test123"
+        assert batch.s3_location.bucket == "test-etrap-bucket"
+        assert BatchInfo.model_validate(batch.model_dump()) == batch
+
+
+class TestCacheRevalidation:
+    """Test ETag revalidation of expired cached batches."""
+
+    def _s3(self, cdc_batch_json, not_modified=True):
+        from botocore.exceptions import ClientError
+
+        s3 = Mock()
+
+        def get_object(Bucket, Key, **conditions):  # noqa: N803
+            if conditions.get('IfNoneMatch') == '"etag-1"' and not_modified:
+                raise ClientError({'Error': {'Code': '304', 'Message': 'Not Modified'}}, 'GetObject')
+            body = Mock()
+            body.read = lambda: json.dumps(cdc_batch_json).encode()
+            return {'Body': body, 'ETag': '"etag-1"'}
+
+        s3.get_object.side_effect = get_object
+        return s3
+
+    @pytest.mark.asyncio
+    async def test_not_modified_reuses_cache(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a 304 response keeps the cached batch."""
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = self._s3(cdc_batch_json)
+
+        await mock_client.get_batch_data(sample_batch_info.batch_id)
+        cached = mock_client._cache[f"batch_data_{sample_batch_info.batch_id}"]
+
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        last_call = mock_client.s3_client.get_object.call_args
+        assert last_call.kwargs['IfNoneMatch'] == '"etag-1"'
+        assert mock_client._cache[f"batch_data_{sample_batch_info.batch_id}"] is cached
+        assert batch_data.transaction_count == 4
+        assert batch_data.operation_counts.deletes == 1
+
+    @pytest.mark.asyncio
+    async def test_not_modified_compact_cache(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a 304 response also reuses a compact cache entry."""
+        mock_client.update_config({"compact_cache": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = self._s3(cdc_batch_json)
+
+        await mock_client.get_batch_data(sample_batch_info.batch_id)
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert batch_data.merkle_tree.root == cdc_batch_json["merkle_tree"]["root"]
+        assert batch_data.operation_counts.updates == 1
+
+    @pytest.mark.asyncio
+    async def test_modified_object_replaces_cache(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a changed object is downloaded and cached again."""
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = self._s3(cdc_batch_json, not_modified=False)
+
+        await mock_client.get_batch_data(sample_batch_info.batch_id)
+        cached = mock_client._cache[f"batch_data_{sample_batch_info.batch_id}"]
+        await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert mock_client._cache[f"batch_data_{sample_batch_info.batch_id}"] is not cached
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_revalidated(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that proof lookups revalidate entries older than cache_ttl."""
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = self._s3(cdc_batch_json)
+        tx_hash = cdc_batch_json["transactions"][2]["metadata"]["hash"]
+        cache_key = f"batch_data_{sample_batch_info.batch_id}"
+
+        assert (await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)).is_valid
+        assert mock_client.s3_client.get_object.call_count == 1
+
+        # Fresh entry: served from cache without S3 requests
+        await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)
+        assert mock_client.s3_client.get_object.call_count == 1
+
+        mock_client._cache_timestamps[cache_key] -= timedelta(seconds=mock_client.config.cache_ttl + 1)
+        assert (await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)).is_valid
+        assert mock_client.s3_client.get_object.call_count == 2
+        assert not mock_client._cache_expired(cache_key)
+
+
+class TestBatchPrefetch:
+    """Test look-ahead downloads during candidate batch searches."""
+
+    def _fake_loads(self, mock_client, found_in):
+        """Replace batch downloads with slow fakes and report started/cancelled loads."""
+        started, cancelled, loaded = [], [], {}
+
+        async def load(batch_id, include_merkle_tree=True):
+            started.append(batch_id)
+            try:
+                await asyncio.sleep(0.02 if batch_id != "BATCH-3" else 1)
+            except asyncio.CancelledError:
+                cancelled.append(batch_id)
+                raise
+            loaded[batch_id] = {"batch_id": batch_id}
+            return loaded[batch_id]
+
+        async def verify_in_batch(tx_hash, batch, *args):
+            view = await mock_client._batch_view(batch.batch_id)
+            await asyncio.sleep(0.01)  # Scanning the batch
+            if view["batch_id"] == found_in:
+                return VerificationResult(verified=True, transaction_hash=tx_hash, batch_id=found_in)
+            return None
+
+        mock_client._load_batch_view = load
+        mock_client._cached_view = loaded.get
+        mock_client._verify_in_batch = verify_in_batch
+        return started, cancelled
+
+    @pytest.mark.asyncio
+    async def test_prefetch_cancelled_after_match(self, mock_client, sample_batch_info):
+        """Test that upcoming batches load ahead and are cancelled once found."""
+        batches = [sample_batch_info.model_copy(update={"batch_id": f"BATCH-{i}"}) for i in range(6)]
+        started, cancelled = self._fake_loads(mock_client, "BATCH-1")
+        mock_client.update_config({"prefetch_batches": 2})
+
+        result = await mock_client._probe_batches("a" * 64, batches)
+        await asyncio.sleep(0.01)  # Let cancelled loads finish
+
+        assert result.batch_id == "BATCH-1"
+        assert sorted(started) == ["BATCH-0", "BATCH-1", "BATCH-2", "BATCH-3"]
+        assert cancelled == ["BATCH-3"]
+        assert mock_client._batch_loads == {}
+
+    @pytest.mark.asyncio
+    async def test_prefetch_kept_for_other_lookups(self, mock_client, sample_batch_info):
+        """Test that a prefetch another lookup is waiting for is not cancelled."""
+        batches = [sample_batch_info.model_copy(update={"batch_id": f"BATCH-{i}"}) for i in range(6)]
+        started, cancelled = self._fake_loads(mock_client, "BATCH-1")
+        mock_client.update_config({"prefetch_batches": 2})
+
+        search = asyncio.ensure_future(mock_client._probe_batches("a" * 64, batches))
+        while "BATCH-3" not in started:
+            await asyncio.sleep(0.005)
+        lookup = asyncio.ensure_future(mock_client._batch_view("BATCH-3"))
+
+        assert (await search).batch_id == "BATCH-1"
+        await asyncio.sleep(0.01)
+        assert cancelled == []
+        assert not lookup.done()
+
+        # The last holder letting go cancels the download
+        lookup.cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled == ["BATCH-3"]
+        assert mock_client._batch_loads == {}
+
+    @pytest.mark.asyncio
+    async def test_no_prefetch_by_default(self, mock_client, sample_batch_info):
+        """Test that batches are loaded one at a time without prefetch_batches."""
+        batches = [sample_batch_info.model_copy(update={"batch_id": f"BATCH-{i}"}) for i in range(4)]
+        started, cancelled = self._fake_loads(mock_client, "BATCH-2")
+
+        result = await mock_client._probe_batches("a" * 64, batches)
+
+        assert result.batch_id == "BATCH-2"
+        assert started == ["BATCH-0", "BATCH-1", "BATCH-2"]
+        assert cancelled == []
+
+    @pytest.mark.asyncio
+    async def test_lookup_survives_cancelled_prefetch(self, mock_client):
+        """Test that a lookup joining a cancelled prefetch loads the batch itself."""
+        started, cancelled = self._fake_loads(mock_client, None)
+
+        prefetch = mock_client._start_batch_load("BATCH-3")
+        lookup = asyncio.ensure_future(mock_client._batch_view("BATCH-3"))
+        await asyncio.sleep(0.01)
+        prefetch.cancel()
+        mock_client._load_batch_view = AsyncMock(return_value={"batch_id": "BATCH-3"})
+
+        assert await lookup == {"batch_id": "BATCH-3"}
+        assert cancelled == ["BATCH-3"]
+
+
+class TestParallelProbes:
+    """Test concurrent candidate batch probing."""
+
+    def _batches(self, sample_batch_info, count):
+        """Candidate batches one hour apart, oldest first."""
+        return [
+            sample_batch_info.model_copy(update={
+                "batch_id": f"BATCH-{i}",
+                "timestamp": sample_batch_info.timestamp + timedelta(hours=i)
+            })
+            for i in range(count)
+        ]
+
+    def _fake_probes(self, mock_client, delays, matches):
+        """Replace batch probes with sleeps; report in-flight peaks and cancellations."""
+        state = {"in_flight": 0, "peak": 0, "cancelled": []}
+
+        async def verify_in_batch(tx_hash, batch, *args):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            try:
+                await asyncio.sleep(delays[batch.batch_id])
+            except asyncio.CancelledError:
+                state["cancelled"].append(batch.batch_id)
+                raise
+            finally:
+                state["in_flight"] -= 1
+            if batch.batch_id in matches:
+                return VerificationResult(verified=True, transaction_hash=tx_hash, batch_id=batch.batch_id)
+            return None
+
+        mock_client._verify_in_batch = verify_in_batch
+        return state
+
+    @pytest.mark.asyncio
+    async def test_most_recent_match_wins(self, mock_client, sample_batch_info):
+        """Test that the newest matching batch is returned even if an older one finishes first."""
+        batches = self._batches(sample_batch_info, 4)
+        delays = {"BATCH-3": 0.05, "BATCH-2": 0.02, "BATCH-1": 0.01, "BATCH-0": 1}
+        state = self._fake_probes(mock_client, delays, {"BATCH-3", "BATCH-1"})
+        mock_client.update_config({"parallel_probes": 4})
+
+        result = await mock_client._probe_batches("a" * 64, batches)
+        await asyncio.sleep(0.01)
+
+        assert result.batch_id == "BATCH-3"
+        assert state["peak"] == 4
+        assert state["cancelled"] == ["BATCH-0"]
+
+    @pytest.mark.asyncio
+    async def test_probe_window_and_no_match(self, mock_client, sample_batch_info):
+        """Test that at most parallel_probes candidates are in flight."""
+        batches = self._batches(sample_batch_info, 6)
+        state = self._fake_probes(mock_client, {b.batch_id: 0.01 for b in batches}, set())
+        mock_client.update_config({"parallel_probes": 2})
+
+        result = await mock_client._probe_batches("a" * 64, batches)
+
+        assert result is None
+        assert state["peak"] == 2
+        assert state["cancelled"] == []
+
+
+class TestRootIndex:
+    """Test the Merkle root shortcut for single-transaction batches."""
+
+    @pytest.mark.asyncio
+    async def test_root_match_skips_search(self, mock_client, mock_near_response):
+        """Test that a hash equal to a known root is verified without listing or S3."""
+        root = "abcd1234567890"
+        mock_client._parse_batch_info(mock_near_response)
+        mock_client._get_recent_batches = AsyncMock(return_value=[])
+        mock_client.s3_client = Mock()
+        mock_client.update_config({"resolve_root_operation": False})
+
+        with patch('etrap_sdk.client.compute_transaction_hash', return_value=root):
+            result = await mock_client.verify_transaction({"id": 1})
+
+        assert result.verified is True
+        assert result.batch_id == "BATCH-2025-06-14-test123"
+        assert result.merkle_proof.merkle_root == root
+        assert result.operation_type is None
+        mock_client._get_recent_batches.assert_not_called()
+        mock_client.s3_client.get_object.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_root_match_checks_expected_operation(self, mock_client, mock_near_response):
+        """Test that batch data is still read when an operation type is expected."""
+        mock_client._parse_batch_info(mock_near_response)
+        mock_client._get_recent_batches = AsyncMock(return_value=[])
+        mock_client.update_config({"resolve_root_operation": False})
+        view = Mock()
+        view.find.return_value = [0]
+        view.operation_type.return_value = "DELETE"
+        mock_client._batch_view = AsyncMock(return_value=view)
+
+        with patch('etrap_sdk.client.compute_transaction_hash', return_value="abcd1234567890"):
+            result = await mock_client.verify_transaction(
+                {"id": 1},
+                hints=VerificationHints(expected_operation="INSERT")
+            )
+
+        assert result.verified is False
+        mock_client._batch_view.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_root_match_respects_hints(self, mock_client, mock_near_response):
+        """Test that a known root outside the hinted database is not used."""
+        mock_client._parse_batch_info(mock_near_response)
+        mock_client._verify_in_batch = AsyncMock()
+        mock_client._get_recent_batches = AsyncMock(return_value=[])
+
+        with patch('etrap_sdk.client.compute_transaction_hash', return_value="abcd1234567890"):
+            result = await mock_client.verify_transaction(
+                {"id": 1},
+                hints=VerificationHints(database_name="other_db")
+            )
+
+        assert result.verified is False
+        mock_client._verify_in_batch.assert_not_called()
+
+    def test_roots_are_bounded(self, mock_client, mock_near_response):
+        """Test that only the BATCH_ROOTS most recently seen roots are kept."""
+        mock_client.BATCH_ROOTS = 2
+        batch = mock_client._parse_batch_info(mock_near_response)
+
+        for n in range(3):
+            mock_client._index_batch_root(batch.model_copy(update={"merkle_root": f"root{n}"}))
+
+        assert list(mock_client._batch_roots) == ["root1", "root2"]
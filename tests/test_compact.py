@@ -0,0 +1,98 @@
+"""
+Tests for ETRAP SDK compact batch representation.
+"""
+
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from etrap_sdk.compact import CompactBatch, JsonBatch, as_batch_view
+
+
+class TestCompactBatch:
+    """Test CompactBatch against the raw JSON view."""
+
+    def test_matches_json_view(self, cdc_batch_json):
+        """Test that every accessor returns the same data as the JSON view."""
+        compact = CompactBatch.from_batch_json(cdc_batch_json)
+        raw = JsonBatch(cdc_batch_json)
+
+        assert len(compact) == len(raw) == 4
+        assert compact.root == raw.root
+        assert list(compact.hashes()) == list(raw.hashes())
+
+        for position in range(len(raw)):
+            tx_hash = raw.leaf_hash(position)
+            assert compact.find(tx_hash) == raw.find(tx_hash) == [position]
+            assert compact.metadata(position) == raw.metadata(position)
+            assert compact.operation_type(position) == raw.operation_type(position)
+            assert compact.transaction_id(position) == raw.transaction_id(position)
+            assert compact.timestamp(position) == raw.timestamp(position)
+            assert compact.proof(position) == raw.proof(position)
+
+    def test_duplicate_hashes(self, cdc_batch_json):
+        """Test that all positions of a repeated hash are found in order."""
+        transactions = cdc_batch_json["transactions"]
+        transactions[3]["metadata"]["hash"] = transactions[1]["metadata"]["hash"]
+
+        compact = CompactBatch.from_batch_json(cdc_batch_json)
+
+        assert compact.find(transactions[1]["metadata"]["hash"]) == [1, 3]
+        assert compact.find("00" * 32) == []
+        assert compact.find("not-a-hash") == []
+
+    def test_smaller_than_json(self, cdc_batch_json):
+        """Test that the columnar data is smaller than the serialized JSON."""
+        compact = CompactBatch.from_batch_json(cdc_batch_json)
+
+        assert compact.nbytes < len(json.dumps(cdc_batch_json)) / 4
+
+    def test_rejects_non_digest_hashes(self, sample_batch_data):
+        """Test that non-hex hashes are rejected."""
+        with pytest.raises(ValueError):
+            CompactBatch.from_batch_json(sample_batch_data)
+
+    def test_as_batch_view(self, sample_batch_data, cdc_batch_json):
+        """Test wrapping of cache entries."""
+        compact = CompactBatch.from_batch_json(cdc_batch_json)
+
+        assert isinstance(as_batch_view(sample_batch_data), JsonBatch)
+        assert as_batch_view(compact) is compact
+
+
+class TestClientCompactCache:
+    """Test client behaviour with compact_cache enabled."""
+
+    @pytest.mark.asyncio
+    async def test_compact_cache_round_trip(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that cached compact batches serve proofs and lookups."""
+        mock_client.update_config({"compact_cache": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+        mock_client.s3_client.get_object.return_value = {
+            'Body': Mock(read=lambda: json.dumps(cdc_batch_json).encode())
+        }
+        batch_id = sample_batch_info.batch_id
+
+        await mock_client.get_batch_data(batch_id)
+
+        assert isinstance(mock_client._cache[f"batch_data_{batch_id}"], CompactBatch)
+        tx_hash = cdc_batch_json["transactions"][2]["metadata"]["hash"]
+        proof = await mock_client.get_merkle_proof(batch_id, tx_hash)
+        assert proof.is_valid
+        assert proof.merkle_root == cdc_batch_json["merkle_tree"]["root"]
+
+    @pytest.mark.asyncio
+    async def test_compact_cache_falls_back_to_json(self, mock_client, sample_batch_data, sample_batch_info):
+        """Test that batches with non-digest hashes stay as raw JSON."""
+        mock_client.update_config({"compact_cache": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+        mock_client.s3_client.get_object.return_value = {
+            'Body': Mock(read=lambda: json.dumps(sample_batch_data).encode())
+        }
+
+        await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert isinstance(mock_client._cache[f"batch_data_{sample_batch_info.batch_id}"], dict)
@@ -0,0 +1,276 @@
+"""
+Tests for ETRAP SDK streaming transaction history.
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from etrap_sdk import ContractError, S3Location, TimeRange, TransactionFilter
+from etrap_sdk.compact import CompactBatch, JsonBatch
+from etrap_sdk.history import (
+    HistoryCursor,
+    HistoryIndex,
+    HistoryMerge,
+    decode_cursor,
+    encode_cursor,
+    record_key,
+    scan_positions,
+)
+
+BASE = datetime(2025, 6, 14, 12, 0, 0)
+
+
+def _ms(moment: datetime) -> int:
+    return int(moment.timestamp() * 1000)
+
+
+def _serve_batches(mock_client, sample_batch_info, count=3, size=5, page=100, oldest_first=False):
+    """
+    Serve `count` batches one hour apart, each with `size` transactions.
+
+    Time range listings return at most `page` batches, the oldest ones first
+    when `oldest_first` is set.
+    """
+    infos = {}
+    objects = {}
+    for n in range(count):
+        batch_id = f"BATCH-{n}"
+        first = BASE + timedelta(hours=n)
+        transactions = [
+            {"metadata": {
+                "transaction_id": f"{batch_id}-{i}",
+                "timestamp": _ms(first + timedelta(minutes=i)),
+                "operation_type": "DELETE" if i % 2 else "INSERT",
+                "database_name": "test_db",
+                "table_affected": "financial_transactions",
+                "hash": f"{n:02d}{i:062d}",
+            }}
+            for i in range(size)
+        ]
+        by_timestamp, by_operation = {}, {}
+        for tx in transactions:
+            metadata = tx["metadata"]
+            by_timestamp.setdefault(str(metadata["timestamp"]), []).append(metadata["transaction_id"])
+            by_operation.setdefault(metadata["operation_type"], []).append(metadata["transaction_id"])
+        infos[batch_id] = sample_batch_info.model_copy(update={
+            "batch_id": batch_id,
+            "timestamp": first + timedelta(minutes=size),
+            "s3_location": S3Location(bucket="test-etrap-bucket", key=f"test_db/{batch_id}/"),
+        })
+        objects[f"test_db/{batch_id}/batch-data.json"] = json.dumps({
+            "batch_info": {"batch_id": batch_id},
+            "transactions": transactions,
+            "merkle_tree": {"root": f"root-{n}"},
+            "indices": {"by_timestamp": by_timestamp, "by_operation": by_operation},
+        }).encode()
+
+    async def get_batches_by_time_range(start, end, database=None, limit=100):
+        batches = [b for b in infos.values() if start <= b.timestamp <= end]
+        batches.sort(key=lambda b: b.timestamp, reverse=not oldest_first)
+        return batches[:min(limit, page)]
+
+    def get_object(Bucket, Key, **kwargs):  # noqa: N803
+        body = Mock()
+        body.read = lambda: objects[Key]
+        return {'Body': body}
+
+    mock_client._get_batches_by_time_range = AsyncMock(side_effect=get_batches_by_time_range)
+    mock_client.get_batch = AsyncMock(side_effect=lambda batch_id: infos.get(batch_id))
+    mock_client.s3_client = Mock()
+    mock_client.s3_client.get_object.side_effect = get_object
+    return infos
+
+
+class TestCursor:
+    """Test history cursor encoding."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to what was encoded."""
+        cursor = HistoryCursor(1750000000000, "BATCH-2025-06-14-abc", 7, 1750000360000)
+
+        text = encode_cursor(cursor)
+
+        assert decode_cursor(text) == cursor
+        assert "=" not in text
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestHistoryMerge:
+    """Test the newest-first k-way merge."""
+
+    def test_waits_for_unloaded_batches(self):
+        """Test that records are held back until no unloaded batch can be newer."""
+        merge = HistoryMerge([300, 200, 100])
+        merge.add(0, [(record_key(t, "B0", i), t) for i, t in enumerate([290, 250, 150])])
+
+        assert [r for r, _ in merge.pop_ready()] == [290, 250]
+
+        merge.add(1, [(record_key(t, "B1", i), t) for i, t in enumerate([190, 120])])
+        merge.add(2, [(record_key(90, "B2", 0), 90)])
+        ready = list(merge.pop_ready())
+
+        assert [r for r, _ in ready] == [190, 150, 120, 90]
+        # Once B0 is exhausted the cursor no longer points at it
+        assert ready[0][1].end_ms == 300
+        assert ready[1][1].end_ms == 200
+
+    def test_incremental_listing(self):
+        """Test that an incomplete merge holds back records older than the last listed batch."""
+        merge = HistoryMerge([300], complete=False)
+        merge.add(0, [(record_key(t, "B0", i), t) for i, t in enumerate([290, 150])])
+
+        # A batch listed later may also have been created at 300
+        assert [r for r, _ in merge.pop_ready()] == []
+
+        merge.extend([200])
+        assert [r for r, _ in merge.pop_ready()] == [290]
+        merge.add(1, [(record_key(190, "B1", 0), 190)])
+        assert [r for r, _ in merge.pop_ready()] == []
+
+        merge.finish()
+        assert [r for r, _ in merge.pop_ready()] == [190, 150]
+
+
+class TestHistoryIndex:
+    """Test index-driven position selection within a batch."""
+
+    def test_time_and_operation_selection(self, cdc_batch_json):
+        """Test bisected time ranges intersected with operation lists."""
+        view = JsonBatch(cdc_batch_json)
+        index = HistoryIndex.from_view(view)
+        first = cdc_batch_json["transactions"][0]["metadata"]["timestamp"]
+
+        assert index.positions() == [0, 1, 2, 3]
+        assert index.positions(["INSERT"]) == [0, 2]
+        assert index.positions(start_ms=first + 1000, end_ms=first + 2000) == [1, 2]
+        assert index.positions(["INSERT", "DELETE"], start_ms=first + 1000) == [2, 3]
+        assert index.positions(["TRUNCATE"]) == []
+
+    def test_matches_column_scan(self, cdc_batch_json):
+        """Test that index selection agrees with a scan over a compact batch."""
+        index = HistoryIndex.from_view(JsonBatch(cdc_batch_json))
+        compact = CompactBatch.from_batch_json(cdc_batch_json)
+        first = cdc_batch_json["transactions"][0]["metadata"]["timestamp"]
+
+        assert HistoryIndex.from_view(compact) is None
+        for ops, start, end in [(None, None, None), (["UPDATE", "DELETE"], first, first + 2500)]:
+            assert index.positions(ops, start, end) == scan_positions(compact, ops, start, end)
+
+    def test_unresolvable_ids(self, cdc_batch_json):
+        """Test that an index naming unknown transactions is not used."""
+        cdc_batch_json["indices"]["by_operation"]["INSERT"].append("tx-unknown")
+
+        assert HistoryIndex.from_view(JsonBatch(cdc_batch_json)) is None
+
+
+class TestIterTransactionHistory:
+    """Test streaming history through the client."""
+
+    @pytest.mark.asyncio
+    async def test_newest_first_across_batches(self, mock_client, sample_batch_info):
+        """Test that records from all batches arrive in descending timestamp order."""
+        _serve_batches(mock_client, sample_batch_info)
+
+        records = [r async for r in mock_client.iter_transaction_history(TransactionFilter())]
+
+        assert len(records) == 15
+        assert records[0].transaction_id == "BATCH-2-4"
+        assert records[-1].transaction_id == "BATCH-0-0"
+        timestamps = [r.timestamp for r in records]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("oldest_first", [False, True])
+    async def test_lists_past_capped_pages(self, mock_client, sample_batch_info, oldest_first):
+        """Test that a window holding more batches than one listing page is read in full."""
+        _serve_batches(mock_client, sample_batch_info, count=7, size=2, page=2, oldest_first=oldest_first)
+
+        records = [r async for r in mock_client.iter_transaction_history(TransactionFilter(), max_batches=2)]
+
+        assert len(records) == 14
+        assert records[0].transaction_id == "BATCH-6-1"
+        assert records[-1].transaction_id == "BATCH-0-0"
+        timestamps = [r.timestamp for r in records]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_capped_page_with_gaps(self, mock_client, sample_batch_info):
+        """Test that a capped page skipping batches between its oldest and newest is not trusted."""
+        infos = [sample_batch_info.model_copy(update={"batch_id": f"BATCH-{n}", "timestamp": BASE + timedelta(hours=n)})
+                 for n in range(9)]
+
+        async def by_time_range(start, end, database=None, limit=100):
+            matching = [b for b in infos if start <= b.timestamp <= end]
+            if len(matching) > limit:
+                matching = matching[::2]  # Any subset may come back
+            return matching[:limit]
+
+        mock_client._get_batches_by_time_range = AsyncMock(side_effect=by_time_range)
+
+        listed = [b.batch_id async for b in mock_client._iter_batches_in_window(BASE, BASE + timedelta(hours=8), page=3)]
+
+        assert listed == [f"BATCH-{n}" for n in range(8, -1, -1)]
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_window(self, mock_client, sample_batch_info):
+        """Test that a millisecond holding more than a page of batches raises instead of listing part of it."""
+        infos = [sample_batch_info.model_copy(update={"batch_id": f"BATCH-{n}", "timestamp": BASE}) for n in range(3)]
+        mock_client._get_batches_by_time_range = AsyncMock(
+            side_effect=lambda start, end, database=None, limit=100: infos[:limit]
+        )
+
+        with pytest.raises(ContractError):
+            async for _ in mock_client._iter_batches_in_window(BASE - timedelta(hours=1), BASE, page=2):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination(self, mock_client, sample_batch_info):
+        """Test that pages continue where the previous one stopped."""
+        _serve_batches(mock_client, sample_batch_info)
+        everything = [r.transaction_id async for r in mock_client.iter_transaction_history(TransactionFilter())]
+
+        pages = []
+        cursor = None
+        while True:
+            history = await mock_client.get_transaction_history(TransactionFilter(), limit=4, cursor=cursor)
+            pages.append([r.transaction_id for r in history.transactions])
+            cursor = history.next_cursor
+            if cursor is None:
+                break
+
+        assert [tx for page in pages for tx in page] == everything
+        assert [len(page) for page in pages] == [4, 4, 4, 3]
+
+    @pytest.mark.asyncio
+    async def test_cursor_skips_returned_batches(self, mock_client, sample_batch_info):
+        """Test that batches fully returned before the cursor are not listed again."""
+        _serve_batches(mock_client, sample_batch_info)
+        history = await mock_client.get_transaction_history(TransactionFilter(), limit=6)
+
+        mock_client._cache.clear()
+        mock_client.s3_client.get_object.reset_mock()
+        await mock_client.get_transaction_history(TransactionFilter(), limit=100, cursor=history.next_cursor)
+
+        keys = [call.kwargs['Key'] for call in mock_client.s3_client.get_object.call_args_list]
+        assert "test_db/BATCH-2/batch-data.json" not in keys
+        assert "test_db/BATCH-1/batch-data.json" in keys
+
+    @pytest.mark.asyncio
+    async def test_filters_transactions_by_time_and_operation(self, mock_client, sample_batch_info):
+        """Test that individual transactions outside the filter are dropped."""
+        _serve_batches(mock_client, sample_batch_info)
+        start = BASE + timedelta(hours=1, minutes=1)
+        end = BASE + timedelta(hours=2, minutes=10)
+
+        records = [r async for r in mock_client.iter_transaction_history(
+            TransactionFilter(time_range=TimeRange(start=start, end=end), operation_types=["INSERT"])
+        )]
+
+        assert [r.transaction_id for r in records] == ["BATCH-2-4", "BATCH-2-2", "BATCH-2-0", "BATCH-1-4", "BATCH-1-2"]
@@ -0,0 +1,204 @@
+"""
+Tests for ETRAP SDK multi-tenant client management.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from etrap_sdk import ClientManager, S3Config, VerificationHints
+from etrap_sdk.cache import SharedCache, approximate_size
+
+
+class TestSharedCache:
+    """Test the memory-budgeted shared cache."""
+
+    def test_tenant_views(self):
+        """Test that tenants see only their own entries."""
+        cache = SharedCache(budget_bytes=10 ** 6)
+        acme, globex = cache.tenant("acme"), cache.tenant("globex")
+
+        acme["batch_data_1"] = {"root": "a"}
+        globex["batch_data_1"] = {"root": "b"}
+
+        assert acme["batch_data_1"] == {"root": "a"}
+        assert globex.get("batch_data_1") == {"root": "b"}
+        assert "batch_data_2" not in acme
+        acme.clear()
+        assert len(acme) == 0
+        assert set(cache.usage()) == {"globex"}
+
+    def test_evicts_largest_tenant_first(self):
+        """Test that a tenant over its share loses its own oldest entries."""
+        entry = {"transactions": ["x" * 1000]}
+        size = approximate_size(entry)
+        cache = SharedCache(budget_bytes=size * 5)
+        acme, bulk = cache.tenant("acme"), cache.tenant("bulk")
+
+        acme["a0"] = dict(entry)
+        acme["a1"] = dict(entry)
+        for n in range(6):
+            bulk[f"b{n}"] = dict(entry)
+
+        assert list(acme) == ["a0", "a1"]
+        assert list(bulk) == ["b3", "b4", "b5"]
+        assert cache.total_bytes <= cache.budget_bytes
+        assert cache.evictions == 3
+
+    def test_oversized_entry_is_kept(self):
+        """Test that an entry larger than the budget is still stored."""
+        cache = SharedCache(budget_bytes=10)
+        tenant = cache.tenant("acme")
+
+        tenant["big"] = {"data": "x" * 100}
+
+        assert "big" in tenant
+
+    def test_attached_entries_follow_parent(self):
+        """Test that attached entries are removed with their parent and skipped without one."""
+        cache = SharedCache(budget_bytes=10 ** 6)
+        tenant = cache.tenant("acme")
+
+        tenant["batch_data_1"] = {"transactions": ["x" * 1000]}
+        tenant.attach("batch_data_1", "batch_attested_1", (1, True))
+        tenant.attach("batch_data_2", "batch_attested_2", (1, True))
+
+        assert "batch_attested_1" in tenant
+        assert "batch_attested_2" not in tenant
+        tenant["batch_data_1"] = {"transactions": []}
+        assert "batch_attested_1" not in tenant
+        tenant.attach("batch_data_1", "batch_attested_1", (2, True))
+        del tenant["batch_data_1"]
+        assert len(tenant) == 0
+        assert cache.total_bytes == 0
+
+    def test_entries_are_not_walked(self):
+        """Test that sizes come from nbytes or the caller, not from walking the entry."""
+        cache = SharedCache(budget_bytes=10 ** 9)
+        tenant = cache.tenant("acme")
+        entry = {"transactions": [{"metadata": {"hash": "x" * 64}} for _ in range(1000)]}
+
+        tenant["walked"] = entry
+        walked = cache.total_bytes
+        tenant.store("sized", entry, 123456)
+
+        assert walked < 1000
+        assert cache.total_bytes == walked + 123456
+
+    @pytest.mark.asyncio
+    async def test_downloaded_batch_charged_by_size(self, cdc_batch_json, sample_batch_info):
+        """Test that a downloaded batch is charged its byte length."""
+        manager = ClientManager(s3_config=S3Config(bucket_name="etrap-bench"))
+        client = manager.client("acme")
+        client.update_config({"compact_cache": False})
+        client.get_batch = AsyncMock(return_value=sample_batch_info)
+        data = json.dumps(cdc_batch_json).encode()
+        client.s3_client = Mock()
+        client.s3_client.get_object.return_value = {'Body': Mock(read=lambda: data)}
+
+        await client.get_batch_data(sample_batch_info.batch_id)
+
+        assert manager.cache_usage()["acme"] == len(data)
+
+    @pytest.mark.asyncio
+    async def test_batch_state_not_charged_twice(self, cdc_batch_json, sample_batch_info):
+        """Test that derived batch state does not hold or re-count the batch."""
+        manager = ClientManager(s3_config=S3Config(bucket_name="etrap-bench"))
+        client = manager.client("acme")
+        client.get_batch = AsyncMock(return_value=sample_batch_info.model_copy(
+            update={"merkle_root": cdc_batch_json["merkle_tree"]["root"]}
+        ))
+        batch_id = cdc_batch_json["batch_info"]["batch_id"]
+        leaves = [tx["metadata"]["hash"] for tx in cdc_batch_json["transactions"]]
+        client._store_batch(batch_id, cdc_batch_json)
+        batch_bytes = manager.cache_usage()["acme"]
+
+        await client.get_merkle_proof(batch_id, leaves[0])
+        await client.get_merkle_proof(batch_id, leaves[1])
+        client._history_index(batch_id, client._cached_view(batch_id))
+
+        assert client._batch_state(batch_id, "attested")[1] is True
+        assert manager.cache_usage()["acme"] < batch_bytes + 2048
+        del client._cache[f"batch_data_{batch_id}"]
+        assert manager.cache_usage() == {}
+
+
+class TestClientManager:
+    """Test per-organization clients."""
+
+    def test_clients_share_resources(self):
+        """Test that organizations get their own client over shared pools."""
+        manager = ClientManager(s3_config=S3Config(access_key_id="k", secret_access_key="s"))
+        acme, globex = manager.client("acme"), manager["globex"]
+
+        assert manager.client("acme") is acme
+        assert acme.contract_id == "acme.testnet"
+        assert acme.s3_bucket == "etrap-acme"
+        assert globex.s3_bucket == "etrap-globex"
+        assert acme.s3_client is globex.s3_client
+        assert acme.near_account is globex.near_account
+        assert acme._cache.shared is globex._cache.shared
+        assert manager.organizations() == ["acme", "globex"]
+
+    @pytest.mark.asyncio
+    async def test_per_tenant_io_limit(self):
+        """Test that one organization cannot exceed its concurrent I/O slots."""
+        manager = ClientManager(max_concurrent_per_tenant=2)
+        busy = manager.client("bulk")
+        other = manager.client("acme")
+        active = {"bulk": 0, "peak": 0}
+        release = asyncio.Event()
+
+        async def blocked(client):
+            async def call():
+                active["bulk"] += 1
+                active["peak"] = max(active["peak"], active["bulk"])
+                await release.wait()
+                active["bulk"] -= 1
+            async with client._io_limiter:
+                await call()
+
+        tasks = [asyncio.ensure_future(blocked(busy)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+
+        # Another organization still gets through while bulk is saturated
+        assert await asyncio.wait_for(other._run_blocking(lambda: "ok"), 1) == "ok"
+        assert active["peak"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_verify_through_manager(self, cdc_batch_json, sample_batch_info):
+        """Test that verification caches batches in the shared cache."""
+        manager = ClientManager(s3_config=S3Config())
+        client = manager.client("acme")
+        client.get_batch = AsyncMock(return_value=sample_batch_info)
+        client.s3_client = Mock()
+
+        def get_object(Bucket, Key, **kwargs):  # noqa: N803
+            body = Mock()
+            body.read = lambda: json.dumps(cdc_batch_json).encode()
+            return {'Body': body}
+
+        client.s3_client.get_object.side_effect = get_object
+        tx_hash = cdc_batch_json["transactions"][1]["metadata"]["hash"]
+
+        with patch("etrap_sdk.client.compute_transaction_hash", return_value=tx_hash):
+            result = await client.verify_transaction(
+                {"id": 1}, hints=VerificationHints(batch_id=sample_batch_info.batch_id)
+            )
+
+        assert result.verified
+        assert manager.cache_usage()["acme"] > 0
+
+    def test_index_path_per_tenant(self, tmp_path):
+        """Test that each organization gets its own transaction index file."""
+        with pytest.raises(ValueError):
+            ClientManager(config={"transaction_index_path": str(tmp_path / "index.sqlite")})
+
+        manager = ClientManager(config={"transaction_index_path": str(tmp_path / "{organization_id}.sqlite")})
+
+        assert manager.client("acme").config.transaction_index_path == str(tmp_path / "acme.sqlite")
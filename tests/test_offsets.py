@@ -0,0 +1,234 @@
+"""
+Tests for ETRAP SDK offset index and ranged batch reads.
+"""
+
+import json
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from etrap_sdk.compact import JsonBatch
+from etrap_sdk.offsets import (
+    OFFSETS_FORMAT,
+    RangedBatch,
+    build_offset_index,
+    offsets_key,
+)
+
+
+class FakeS3:
+    """Minimal S3 get_object with Range support and a request log."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.requests = []
+        self.threads = []
+
+    def get_object(self, Bucket, Key, Range=None):  # noqa: N803
+        self.requests.append((Key, Range))
+        self.threads.append(threading.current_thread())
+        if Key not in self.objects:
+            raise Exception("An error occurred (NoSuchKey)")
+        data = self.objects[Key]
+        if Range:
+            start, end = Range[len("bytes="):].split("-")
+            data = data[int(start):int(end) + 1]
+        body = Mock()
+        body.read = lambda: data
+        return {'Body': body, 'ContentLength': len(data)}
+
+
+def _raw(batch_json, **kwargs):
+    return json.dumps(batch_json, **kwargs).encode()
+
+
+class TestBuildOffsetIndex:
+    """Test offset index construction."""
+
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_spans_match_objects(self, cdc_batch_json, indent):
+        """Test that spans decode to the original metadata and proofs."""
+        raw = _raw(cdc_batch_json, indent=indent)
+        index = build_offset_index(raw)
+
+        assert index["format"] == OFFSETS_FORMAT
+        assert index["size"] == len(raw)
+        assert index["root"] == cdc_batch_json["merkle_tree"]["root"]
+        for i, tx in enumerate(cdc_batch_json["transactions"]):
+            start, end = index["metadata"][i]
+            assert json.loads(raw[start:end]) == tx["metadata"]
+            assert index["hashes"][i] == tx["metadata"]["hash"]
+            start, end = index["proofs"][f"tx-{i}"]
+            assert json.loads(raw[start:end]) == cdc_batch_json["merkle_tree"]["proof_index"][f"tx-{i}"]
+
+    def test_non_ascii_content(self, cdc_batch_json):
+        """Test that offsets are byte offsets with multi-byte UTF-8 text."""
+        cdc_batch_json["batch_info"]["database_name"] = "données"
+        cdc_batch_json["transactions"][0]["metadata"]["user_id"] = "zoë"
+        raw = json.dumps(cdc_batch_json, ensure_ascii=False).encode()
+        index = build_offset_index(raw)
+
+        assert index["batch_info"]["database_name"] == "données"
+        start, end = index["metadata"][1]
+        assert json.loads(raw[start:end]) == cdc_batch_json["transactions"][1]["metadata"]
+
+    def test_invalid_data(self):
+        """Test that non-batch data is rejected."""
+        with pytest.raises(ValueError):
+            build_offset_index(b"[1, 2, 3]")
+        with pytest.raises(ValueError):
+            build_offset_index(b'{"transactions": [')
+
+    def test_offsets_key(self):
+        """Test the sidecar key next to the data object."""
+        assert offsets_key("db/t/batch-1/batch-data.json") == "db/t/batch-1/batch-data.offsets.json"
+
+
+class TestRangedBatch:
+    """Test the ranged batch view."""
+
+    def test_matches_json_view(self, cdc_batch_json):
+        """Test that ranged reads return the same data as the JSON view."""
+        raw = _raw(cdc_batch_json)
+        reads = []
+
+        def read_range(start, end):
+            reads.append((start, end))
+            return raw[start:end]
+
+        ranged = RangedBatch(build_offset_index(raw), read_range)
+        view = JsonBatch(cdc_batch_json)
+
+        assert len(ranged) == len(view)
+        assert ranged.root == view.root
+        tx_hash = view.leaf_hash(2)
+        assert ranged.find(tx_hash) == [2]
+        assert not reads
+
+        assert ranged.proof(2) == view.proof(2)
+        assert ranged.operation_type(2) == view.operation_type(2)
+        assert ranged.transaction_id(2) == view.transaction_id(2)
+        assert len(reads) == 2
+        assert all(end - start < 1024 for start, end in reads)
+
+    def test_rejects_unknown_format(self):
+        """Test that an unknown index format is rejected."""
+        with pytest.raises(ValueError):
+            RangedBatch({"format": "other"}, lambda start, end: b"")
+
+
+class TestClientRangeRequests:
+    """Test get_merkle_proof and verification with range_requests enabled."""
+
+    def _setup(self, mock_client, sample_batch_info, objects):
+        mock_client.update_config({"range_requests": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = FakeS3(objects)
+        return f"{sample_batch_info.s3_location.key}batch-data.json"
+
+    @pytest.mark.asyncio
+    async def test_uses_sidecar_index(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a CDC-written index turns a proof lookup into range reads."""
+        raw = _raw(cdc_batch_json, indent=2)
+        data_key = f"{sample_batch_info.s3_location.key}batch-data.json"
+        objects = {
+            data_key: raw,
+            offsets_key(data_key): json.dumps(build_offset_index(raw)).encode(),
+        }
+        self._setup(mock_client, sample_batch_info, objects)
+        tx_hash = cdc_batch_json["transactions"][1]["metadata"]["hash"]
+
+        proof = await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)
+
+        assert proof.is_valid
+        data_requests = [r for k, r in mock_client.s3_client.requests if k == data_key]
+        assert data_requests and all(r is not None for r in data_requests)
+        assert f"batch_data_{sample_batch_info.batch_id}" not in mock_client._cache
+
+    @pytest.mark.asyncio
+    async def test_ranged_reads_leave_event_loop(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that index and range reads run in the executor, not on the loop thread."""
+        raw = _raw(cdc_batch_json)
+        data_key = f"{sample_batch_info.s3_location.key}batch-data.json"
+        objects = {
+            data_key: raw,
+            offsets_key(data_key): json.dumps(build_offset_index(raw)).encode(),
+        }
+        self._setup(mock_client, sample_batch_info, objects)
+        sample_batch_info.merkle_root = cdc_batch_json["merkle_tree"]["root"]
+        tx_hash = cdc_batch_json["transactions"][2]["metadata"]["hash"]
+
+        result = await mock_client._verify_in_batch(tx_hash, sample_batch_info)
+
+        assert result.verified
+        assert any(r is not None for _, r in mock_client.s3_client.requests)
+        assert threading.current_thread() not in mock_client.s3_client.threads
+
+    @pytest.mark.asyncio
+    async def test_fetched_entries_charged(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a ranged batch's size grows with the entries it has fetched."""
+        from etrap_sdk.cache import SharedCache
+        raw = _raw(cdc_batch_json)
+        data_key = f"{sample_batch_info.s3_location.key}batch-data.json"
+        index = json.dumps(build_offset_index(raw)).encode()
+        self._setup(mock_client, sample_batch_info, {data_key: raw, offsets_key(data_key): index})
+        shared = SharedCache(budget_bytes=10 ** 6)
+        mock_client._cache = shared.tenant("acme")
+        tx_hash = cdc_batch_json["transactions"][1]["metadata"]["hash"]
+
+        assert (await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)).is_valid
+
+        fetched = sum(int(end) + 1 - int(start) for _, r in mock_client.s3_client.requests if r
+                      for start, end in [r[len("bytes="):].split("-")])
+        assert fetched > 0
+        assert shared.total_bytes == len(index) + fetched
+
+    @pytest.mark.asyncio
+    async def test_verify_in_batch_ranged(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test transaction verification through ranged reads."""
+        raw = _raw(cdc_batch_json)
+        data_key = f"{sample_batch_info.s3_location.key}batch-data.json"
+        objects = {
+            data_key: raw,
+            offsets_key(data_key): json.dumps(build_offset_index(raw)).encode(),
+        }
+        self._setup(mock_client, sample_batch_info, objects)
+        sample_batch_info.merkle_root = cdc_batch_json["merkle_tree"]["root"]
+        tx_hash = cdc_batch_json["transactions"][3]["metadata"]["hash"]
+
+        result = await mock_client._verify_in_batch(tx_hash, sample_batch_info, expected_operation="DELETE")
+
+        assert result.verified
+        assert result.operation_type == "DELETE"
+
+    @pytest.mark.asyncio
+    async def test_builds_index_on_full_read(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a full read without sidecar leaves an index in the cache."""
+        raw = _raw(cdc_batch_json)
+        data_key = self._setup(mock_client, sample_batch_info, {})
+        mock_client.s3_client.objects[data_key] = raw
+        tx_hash = cdc_batch_json["transactions"][0]["metadata"]["hash"]
+
+        assert (await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)).is_valid
+
+        # Drop the full batch; the next lookup is served by range reads
+        del mock_client._cache[f"batch_data_{sample_batch_info.batch_id}"]
+        mock_client.s3_client.requests.clear()
+
+        assert (await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)).is_valid
+        assert all(r is not None for _, r in mock_client.s3_client.requests)
+
+    @pytest.mark.asyncio
+    async def test_cached_batch_not_reindexed(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that downloading an already cached and indexed batch skips the index build."""
+        raw = _raw(cdc_batch_json)
+        data_key = self._setup(mock_client, sample_batch_info, {})
+        mock_client.s3_client.objects[data_key] = raw
+
+        with patch("etrap_sdk.client.build_offset_index", wraps=build_offset_index) as build:
+            await mock_client.get_batch_data(sample_batch_info.batch_id)
+            await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert build.call_count == 1
+        assert isinstance(mock_client._cache[f"batch_ranges_{sample_batch_info.batch_id}"], RangedBatch)
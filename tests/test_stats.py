@@ -0,0 +1,117 @@
+"""
+Tests for ETRAP SDK incrementally maintained contract statistics.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from etrap_sdk import BatchInfo, S3Location
+from etrap_sdk.stats import ContractStatsEngine
+
+NOW = datetime(2025, 6, 15, 12, 0, 0)
+
+
+def _batch(n, age, database="db", tables=("orders",), count=10):
+    return BatchInfo(
+        batch_id=f"BATCH-{n}",
+        database_name=database,
+        table_names=list(tables),
+        transaction_count=count,
+        merkle_root=f"root{n}",
+        timestamp=NOW - age,
+        s3_location=S3Location(bucket="test-bucket", key="test/", region="us-west-2"),
+        size_bytes=1000
+    )
+
+
+class TestContractStatsEngine:
+    """Test running totals and rolling windows."""
+
+    def test_totals_and_windows(self):
+        """Test that each window counts only batches within its span."""
+        engine = ContractStatsEngine()
+        engine.add_batches([
+            _batch(0, timedelta(minutes=10), tables=("orders", "users")),
+            _batch(1, timedelta(hours=5), database="db2", tables=("users",)),
+            _batch(2, timedelta(days=3)),
+            _batch(3, timedelta(days=60), count=5),
+        ], now=NOW)
+
+        assert engine.totals.batches == 4
+        assert engine.totals.transactions == 35
+        assert engine.window("1h", NOW).batches == 1
+        assert engine.window("24h", NOW).transactions == 20
+        assert len(engine.window("24h", NOW).databases) == 2
+        assert engine.window("7d", NOW).batches == 3
+        assert engine.window("30d", NOW).batches == 3
+        assert engine.window("all", NOW).batches == 4
+        assert engine.earliest == NOW - timedelta(days=60)
+        assert engine.latest_batch_id == "BATCH-0"
+
+    def test_expiry_and_duplicates(self):
+        """Test that batches leave windows as time passes and are counted once."""
+        engine = ContractStatsEngine()
+        batches = [_batch(0, timedelta(minutes=50), tables=("orders", "users")), _batch(1, timedelta(minutes=5))]
+
+        assert engine.add_batches(batches, now=NOW) == 2
+        assert engine.add_batches(batches, now=NOW) == 0
+
+        later = NOW + timedelta(minutes=30)
+        window = engine.window("1h", later)
+        assert window.batches == 1
+        assert set(window.tables) == {"orders"}
+        assert engine.totals.batches == 2
+
+
+class TestClientStats:
+    """Test contract statistics through the client."""
+
+    @pytest.mark.asyncio
+    async def test_reads_within_refresh_interval(self, mock_client):
+        """Test that repeated reads do not query the contract again."""
+        mock_client._get_recent_batches = AsyncMock(return_value=[_batch(0, timedelta(0))])
+        mock_client.update_config({"stats_refresh_interval": 60})
+
+        await mock_client.get_contract_info()
+        stats = await mock_client.get_contract_stats("all")
+
+        assert stats.batches_created == 1
+        assert mock_client._get_recent_batches.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync(self, mock_client):
+        """Test that later syncs read a small page and add only new batches."""
+        history = [_batch(n, timedelta(minutes=100 - n)) for n in range(100)]
+        recent = AsyncMock(side_effect=lambda limit: list(reversed(history))[:limit])
+        mock_client._get_recent_batches = recent
+
+        assert await mock_client.sync_contract_stats() == 100
+        history.append(_batch(100, timedelta(0)))
+        assert await mock_client.sync_contract_stats() == 1
+
+        assert recent.call_args.args == (mock_client.SYNC_PAGE,)
+        info = await mock_client.get_contract_info()
+        assert info.total_batches == 101
+
+    @pytest.mark.asyncio
+    async def test_sync_catches_up_past_max_batches(self, mock_client):
+        """Test that a later sync adds every new batch, even more than SYNC_MAX_BATCHES."""
+        history = [_batch(n, timedelta(minutes=5000 - n)) for n in range(10)]
+        page = mock_client.CONTRACT_PAGE
+        mock_client._get_recent_batches = AsyncMock(
+            side_effect=lambda limit: list(reversed(history))[:min(limit, page)]
+        )
+
+        async def by_time_range(start, end, database=None, limit=100):
+            return [b for b in reversed(history) if start <= b.timestamp <= end][:min(limit, page)]
+
+        mock_client._get_batches_by_time_range = AsyncMock(side_effect=by_time_range)
+
+        assert await mock_client.sync_contract_stats() == 10
+        history.extend(_batch(n, timedelta(minutes=5000 - n)) for n in range(10, 10 + mock_client.SYNC_MAX_BATCHES + 500))
+        assert await mock_client.sync_contract_stats() == mock_client.SYNC_MAX_BATCHES + 500
+
+        info = await mock_client.get_contract_info()
+        assert info.total_batches == len(history)
@@ -0,0 +1,249 @@
+"""
+Tests for ETRAP SDK streaming batch parser.
+"""
+
+import gzip
+import io
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from etrap_sdk import S3AccessError, S3Location, streaming
+from etrap_sdk.streaming import (
+    DEFAULT_METADATA_FIELDS,
+    encoding_for,
+    open_decoded,
+    parse_batch_stream,
+    project_batch_json,
+)
+
+
+def _stream(batch_json):
+    return io.BytesIO(json.dumps(batch_json).encode())
+
+
+@pytest.fixture(params=["ijson", "json"])
+def parser_backend(request, monkeypatch):
+    """Run each test with the incremental parser and the json fallback."""
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(streaming, "ijson", None)
+    return request.param
+
+
+class TestParseBatchStream:
+    """Test reduced parsing of batch-data.json."""
+
+    def test_keeps_only_verification_fields(self, parser_backend, cdc_batch_json):
+        """Test that only metadata, root, proofs and indices survive."""
+        result = parse_batch_stream(_stream(cdc_batch_json))
+
+        assert len(result["transactions"]) == 4
+        for tx, original in zip(result["transactions"], cdc_batch_json["transactions"]):
+            assert set(tx) == {"metadata"}
+            assert set(tx["metadata"]) == set(DEFAULT_METADATA_FIELDS)
+            assert tx["metadata"]["hash"] == original["metadata"]["hash"]
+
+        merkle_tree = result["merkle_tree"]
+        assert merkle_tree["root"] == cdc_batch_json["merkle_tree"]["root"]
+        assert "nodes" not in merkle_tree
+        assert merkle_tree["proof_index"] == cdc_batch_json["merkle_tree"]["proof_index"]
+
+        assert result["indices"] == cdc_batch_json["indices"]
+        assert result["batch_info"] == cdc_batch_json["batch_info"]
+        assert "compliance" not in result
+        assert "verification" not in result
+
+    def test_selected_proof_keys(self, parser_backend, cdc_batch_json):
+        """Test keeping only requested proof entries."""
+        result = parse_batch_stream(
+            _stream(cdc_batch_json),
+            proof_keys=["tx-2"],
+            include_indices=False
+        )
+
+        assert list(result["merkle_tree"]["proof_index"]) == ["tx-2"]
+        assert "indices" not in result
+
+    def test_backends_agree(self, parser_backend, sample_batch_data):
+        """Test that incremental and fallback parsing give the same result."""
+        fields = ("hash", "operation_type", "transaction_id", "timestamp")
+
+        parsed = parse_batch_stream(_stream(sample_batch_data), metadata_fields=fields)
+        projected = project_batch_json(sample_batch_data, metadata_fields=fields)
+
+        assert parsed == projected
+        assert parsed["batch_id"] == sample_batch_data["batch_id"]
+
+
+class TestClientStreamingParse:
+    """Test get_batch_data with streaming_parse enabled."""
+
+    @pytest.mark.asyncio
+    async def test_get_batch_data_streaming(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that the cached batch is reduced and proofs still work."""
+        mock_client.update_config({"streaming_parse": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+        mock_client.s3_client.get_object.return_value = {'Body': _stream(cdc_batch_json)}
+
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert batch_data.transaction_count == 4
+        assert batch_data.merkle_tree.nodes == []
+        assert batch_data.operation_counts.updates == 1
+
+        tx_hash = cdc_batch_json["transactions"][3]["metadata"]["hash"]
+        proof = await mock_client.get_merkle_proof(sample_batch_info.batch_id, tx_hash)
+        assert proof.is_valid
+
+
+
+class TestCompressedTransfer:
+    """Test decoding of compressed batch data objects."""
+
+    def test_encoding_for(self):
+        """Test encoding detection from key suffix and Content-Encoding."""
+        assert encoding_for("a/batch-data.json.gz") == "gzip"
+        assert encoding_for("a/batch-data.json.zst") == "zstd"
+        assert encoding_for("a/batch-data.json") is None
+        assert encoding_for("a/batch-data.json", "gzip") == "gzip"
+        assert encoding_for("a/batch-data.json", "identity") is None
+
+    def test_open_decoded_gzip(self, parser_backend, cdc_batch_json):
+        """Test that gzip data is parsed directly from the decoded stream."""
+        data = gzip.compress(json.dumps(cdc_batch_json).encode())
+        result = parse_batch_stream(open_decoded(io.BytesIO(data), "gzip"))
+
+        assert result["merkle_tree"]["root"] == cdc_batch_json["merkle_tree"]["root"]
+        assert len(result["transactions"]) == 4
+
+    def test_open_decoded_zstd(self, cdc_batch_json):
+        """Test zstd decoding when zstandard is installed."""
+        zstandard = pytest.importorskip("zstandard")
+        data = zstandard.ZstdCompressor().compress(json.dumps(cdc_batch_json).encode())
+
+        decoded = json.loads(open_decoded(io.BytesIO(data), "zstd").read())
+        assert decoded == cdc_batch_json
+
+    def test_open_decoded_zstd_missing(self, monkeypatch):
+        """Test a clear error when zstd data cannot be decoded."""
+        monkeypatch.setattr(streaming, "zstandard", None)
+        with pytest.raises(ValueError):
+            open_decoded(io.BytesIO(b""), "zstd")
+
+    @pytest.mark.asyncio
+    async def test_prefers_compressed_key(self, mock_client, cdc_batch_json, sample_batch_info, monkeypatch):
+        """Test that compressed variants are tried before the plain key."""
+        monkeypatch.setattr(streaming, "zstandard", None)
+        mock_client.update_config({"compressed_transfer": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+        data = gzip.compress(json.dumps(cdc_batch_json).encode())
+        mock_client.s3_client.get_object.return_value = {'Body': io.BytesIO(data)}
+
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert batch_data.transaction_count == 4
+        key = mock_client.s3_client.get_object.call_args.kwargs['Key']
+        assert key.endswith("batch-data.json.gz")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_plain_key(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a missing compressed object falls back to the plain key."""
+        mock_client.update_config({"compressed_transfer": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+
+        def get_object(Bucket, Key):  # noqa: N803
+            if Key.endswith(".json"):
+                return {'Body': _stream(cdc_batch_json)}
+            raise Exception("NoSuchKey")
+
+        mock_client.s3_client.get_object.side_effect = get_object
+
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert batch_data.transaction_count == 4
+        keys = [c.kwargs['Key'] for c in mock_client.s3_client.get_object.call_args_list]
+        assert keys[-1] == f"{sample_batch_info.s3_location.key}batch-data.json"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_on_access_denied(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a 403 on a missing compressed object falls back to the plain key."""
+        from botocore.exceptions import ClientError
+        mock_client.update_config({"compressed_transfer": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+
+        def get_object(Bucket, Key):  # noqa: N803
+            if Key.endswith(".json"):
+                return {'Body': _stream(cdc_batch_json)}
+            raise ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'Access Denied'}}, 'GetObject')
+
+        mock_client.s3_client.get_object.side_effect = get_object
+
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert batch_data.transaction_count == 4
+        keys = [c.kwargs['Key'] for c in mock_client.s3_client.get_object.call_args_list]
+        assert keys[-1] == f"{sample_batch_info.s3_location.key}batch-data.json"
+
+    @pytest.mark.asyncio
+    async def test_other_errors_not_retried(self, mock_client, sample_batch_info):
+        """Test that S3 errors other than a missing key abort the load."""
+        from botocore.exceptions import ClientError
+        mock_client.update_config({"compressed_transfer": True})
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+        mock_client.s3_client.get_object.side_effect = ClientError(
+            {'Error': {'Code': 'SlowDown', 'Message': 'Please reduce your request rate'}}, 'GetObject'
+        )
+
+        with pytest.raises(S3AccessError, match="Failed to get batch data"):
+            await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert mock_client.s3_client.get_object.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_remembers_encoding_per_prefix(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that later batches under a prefix go straight to the key found before."""
+        mock_client.update_config({"compressed_transfer": True})
+        mock_client.get_batch = AsyncMock(side_effect=lambda batch_id: sample_batch_info.model_copy(update={
+            "batch_id": batch_id,
+            "s3_location": S3Location(bucket="test-etrap-bucket", key=f"test_db/{batch_id}/"),
+        }))
+        mock_client.s3_client = Mock()
+
+        def get_object(Bucket, Key):  # noqa: N803
+            if Key.startswith("test_db/financial_transactions/") and Key.endswith(".json"):
+                return {'Body': _stream(cdc_batch_json)}
+            raise Exception("NoSuchKey")
+
+        mock_client.s3_client.get_object.side_effect = get_object
+
+        await mock_client.get_batch_data("BATCH-1")
+        first = mock_client.s3_client.get_object.call_count
+        mock_client.s3_client.get_object.reset_mock()
+        await mock_client.get_batch_data("BATCH-2")
+
+        assert first > 1
+        keys = [c.kwargs['Key'] for c in mock_client.s3_client.get_object.call_args_list]
+        assert keys == ["test_db/financial_transactions/BATCH-2/batch-data.json"]
+
+    @pytest.mark.asyncio
+    async def test_content_encoding(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a gzip Content-Encoding on the plain key is decoded."""
+        mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+        mock_client.s3_client = Mock()
+        data = gzip.compress(json.dumps(cdc_batch_json).encode())
+        mock_client.s3_client.get_object.return_value = {
+            'Body': io.BytesIO(data),
+            'ContentEncoding': 'gzip'
+        }
+
+        batch_data = await mock_client.get_batch_data(sample_batch_info.batch_id)
+
+        assert batch_data.merkle_tree.root == cdc_batch_json["merkle_tree"]["root"]
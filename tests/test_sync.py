@@ -0,0 +1,85 @@
+"""
+Tests for the ETRAP SDK synchronous client.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from etrap_sdk import ETRAPSyncClient, TransactionFilter, VerificationHints
+
+
+@pytest.fixture
+def sync_client(mock_s3_config):
+    """Create a synchronous client and close it afterwards."""
+    client = ETRAPSyncClient(organization_id="test", network="testnet", s3_config=mock_s3_config)
+    yield client
+    client.close()
+
+
+def _serve(client, cdc_batch_json, sample_batch_info):
+    """Serve cdc_batch_json for sample_batch_info from a mock S3."""
+    client.client.get_batch = AsyncMock(return_value=sample_batch_info)
+    client.client.s3_client = Mock()
+
+    def get_object(Bucket, Key, **kwargs):  # noqa: N803
+        body = Mock()
+        body.read = lambda: json.dumps(cdc_batch_json).encode()
+        return {'Body': body}
+
+    client.client.s3_client.get_object.side_effect = get_object
+
+
+class TestETRAPSyncClient:
+    """Test the blocking facade."""
+
+    def test_mirrors_api(self, sync_client):
+        """Test that attributes and plain methods pass through."""
+        assert sync_client.contract_id == "test.testnet"
+        sync_client.update_config({"cache_ttl": 60})
+        assert sync_client.get_config().cache_ttl == 60
+        assert "verify_transaction" in dir(sync_client)
+
+    def test_calls_share_cache_across_threads(self, sync_client, cdc_batch_json, sample_batch_info):
+        """Test that verifications from many threads reuse one cached batch."""
+        _serve(sync_client, cdc_batch_json, sample_batch_info)
+        hashes = {i: tx["metadata"]["hash"] for i, tx in enumerate(cdc_batch_json["transactions"])}
+        hints = VerificationHints(batch_id=sample_batch_info.batch_id)
+        loop_threads = set()
+
+        def verify(position):
+            return sync_client.verify_transaction({"id": position}, hints=hints)
+
+        def compute(row, **kwargs):
+            loop_threads.add(threading.current_thread().name)
+            return hashes[row["id"]]
+
+        with patch("etrap_sdk.client.compute_transaction_hash", side_effect=compute):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(verify, [i % 4 for i in range(16)]))
+
+        assert all(result.verified for result in results)
+        assert sync_client.client.s3_client.get_object.call_count == 1
+        assert loop_threads == {"etrap-sdk-loop"}
+
+    def test_async_iterators_become_iterators(self, sync_client):
+        """Test that iter_transaction_history is consumed as a regular iterator."""
+        async def history(filter, **kwargs):
+            for n in range(3):
+                yield n
+
+        sync_client.client.iter_transaction_history = history
+
+        assert list(sync_client.iter_transaction_history(TransactionFilter())) == [0, 1, 2]
+
+    def test_close(self, mock_s3_config):
+        """Test that a closed client rejects calls and close is idempotent."""
+        client = ETRAPSyncClient(organization_id="test", s3_config=mock_s3_config)
+        client.close()
+        client.close()
+
+        with pytest.raises(RuntimeError):
+            client.get_contract_stats()
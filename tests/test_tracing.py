@@ -0,0 +1,205 @@
+"""
+Tests for ETRAP SDK verification tracing and metrics hooks.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from etrap_sdk import VerificationHints, VerificationTrace
+from etrap_sdk.tracing import (
+    OpenTelemetryHook,
+    PrometheusHook,
+    percentile,
+    record,
+    timed,
+    tracing,
+)
+
+
+def _setup(mock_client, cdc_batch_json, sample_batch_info):
+    """Serve cdc_batch_json for sample_batch_info from a mock S3."""
+    mock_client.get_batch = AsyncMock(return_value=sample_batch_info)
+    mock_client.s3_client = Mock()
+
+    def get_object(Bucket, Key, **kwargs):  # noqa: N803
+        body = Mock()
+        body.read = lambda: json.dumps(cdc_batch_json).encode()
+        return {'Body': body}
+
+    mock_client.s3_client.get_object.side_effect = get_object
+
+
+async def _verify(mock_client, cdc_batch_json, sample_batch_info, position):
+    """Verify the transaction at a position of cdc_batch_json."""
+    tx_hash = cdc_batch_json["transactions"][position]["metadata"]["hash"]
+    with patch("etrap_sdk.client.compute_transaction_hash", return_value=tx_hash):
+        return await mock_client.verify_transaction(
+            {"id": position},
+            hints=VerificationHints(batch_id=sample_batch_info.batch_id)
+        )
+
+
+class TestTracePrimitives:
+    """Test recording into the active trace."""
+
+    def test_record_without_trace_is_noop(self):
+        """Test that counters are ignored outside a trace."""
+        record('s3_requests')
+        with timed('parse'):
+            pass
+
+    def test_record_and_timed(self):
+        """Test counters and phase timings."""
+        trace = VerificationTrace()
+        with tracing(trace):
+            record('s3_requests')
+            record('s3_bytes', 512)
+            with timed('parse'):
+                pass
+
+        assert trace.s3_requests == 1
+        assert trace.s3_bytes == 512
+        assert trace.parse_ms >= 0
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        samples = [float(n) for n in range(1, 101)]
+
+        assert percentile(samples, 0.50) == 50.0
+        assert percentile(samples, 0.99) == 99.0
+        assert percentile(samples, 1.0) == 100.0
+        assert percentile([7.0], 0.9) == 7.0
+        assert percentile([], 0.5) == 0.0
+
+
+class TestVerificationTracing:
+    """Test traces recorded by verify_transaction."""
+
+    @pytest.mark.asyncio
+    async def test_trace_attached_when_enabled(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that a trace with phase counters is attached to the result."""
+        mock_client.update_config({"trace_verifications": True})
+        _setup(mock_client, cdc_batch_json, sample_batch_info)
+
+        result = await _verify(mock_client, cdc_batch_json, sample_batch_info, 1)
+
+        assert result.verified
+        trace = result.trace
+        assert trace.verified is True
+        assert trace.batches_probed == 1
+        assert trace.s3_requests == 1
+        assert trace.s3_bytes == len(json.dumps(cdc_batch_json))
+        assert trace.cache_misses == 1
+        assert trace.cache_hits >= 1
+        assert trace.total_ms >= trace.parse_ms + trace.proof_ms
+
+    @pytest.mark.asyncio
+    async def test_no_trace_by_default(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that results carry no trace unless enabled."""
+        _setup(mock_client, cdc_batch_json, sample_batch_info)
+
+        result = await _verify(mock_client, cdc_batch_json, sample_batch_info, 0)
+
+        assert result.verified
+        assert result.trace is None
+
+    @pytest.mark.asyncio
+    async def test_metrics_hook(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that hooks receive traces and failing hooks are isolated."""
+        _setup(mock_client, cdc_batch_json, sample_batch_info)
+        traces = []
+
+        def broken_hook(trace):
+            raise RuntimeError("exporter down")
+
+        mock_client.add_metrics_hook(broken_hook)
+        mock_client.add_metrics_hook(traces.append)
+
+        result = await _verify(mock_client, cdc_batch_json, sample_batch_info, 2)
+
+        assert result.verified
+        assert result.trace is None
+        assert len(traces) == 1
+        assert traces[0].verified is True
+
+        mock_client.remove_metrics_hook(traces.append)
+        await _verify(mock_client, cdc_batch_json, sample_batch_info, 2)
+        assert len(traces) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_traces_are_separate(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that concurrent verifications record into their own traces."""
+        mock_client.update_config({"trace_verifications": True})
+        _setup(mock_client, cdc_batch_json, sample_batch_info)
+        await _verify(mock_client, cdc_batch_json, sample_batch_info, 0)  # warm the cache
+
+        results = await asyncio.gather(*(
+            _verify(mock_client, cdc_batch_json, sample_batch_info, i) for i in range(4)
+        ))
+
+        for result in results:
+            assert result.trace.batches_probed == 1
+            assert result.trace.s3_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_verify_batch_cache_hit_ratio(self, mock_client, cdc_batch_json, sample_batch_info):
+        """Test that verify_batch reports the batch cache hit ratio."""
+        _setup(mock_client, cdc_batch_json, sample_batch_info)
+        rows = [{"id": i} for i in range(3)]
+        hashes = {i: tx["metadata"]["hash"] for i, tx in enumerate(cdc_batch_json["transactions"])}
+
+        with patch("etrap_sdk.client.compute_transaction_hash", side_effect=lambda row, **kwargs: hashes[row["id"]]):
+            result = await mock_client.verify_batch(
+                rows,
+                hints=VerificationHints(batch_id=sample_batch_info.batch_id),
+                parallel=False
+            )
+
+        assert result.verified == 3
+        assert result.summary.blockchain_confirmations == 1
+        assert 0 < result.summary.cache_hit_ratio < 1
+        assert mock_client.s3_client.get_object.call_count == 1
+
+
+class TestMetricsAdapters:
+    """Test OpenTelemetry and Prometheus adapters."""
+
+    def test_opentelemetry_hook(self):
+        """Test recording through an OpenTelemetry-style meter."""
+        instruments = {}
+
+        class Instrument:
+            def __init__(self):
+                self.values = []
+
+            def record(self, value, attributes=None):
+                self.values.append((value, attributes))
+
+            def add(self, value, attributes=None):
+                self.values.append((value, attributes))
+
+        meter = Mock()
+        meter.create_histogram.side_effect = lambda name, **kw: instruments.setdefault(name, Instrument())
+        meter.create_counter.side_effect = lambda name, **kw: instruments.setdefault(name, Instrument())
+
+        hook = OpenTelemetryHook(meter)
+        hook(VerificationTrace(verified=True, total_ms=12.5, s3_bytes=2048, parse_ms=3.0))
+
+        assert instruments["etrap.verification.duration"].values == [(12.5, {"verified": True})]
+        assert (3.0, {"phase": "parse"}) in instruments["etrap.verification.phase.duration"].values
+        assert instruments["etrap.verification.s3.bytes"].values == [(2048, None)]
+
+    def test_prometheus_hook(self):
+        """Test recording into a Prometheus registry."""
+        prometheus_client = pytest.importorskip("prometheus_client")
+        registry = prometheus_client.CollectorRegistry()
+
+        hook = PrometheusHook(registry)
+        hook(VerificationTrace(verified=False, total_ms=250.0, batches_probed=3))
+
+        assert registry.get_sample_value(
+            "etrap_verification_duration_seconds_count", {"verified": "false"}) == 1
+        assert registry.get_sample_value("etrap_batches_probed_total") == 3
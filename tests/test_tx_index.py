@@ -0,0 +1,189 @@
+"""
+Tests for ETRAP SDK transaction hash index.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from etrap_sdk import SearchCriteria
+from etrap_sdk.compact import JsonBatch
+from etrap_sdk.tx_index import IndexEntry, TransactionIndex
+
+
+def _serve(mock_client, cdc_batch_json, sample_batch_info):
+    """Serve cdc_batch_json for sample_batch_info from a mock S3."""
+    batch_info = sample_batch_info.model_copy(update={
+        "batch_id": cdc_batch_json["batch_info"]["batch_id"],
+        "merkle_root": cdc_batch_json["merkle_tree"]["root"],
+        "transaction_count": len(cdc_batch_json["transactions"])
+    })
+    mock_client.get_batch = AsyncMock(return_value=batch_info)
+    mock_client._get_recent_batches = AsyncMock(return_value=[batch_info])
+    mock_client.s3_client = Mock()
+
+    def get_object(Bucket, Key, **kwargs):  # noqa: N803
+        body = Mock()
+        body.read = lambda: json.dumps(cdc_batch_json).encode()
+        return {'Body': body}
+
+    mock_client.s3_client.get_object.side_effect = get_object
+    return batch_info
+
+
+class TestTransactionIndex:
+    """Test the SQLite transaction index."""
+
+    def test_add_and_lookup(self, tmp_path, cdc_batch_json):
+        """Test that every leaf is indexed and survives reopening."""
+        path = str(tmp_path / "index.sqlite")
+        index = TransactionIndex(path)
+        view = JsonBatch(cdc_batch_json)
+
+        assert index.add_batch("BATCH-1", view) == 4
+        assert index.add_batch("BATCH-1", view) == 0
+        index.close()
+
+        index = TransactionIndex(path)
+        tx = cdc_batch_json["transactions"][3]["metadata"]
+        assert index.lookup(tx["hash"]) == [IndexEntry("BATCH-1", 3, "DELETE")]
+        assert index.lookup("0" * 64) == []
+        assert index.batch_ids() == {"BATCH-1"}
+        assert len(index) == 4
+
+    def test_hash_in_several_batches(self, cdc_batch_json):
+        """Test that a hash seen in two batches returns both, newest ID first."""
+        index = TransactionIndex(":memory:")
+        view = JsonBatch(cdc_batch_json)
+        index.add_batch("BATCH-2025-06-14-a", view)
+        index.add_batch("BATCH-2025-06-15-b", view)
+
+        entries = index.lookup(view.leaf_hash(0))
+
+        assert [e.batch_id for e in entries] == ["BATCH-2025-06-15-b", "BATCH-2025-06-14-a"]
+
+        index.remove_batches(["BATCH-2025-06-15-b"])
+        assert [e.batch_id for e in index.lookup(view.leaf_hash(0))] == ["BATCH-2025-06-14-a"]
+
+    def test_newest_batch_by_creation_time(self, cdc_batch_json):
+        """Test that lookups order batches by creation time, not by ID."""
+        index = TransactionIndex(":memory:")
+        view = JsonBatch(cdc_batch_json)
+        index.add_batch("BATCH-9-old", view, created_at=datetime(2025, 6, 14))
+        index.add_batch("BATCH-10-new", view, created_at=datetime(2025, 6, 15))
+        index.add_batch("BATCH-99-unknown", view)
+
+        entries = index.lookup(view.leaf_hash(0))
+
+        assert [e.batch_id for e in entries] == ["BATCH-10-new", "BATCH-9-old", "BATCH-99-unknown"]
+
+    def test_upgrades_old_file(self, tmp_path, cdc_batch_json):
+        """Test that an index written without creation times gains the column."""
+        path = str(tmp_path / "index.sqlite")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE batches (batch_id TEXT PRIMARY KEY, merkle_root TEXT, "
+            "transaction_count INTEGER NOT NULL, indexed_at TEXT NOT NULL);"
+        )
+        conn.close()
+
+        index = TransactionIndex(path)
+        index.add_batch("BATCH-1", JsonBatch(cdc_batch_json), created_at=datetime(2025, 6, 14))
+
+        assert index.has_batch("BATCH-1")
+
+
+class TestClientIndex:
+    """Test index-backed lookups in the client."""
+
+    @pytest.mark.asyncio
+    async def test_find_transaction_uses_index(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that an indexed hash is found without listing batches."""
+        _serve(mock_client, cdc_batch_json, sample_batch_info)
+        mock_client.update_config({"transaction_index_path": str(tmp_path / "index.sqlite")})
+
+        assert await mock_client.build_transaction_index() == 1
+        mock_client._get_recent_batches.reset_mock()
+
+        tx_hash = cdc_batch_json["transactions"][2]["metadata"]["hash"]
+        location = await mock_client.find_transaction(tx_hash)
+
+        assert location.batch_id == cdc_batch_json["batch_info"]["batch_id"]
+        assert location.position == 2
+        mock_client._get_recent_batches.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_loaded_batches_are_indexed(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that get_batch_data populates the index and search_batches uses it."""
+        batch_info = _serve(mock_client, cdc_batch_json, sample_batch_info)
+        mock_client.update_config({"transaction_index_path": str(tmp_path / "index.sqlite")})
+
+        await mock_client.get_batch_data(batch_info.batch_id)
+        mock_client._verify_in_batch = AsyncMock(wraps=mock_client._verify_in_batch)
+
+        tx_hash = cdc_batch_json["transactions"][1]["metadata"]["hash"]
+        found = await mock_client.search_batches(SearchCriteria(transaction_hash=tx_hash))
+        assert mock_client._verify_in_batch.await_count == 1  # The indexed match is proven
+        missing = await mock_client.search_batches(SearchCriteria(transaction_hash="0" * 64))
+
+        assert [b.batch_id for b in found.matching_batches] == [batch_info.batch_id]
+        assert missing.matching_batches == []
+        assert mock_client._verify_in_batch.await_count == 1  # Indexed misses are not probed
+
+    @pytest.mark.asyncio
+    async def test_batch_probed_once_per_verification(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that a hash at several leaves of one batch probes that batch once."""
+        batch_info = _serve(mock_client, cdc_batch_json, sample_batch_info)
+        mock_client.update_config({"transaction_index_path": str(tmp_path / "index.sqlite")})
+        repeated = dict(cdc_batch_json, transactions=[
+            {"metadata": dict(tx["metadata"], hash="ab" * 32)} for tx in cdc_batch_json["transactions"]
+        ])
+        mock_client._transaction_index().add_batch(batch_info.batch_id, JsonBatch(repeated))
+        mock_client._verify_in_batch = AsyncMock(return_value=None)
+        mock_client._get_recent_batches.return_value = []
+
+        with patch('etrap_sdk.client.compute_transaction_hash', return_value="ab" * 32):
+            await mock_client.verify_transaction({"id": 1})
+
+        probed = [call.args[1].batch_id for call in mock_client._verify_in_batch.await_args_list]
+        assert probed == [batch_info.batch_id]
+
+    @pytest.mark.asyncio
+    async def test_stale_index_entry_is_not_trusted(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that an index entry whose proof fails is not reported as a match."""
+        batch_info = _serve(mock_client, cdc_batch_json, sample_batch_info)
+        mock_client.update_config({"transaction_index_path": str(tmp_path / "index.sqlite")})
+        poisoned = dict(cdc_batch_json, transactions=[
+            {"metadata": dict(tx["metadata"], hash="ab" * 32)} for tx in cdc_batch_json["transactions"]
+        ])
+        mock_client._transaction_index().add_batch(batch_info.batch_id, JsonBatch(poisoned))
+
+        found = await mock_client.search_batches(SearchCriteria(transaction_hash="ab" * 32))
+        location = await mock_client.find_transaction("ab" * 32)
+
+        assert found.matching_batches == []
+        assert location is None
+
+    @pytest.mark.asyncio
+    async def test_find_transaction_checks_on_chain_root(self, mock_client, tmp_path, cdc_batch_json, sample_batch_info):
+        """Test that an indexed proof valid only against the S3 root is rejected."""
+        batch_info = _serve(mock_client, cdc_batch_json, sample_batch_info)
+        mock_client.update_config({"transaction_index_path": str(tmp_path / "index.sqlite")})
+        await mock_client.get_batch_data(batch_info.batch_id)
+        mock_client.get_batch.return_value = batch_info.model_copy(update={"merkle_root": "00" * 32})
+        mock_client._get_recent_batches.return_value = []
+
+        tx_hash = cdc_batch_json["transactions"][2]["metadata"]["hash"]
+
+        assert await mock_client.find_transaction(tx_hash) is None
+
+    @pytest.mark.asyncio
+    async def test_build_requires_path(self, mock_client):
+        """Test that building without an index path is a configuration error."""
+        from etrap_sdk import ConfigurationError
+
+        with pytest.raises(ConfigurationError):
+            await mock_client.build_transaction_index()
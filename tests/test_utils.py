@@ -9,6 +9,7 @@ from etrap_sdk.utils import (
     normalize_transaction_data,
     compute_transaction_hash,
     validate_merkle_proof,
+    validate_merkle_proof_set,
     parse_timestamp
 )
 
@@ -215,6 +216,46 @@ class TestMerkleProof:
         result = validate_merkle_proof(leaf_hash, proof_path, sibling_positions, root)
         assert isinstance(result, bool)
 
+    def _tree_proofs(self, count=8, with_sides=True):
+        """Build a Merkle tree over `count` leaves and return its root and proofs."""
+        import hashlib
+        levels = [[hashlib.sha256(f"row-{i}".encode()).hexdigest() for i in range(count)]]
+        while len(levels[-1]) > 1:
+            below = levels[-1]
+            levels.append([
+                hashlib.sha256((below[i] + below[i + 1]).encode()).hexdigest()
+                for i in range(0, len(below), 2)
+            ])
+        proofs = []
+        for index, leaf in enumerate(levels[0]):
+            path = [level[(index >> height) ^ 1] for height, level in enumerate(levels[:-1])]
+            sides = [
+                "left" if index >> height & 1 else "right" for height in range(len(path))
+            ] if with_sides else []
+            proofs.append((leaf, path, sides, index))
+        return levels[-1][0], proofs
+
+    @pytest.mark.parametrize("with_sides", [True, False])
+    def test_validate_merkle_proof_set(self, with_sides):
+        """Test that a full leaf set validates against its root."""
+        root, proofs = self._tree_proofs(with_sides=with_sides)
+
+        assert validate_merkle_proof_set(proofs, root)
+        assert validate_merkle_proof_set([(root, [], [], 0)], root)
+        assert not validate_merkle_proof_set(proofs, "00" * 32)
+
+    def test_validate_merkle_proof_set_tampered(self):
+        """Test that one bad leaf or sibling fails the whole set."""
+        root, proofs = self._tree_proofs()
+
+        bad_leaf = list(proofs)
+        bad_leaf[5] = ("ff" * 32,) + bad_leaf[5][1:]
+        bad_sibling = list(proofs)
+        bad_sibling[7] = (proofs[7][0], ["ff" * 32] + proofs[7][1][1:], proofs[7][2], 7)
+
+        assert not validate_merkle_proof_set(bad_leaf, root)
+        assert not validate_merkle_proof_set(bad_sibling, root)
+
 
 class TestTimestampParsing:
     """Test timestamp parsing functionality."""
@@ -0,0 +1,143 @@
+"""
+Tests for ETRAP SDK batch subscriptions.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from etrap_sdk import BatchInfo, S3Location
+from etrap_sdk.watch import PollSchedule
+
+
+def _batch(n):
+    return BatchInfo(
+        batch_id=f"BATCH-{n:03d}",
+        database_name="db",
+        table_names=["orders"],
+        transaction_count=1,
+        merkle_root=f"root{n}",
+        timestamp=datetime(2025, 6, 15) + timedelta(minutes=n),
+        s3_location=S3Location(bucket="test-bucket", key="test/", region="us-west-2"),
+        size_bytes=1000
+    )
+
+
+def _contract(mock_client, count):
+    """Serve a growing list of batches from get_recent_batches, newest first."""
+    history = [_batch(n) for n in range(count)]
+    mock_client._get_recent_batches = AsyncMock(
+        side_effect=lambda limit: list(reversed(history))[:limit]
+    )
+    return history
+
+
+class TestPollSchedule:
+    """Test the adaptive poll interval."""
+
+    def test_follows_arrival_rate(self):
+        """Test that polls happen about twice per expected arrival."""
+        schedule = PollSchedule(min_interval=1.0, max_interval=60.0)
+
+        schedule.update(1, now=0.0)
+        assert schedule.update(1, now=10.0) == 5.0
+        assert schedule.update(2, now=20.0) == pytest.approx(4.25)
+
+    def test_backs_off_when_idle(self):
+        """Test exponential back-off bounded by max_interval."""
+        schedule = PollSchedule(min_interval=1.0, max_interval=5.0)
+
+        delays = [schedule.update(0, now=float(n)) for n in range(4)]
+
+        assert delays == [2.0, 4.0, 5.0, 5.0]
+        assert schedule.update(1, now=10.0) == 1.0
+
+    def test_invalid_bounds(self):
+        """Test that inverted bounds are rejected."""
+        with pytest.raises(ValueError):
+            PollSchedule(min_interval=10.0, max_interval=1.0)
+
+    def test_rejects_zero_min_interval(self):
+        """Test that a zero min_interval, which would poll in a busy loop, is rejected."""
+        with pytest.raises(ValueError, match="0 < min_interval"):
+            PollSchedule(min_interval=0.0, max_interval=1.0)
+
+
+class TestWatchBatches:
+    """Test watch_batches through the client."""
+
+    @pytest.mark.asyncio
+    async def test_yields_only_new_batches(self, mock_client):
+        """Test that existing batches are skipped and new ones arrive oldest first."""
+        history = _contract(mock_client, 5)
+        watch = mock_client.watch_batches(min_interval=0.001, max_interval=0.01)
+
+        first = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0.01)
+        history.extend([_batch(5), _batch(6)])
+        seen = [(await first).batch_id, (await watch.__anext__()).batch_id]
+        await watch.aclose()
+
+        assert seen == ["BATCH-005", "BATCH-006"]
+
+    @pytest.mark.asyncio
+    async def test_shared_timestamp_not_repeated(self, mock_client):
+        """Test that batches sharing a timestamp are yielded once even if listed in another order."""
+        history = _contract(mock_client, 3)
+        tied = [_batch(3), _batch(4).model_copy(update={"timestamp": _batch(3).timestamp})]
+        polls = []
+
+        def recent(limit):
+            polls.append(limit)
+            listed = list(reversed(history))
+            if len(polls) % 2:
+                listed[:2] = listed[1::-1]  # Ties swap places between polls
+            return listed[:limit]
+
+        mock_client._get_recent_batches.side_effect = recent
+        watch = mock_client.watch_batches(min_interval=0.001, max_interval=0.002)
+        first = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0.01)
+        history.extend(tied)
+        seen = [(await first).batch_id, (await watch.__anext__()).batch_id]
+        later = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0.02)
+        history.append(_batch(5))
+        seen.append((await later).batch_id)
+        await watch.aclose()
+
+        assert sorted(seen[:2]) == ["BATCH-003", "BATCH-004"]
+        assert seen[2] == "BATCH-005"
+
+    @pytest.mark.asyncio
+    async def test_resume_since(self, mock_client):
+        """Test resuming after a remembered batch, past the first page."""
+        _contract(mock_client, 120)
+        watch = mock_client.watch_batches(since="BATCH-030", min_interval=0.001)
+
+        seen = [(await watch.__anext__()).batch_id for _ in range(89)]
+        await watch.aclose()
+
+        assert seen[0] == "BATCH-031"
+        assert seen[-1] == "BATCH-119"
+        limits = [call.args[0] for call in mock_client._get_recent_batches.call_args_list]
+        assert limits == [mock_client.SYNC_PAGE, mock_client.SYNC_PAGE * 4]
+
+    @pytest.mark.asyncio
+    async def test_resume_past_contract_page(self, mock_client):
+        """Test resuming further back than the contract returns in one page."""
+        history = _contract(mock_client, 250)
+        page = mock_client.CONTRACT_PAGE
+        mock_client._get_recent_batches.side_effect = lambda limit: list(reversed(history))[:min(limit, page)]
+
+        async def by_time_range(start, end, database=None, limit=100):
+            # Oldest first, so newer batches need further queries
+            return [b for b in history if start <= b.timestamp <= end][:min(limit, page)]
+
+        mock_client._get_batches_by_time_range = AsyncMock(side_effect=by_time_range)
+
+        batches = await mock_client._batches_since(lambda batch: batch.batch_id == "BATCH-020", mock_client.SYNC_PAGE)
+
+        assert [b.batch_id for b in batches] == [f"BATCH-{n:03d}" for n in range(249, 20, -1)]